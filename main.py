@@ -1,4 +1,73 @@
-from data_ingestion.runner import runner
+import argparse
+from datetime import datetime, timezone
+
+from data_ingestion.runner import backfill_runner, runner
+
+
+def _parse_shard(value: str) -> tuple[int, int]:
+    shard, _, shards = value.partition('/')
+    try:
+        shard, shards = int(shard), int(shards or 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'Invalid shard {value!r}, expected i/n')
+    if not 0 <= shard < shards:
+        raise argparse.ArgumentTypeError(f'Invalid shard {value!r}, expected i/n')
+    return shard, shards
+
+
+def _parse_date(value: str) -> float:
+    return datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description='CryptoCore data ingestion')
+    commands = parser.add_subparsers(dest='command')
+
+    backfill = commands.add_parser(
+        'backfill', help='Crawl the history of subreddits backwards'
+    )
+    backfill.add_argument(
+        'subreddits', nargs='*', help='Subreddits to backfill (default: all)'
+    )
+    backfill.add_argument(
+        '--until', type=_parse_date, help='Oldest post date to fetch (YYYY-MM-DD)'
+    )
+    backfill.add_argument(
+        '--max-pages', type=int, help='Maximum number of pages per subreddit'
+    )
+    backfill.add_argument(
+        '--shard',
+        type=_parse_shard,
+        default=(0, 1),
+        help='Share of the subreddits handled by this process, as i/n',
+    )
+    backfill.add_argument(
+        '--workers', type=int, default=1, help='Subreddits backfilled in parallel'
+    )
+
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        default=None,
+        help='Profile each subreddit with cProfile and tracemalloc '
+        '(written under INGESTION_PROFILE_DIR, logs/profile by default)',
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'backfill':
+        shard, shards = args.shard
+        backfill_runner(
+            subreddits=args.subreddits,
+            until=args.until,
+            max_pages=args.max_pages,
+            shard=shard,
+            shards=shards,
+            max_workers=args.workers,
+        )
+    else:
+        runner(profile=args.profile)
+
 
 if __name__ == '__main__':
-    runner()
+    main()
@@ -0,0 +1,242 @@
+"""
+A local stand-in for the Reddit listing API, for offline benchmarks.
+
+Serves `/r/<subreddit>/new` with `before`/`after` pagination over synthetic
+posts whose fullnames grow with creation time, like Reddit's. Each subreddit
+starts with a backlog of posts and gains `velocity` new ones per second.
+Responses carry `X-Ratelimit-*` headers, and a share of them can be turned
+into 429s to exercise the retry path.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from data_ingestion.utils.fullname import fullname_id
+
+# Keeps the synthetic ids in the length range of real ones.
+_ID_OFFSET = 36**5
+
+
+def _base36(number: int) -> str:
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    encoded = ''
+    while number:
+        number, remainder = divmod(number, 36)
+        encoded = digits[remainder] + encoded
+    return encoded or '0'
+
+
+class FakeReddit:
+    """
+    A threaded HTTP server imitating the Reddit `/new` listings.
+
+    Post `k` (from 1) of the i-th subreddit gets the id
+    `(k + offset) * len(subreddits) + i`, so ids grow with creation time
+    within a subreddit and never collide across subreddits. Post 0 is never
+    listed: its fullname, anchor(), is the checkpoint from which a forward
+    sync fetches the whole backlog.
+
+    Attributes:
+        subreddits (list[str]): The subreddits served.
+        backlog (int): Posts of each subreddit when the server starts.
+        velocity (float): New posts per second in each subreddit.
+        latency (float): Seconds each response is delayed by.
+        error_rate (float): Share of the requests answered with a 429.
+        retry_after (float): Retry-After of the injected 429s.
+        ratelimit (int): Requests allowed per rate limit window.
+        ratelimit_period (float): Length of the rate limit window.
+        body_size (int): Size of the selftext of each post, in bytes.
+        requests (int): Requests served so far.
+        throttled (int): 429s injected so far.
+    """
+
+    def __init__(
+        self,
+        subreddits: list[str],
+        backlog: int = 1000,
+        velocity: float = 0.0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        retry_after: float = 0.0,
+        ratelimit: int = 100_000,
+        ratelimit_period: float = 600.0,
+        body_size: int = 500,
+        seed: int = 0,
+    ):
+        self.subreddits = subreddits
+        self.backlog = backlog
+        self.velocity = velocity
+        self.latency = latency
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.ratelimit = ratelimit
+        self.ratelimit_period = ratelimit_period
+        self.body_size = body_size
+
+        self.requests = 0
+        self.throttled = 0
+
+        self._index = {name.casefold(): i for i, name in enumerate(subreddits)}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_used = 0
+        self._server: ThreadingHTTPServer | None = None
+        self.started_at = time.time()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def fullname(self, subreddit: str, index: int) -> str:
+        post_id = (index + _ID_OFFSET) * len(self.subreddits) + self._index[
+            subreddit.casefold()
+        ]
+        return f't3_{_base36(post_id)}'
+
+    def anchor(self, subreddit: str) -> str:
+        return self.fullname(subreddit, 0)
+
+    def available(self) -> int:
+        """
+        Number of posts of each subreddit at this time.
+        """
+        return self.backlog + int((time.time() - self.started_at) * self.velocity)
+
+    def _post_index(self, fullname: str) -> int:
+        return fullname_id(fullname) // len(self.subreddits) - _ID_OFFSET
+
+    def _post(self, subreddit: str, index: int) -> dict:
+        created = self.started_at - (self.backlog - index) / (self.velocity or 1.0)
+        name = self.fullname(subreddit, index)
+        return {
+            'kind': 't3',
+            'data': {
+                'name': name,
+                'id': name[3:],
+                'subreddit': subreddit,
+                'created_utc': created,
+                'title': f'Post {index} of {subreddit}',
+                'selftext': 'x' * self.body_size,
+            },
+        }
+
+    def listing(self, subreddit: str, params: dict[str, str]) -> dict:
+        """
+        Builds the `/new` page for the given query parameters, newest first.
+        """
+        count = self.available()
+        limit = min(int(params.get('limit') or 25), 100)
+        before, after = params.get('before'), params.get('after')
+
+        if before:
+            start = self._post_index(before) + 1
+            indexes = range(start, min(start + limit, count + 1))
+        elif after:
+            end = self._post_index(after)
+            indexes = range(max(end - limit, 1), end)
+        else:
+            indexes = range(max(count - limit + 1, 1), count + 1)
+
+        children = [self._post(subreddit, index) for index in reversed(indexes)]
+        return {
+            'kind': 'Listing',
+            'data': {
+                'children': children,
+                'before': children[0]['data']['name'] if children else None,
+                'after': (
+                    children[-1]['data']['name']
+                    if children and indexes.start > 1
+                    else None
+                ),
+            },
+        }
+
+    def _ratelimit_headers(self) -> dict[str, str]:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.ratelimit_period:
+                self._window_start, self._window_used = now, 0
+            self._window_used += 1
+            return {
+                'X-Ratelimit-Used': str(self._window_used),
+                'X-Ratelimit-Remaining': str(
+                    max(self.ratelimit - self._window_used, 0)
+                ),
+                'X-Ratelimit-Reset': str(
+                    int(self.ratelimit_period - (now - self._window_start))
+                ),
+            }
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        with self._lock:
+            self.requests += 1
+            throttle = self._random.random() < self.error_rate
+            if throttle:
+                self.throttled += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        url = urlparse(handler.path)
+        parts = url.path.strip('/').split('/')
+        headers = self._ratelimit_headers()
+
+        if throttle:
+            status, body = 429, {'message': 'Too Many Requests', 'error': 429}
+            headers['Retry-After'] = str(self.retry_after)
+        elif (
+            len(parts) == 3
+            and parts[0] == 'r'
+            and parts[2] == 'new'
+            and parts[1].casefold() in self._index
+        ):
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            status, body = 200, self.listing(parts[1], params)
+        else:
+            status, body = 404, {'message': 'Not Found', 'error': 404}
+
+        payload = json.dumps(body).encode('utf-8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(payload)))
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def start(self) -> 'FakeReddit':
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                fake._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever, name='fake-reddit', daemon=True
+        ).start()
+        self.started_at = time.time()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self) -> 'FakeReddit':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,226 @@
+"""
+End-to-end throughput benchmark of the threaded ingestion.
+
+Drives RedditIngestor.run against a FakeReddit server and an in-process moto
+S3 bucket, and reports posts per second, requests per post, p50/p99 page
+latency and peak RSS as JSON, to compare runs across commits.
+
+Every subreddit starts from a checkpoint at the beginning of its backlog, so
+a run pages through `posts / subreddits` posts per subreddit.
+
+Usage:
+    python -m data_ingestion.benchmarks.ingestion --subreddits 200 \\
+        --posts 100000 --workers 8 --output benchmark.json
+"""
+
+import argparse
+import json
+import logging
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from data_ingestion.benchmarks.fake_reddit import FakeReddit
+from data_ingestion.extract.http import build_session
+from data_ingestion.extract.rate_limit import RateLimiter
+from data_ingestion.extract.reddit import RedditExtractor
+from data_ingestion.ingestors.planner import RequestPlanner
+from data_ingestion.ingestors.reddit import RedditIngestor
+from data_ingestion.load.aws_s3 import AWSClientS3, AWSServiceS3
+from data_ingestion.load.checkpoint import Checkpoint, S3CheckpointStore
+from data_ingestion.load.compression import get_codec
+from data_ingestion.load.s3_key import RedditS3Key
+from data_ingestion.utils import metrics
+from data_ingestion.utils.retry import RetryPolicy
+
+BUCKET = 'cryptocore-benchmark'
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _quiet_logs(level: int) -> None:
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith('data_ingestion'):
+            logging.getLogger(name).setLevel(level)
+
+
+def run_benchmark(
+    subreddits: int = 200,
+    posts: int = 100_000,
+    workers: int = 8,
+    velocity: float = 0.0,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    ratelimit: int = 100_000,
+    page_size: int = 100,
+    compression: str = 'none',
+    body_size: int = 500,
+) -> dict:
+    """
+    Runs one ingestion of `subreddits` fake subreddits holding `posts` posts
+    in total, and returns the measures.
+
+    Args:
+        subreddits: Number of subreddits ingested.
+        posts: Backlog of posts, split evenly between the subreddits.
+        workers: Subreddits ingested in parallel (RedditIngestor.run).
+        velocity: New posts per second in each subreddit during the run.
+        latency: Seconds added by the fake server to every response.
+        error_rate: Share of the responses turned into 429s.
+        ratelimit: Requests per rate limit window announced by the server.
+        page_size: Posts per page, pinned through a RequestPlanner.
+        compression: Codec of the stored objects.
+        body_size: Size of the selftext of each post, in bytes.
+    """
+    try:
+        from moto import mock_aws
+    except ImportError as e:
+        raise ImportError(
+            'The ingestion benchmark requires moto: install the dev dependencies'
+        ) from e
+
+    names = [f'bench{i:04d}' for i in range(subreddits)]
+    latencies: list[float] = []
+
+    def record_latency(response, *args, **kwargs):
+        latencies.append(response.elapsed.total_seconds())
+
+    fake = FakeReddit(
+        names,
+        backlog=posts // subreddits,
+        velocity=velocity,
+        latency=latency,
+        error_rate=error_rate,
+        ratelimit=ratelimit,
+        body_size=body_size,
+    )
+
+    with fake, mock_aws():
+        retry_policy = RetryPolicy(base_delay=0.01, max_delay=0.1, budget=10**9)
+        aws_client = AWSClientS3(
+            aws_access_key_id='benchmark',
+            aws_secret_access_key='benchmark',
+            region_name='us-east-1',
+        )
+        aws_client.client.create_bucket(Bucket=BUCKET)
+        storage = AWSServiceS3(
+            client=aws_client,
+            bucket_name=BUCKET,
+            retry_policy=retry_policy,
+            codec=get_codec(compression),
+        )
+
+        checkpoints = S3CheckpointStore(storage)
+        for name in names:
+            anchor = fake.anchor(name)
+            key = RedditS3Key.build(subreddit=name, head=anchor, tail=anchor)
+            checkpoints.put(
+                name,
+                Checkpoint(key=key.to_s3_key(), updated_at=fake.started_at),
+            )
+
+        session = build_session(pool_size=workers)
+        session.hooks['response'].append(record_latency)
+        extractor = RedditExtractor(
+            token='benchmark',
+            user_agent='cryptocore-benchmark',
+            rate_limiter=RateLimiter(capacity=ratelimit),
+            session=session,
+            retry_policy=retry_policy,
+            base_url=fake.url,
+        )
+        ingestor = RedditIngestor(
+            extractor=extractor,
+            storage=storage,
+            checkpoints=checkpoints,
+            planner=RequestPlanner(min_limit=page_size, max_limit=page_size),
+        )
+
+        metrics.REGISTRY.reset()
+        started = time.perf_counter()
+        ingestor.run(names, max_workers=workers)
+        elapsed = time.perf_counter() - started
+
+    stored = metrics.REGISTRY.summary()['counters'].get('posts', {}).get('total', 0)
+    cuts = (
+        statistics.quantiles(latencies, n=100, method='inclusive')
+        if len(latencies) > 1
+        else latencies * 99
+    )
+
+    return {
+        'commit': _commit(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'subreddits': subreddits,
+        'workers': workers,
+        'page_size': page_size,
+        'posts': stored,
+        'seconds': elapsed,
+        'posts_per_sec': stored / elapsed if elapsed else 0.0,
+        'requests': fake.requests,
+        'throttled': fake.throttled,
+        'requests_per_post': fake.requests / stored if stored else None,
+        'page_latency_p50_ms': cuts[49] * 1000 if cuts else None,
+        'page_latency_p99_ms': cuts[98] * 1000 if cuts else None,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Offline ingestion benchmark')
+    parser.add_argument('--subreddits', type=int, default=200)
+    parser.add_argument('--posts', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--velocity', type=float, default=0.0)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--ratelimit', type=int, default=100_000)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--compression', default='none')
+    parser.add_argument('--body-size', type=int, default=500)
+    parser.add_argument('--output', help='Also write the report to this file')
+    args = parser.parse_args(argv)
+
+    _quiet_logs(logging.WARNING)
+    report = run_benchmark(
+        subreddits=args.subreddits,
+        posts=args.posts,
+        workers=args.workers,
+        velocity=args.velocity,
+        latency=args.latency_ms / 1000,
+        error_rate=args.error_rate,
+        ratelimit=args.ratelimit,
+        page_size=args.page_size,
+        compression=args.compression,
+        body_size=args.body_size,
+    )
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Cold start benchmark of the ingestion entry point.
+
+Runs fresh interpreters to measure the import time of `data_ingestion.runner`
+(broken down by top-level package with `-X importtime`) and the time from
+interpreter start to the first HTTP response, then fails when either exceeds
+its budget or when a lazily loaded dependency gets imported at startup.
+
+Usage:
+    python -m data_ingestion.benchmarks.startup [--runs 5] [--import-budget-ms 500]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENTRY_POINT = 'data_ingestion.runner'
+
+# Only imported once they are needed: their presence right after importing
+# the entry point is a regression.
+LAZY_MODULES = ('boto3', 'botocore', 'aiohttp', 'zstandard', 'moto')
+
+_FIRST_REQUEST = """
+import time
+start = time.perf_counter()
+import {module}
+from data_ingestion.extract.http import build_session
+imported = time.perf_counter()
+build_session().get({url!r}, timeout=10)
+done = time.perf_counter()
+print((imported - start) * 1000, (done - start) * 1000)
+"""
+
+
+def _python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    """
+    Runs `code` in a fresh interpreter seeing the same packages as this one.
+    """
+    result = subprocess.run(
+        [sys.executable, *flags, '-c', code],
+        capture_output=True,
+        text=True,
+        env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)},
+    )
+    if result.returncode != 0:
+        raise Exception(f'Benchmark interpreter failed: {result.stderr.strip()}')
+    return result
+
+
+def import_breakdown(module: str = ENTRY_POINT) -> dict[str, float]:
+    """
+    Imports `module` in a fresh interpreter and returns the milliseconds
+    spent importing each top-level package (self times summed), slowest
+    first.
+    """
+    stderr = _python(f'import {module}', '-X', 'importtime').stderr
+    totals: dict[str, float] = {}
+
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line.split(':', 1)[1].split('|')
+        package = name.strip().split('.')[0]
+        totals[package] = totals.get(package, 0.0) + int(self_us) / 1000
+
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def loaded_modules(module: str = ENTRY_POINT) -> set[str]:
+    """
+    Returns the modules loaded by importing `module` in a fresh interpreter.
+    """
+    code = f'import json, sys, {module}; print(json.dumps(sorted(sys.modules)))'
+    return set(json.loads(_python(code).stdout))
+
+
+class _Listing(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b'{"kind": "Listing", "data": {"children": [], "after": null}}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def first_request(module: str = ENTRY_POINT, runs: int = 5) -> dict[str, float]:
+    """
+    Measures, over `runs` fresh interpreters, the median milliseconds from
+    interpreter start to the end of the entry point import, and to the
+    response of a first request to a local server.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Listing)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/r/test/new'
+
+    try:
+        samples = [
+            [
+                float(value)
+                for value in _python(
+                    _FIRST_REQUEST.format(module=module, url=url)
+                ).stdout.split()
+            ]
+            for _ in range(runs)
+        ]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return {
+        'import_ms': statistics.median(sample[0] for sample in samples),
+        'first_request_ms': statistics.median(sample[1] for sample in samples),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Cold start benchmark')
+    parser.add_argument('--module', default=ENTRY_POINT)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--import-budget-ms', type=float, default=500.0)
+    parser.add_argument('--first-request-budget-ms', type=float, default=1000.0)
+    args = parser.parse_args(argv)
+
+    timings = first_request(args.module, args.runs)
+    breakdown = import_breakdown(args.module)
+    eager = sorted(set(LAZY_MODULES) & loaded_modules(args.module))
+
+    report = {
+        **timings,
+        'import_breakdown_ms': dict(list(breakdown.items())[: args.top]),
+        'eager_lazy_modules': eager,
+    }
+    print(json.dumps(report, indent=2))
+
+    failures = []
+    if eager:
+        failures.append(f'imported at startup: {", ".join(eager)}')
+    if timings['import_ms'] > args.import_budget_ms:
+        failures.append(
+            f'import took {timings["import_ms"]:.0f} ms '
+            f'(budget {args.import_budget_ms:.0f} ms)'
+        )
+    if timings['first_request_ms'] > args.first_request_budget_ms:
+        failures.append(
+            f'first request took {timings["first_request_ms"]:.0f} ms '
+            f'(budget {args.first_request_budget_ms:.0f} ms)'
+        )
+
+    for failure in failures:
+        print(f'Startup regression: {failure}', file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
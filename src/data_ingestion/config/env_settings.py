@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+
 class RedditConfig(BaseSettings):
     client_id: str
     client_secret: str
@@ -27,3 +28,55 @@ class AWSConfig(BaseSettings):
         env_prefix='AWS_',
         extra='ignore',
     )
+
+
+class IngestionConfig(BaseSettings):
+    max_workers: int = 1
+    http_pool_size: int = 10
+    http_timeout: float = 10.0
+    async_mode: bool = False
+    async_max_in_flight: int = 100
+    streaming: bool = False
+    token_cache_path: str | None = None
+    retry_max_attempts: int = 4
+    retry_base_delay: float = 1.0
+    retry_max_delay: float = 30.0
+    retry_budget: int = 100
+    compression: str = 'none'
+    compression_level: int | None = None
+    combined_subreddits: list[str] = []
+    combined_group_size: int = 10
+    adaptive_page_size: bool = False
+    min_page_size: int = 25
+    max_page_size: int = 100
+    daemon: bool = False
+    poll_min_interval: float = 5.0
+    poll_max_interval: float = 300.0
+    poll_target_posts: int = 25
+    comments: bool = False
+    comments_workers: int = 4
+    comments_refetch_after: float = 0.0
+    anchor_recovery: bool = True
+    dedup: bool = False
+    dedup_capacity: int = 1_000_000
+    dedup_error_rate: float = 0.001
+    pipeline: bool = False
+    pipeline_extract_workers: int = 4
+    pipeline_encode_workers: int = 1
+    pipeline_load_workers: int = 4
+    pipeline_queue_size: int = 8
+    spool_dir: str | None = None
+    spool_coalesce: bool = False
+    spool_coalesce_max_records: int = 50
+    spool_flush_interval: float = 5.0
+    metrics_dir: str | None = None
+    metrics_interval: float = 60.0
+    profile: bool = False
+    profile_dir: str = 'logs/profile'
+
+    model_config = SettingsConfigDict(
+        env_file='.env',
+        env_file_encoding='utf-8',
+        env_prefix='INGESTION_',
+        extra='ignore',
+    )
@@ -0,0 +1,34 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_TIMEOUT: float = 10.0
+DEFAULT_POOL_SIZE: int = 10
+
+
+def build_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Builds a keep-alive HTTP session with a bounded connection pool.
+
+    The session is safe to share between the ingestion workers: each thread
+    checks a connection out of the pool, and the pool blocks instead of
+    opening extra connections when every one of them is in use.
+
+    Args:
+        pool_size (int): Maximum number of connections kept alive per host.
+            Should be at least the number of ingestion workers.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        pool_block=True,
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+    return session
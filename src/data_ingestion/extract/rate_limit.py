@@ -0,0 +1,127 @@
+import threading
+import time
+from typing import Callable, Mapping
+
+from data_ingestion.utils import metrics
+from data_ingestion.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _header_float(headers: Mapping, name: str) -> float | None:
+    try:
+        return float(headers.get(name))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    A thread-safe token bucket that follows Reddit's rate-limit headers.
+
+    Without any feedback it behaves like a classic token bucket that refills
+    at `capacity / period` tokens per second. Once a response carries the
+    `X-Ratelimit-*` headers the server is authoritative: the bucket holds the
+    remaining budget and refills completely when the window resets. Callers
+    only wait when the budget is actually exhausted.
+
+    Attributes:
+        capacity (float): Requests allowed per window (Reddit: 600).
+        period (float): Window length in seconds (Reddit: 600).
+    """
+
+    capacity: float
+    period: float
+
+    def __init__(
+        self,
+        capacity: float = 600,
+        period: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.capacity = capacity
+        self.period = period
+        self._clock = clock
+        self._sleep = sleep
+
+        self._lock = threading.Lock()
+        self._tokens = float(capacity)
+        self._updated_at = clock()
+        self._reset_at: float | None = None
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+    def _refill(self, now: float) -> None:
+        if self._reset_at is None:
+            elapsed = now - self._updated_at
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        elif now >= self._reset_at:
+            # New window: keep any debt from reservations made past the reset.
+            self._tokens = self.capacity + min(self._tokens, 0.0)
+            self._reset_at = None
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        """
+        Takes one token without blocking.
+
+        Returns:
+            float: Seconds the caller must wait before issuing its request.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+
+            if self._tokens >= 0:
+                return 0.0
+
+            deficit = -self._tokens
+            if self._reset_at is None:
+                return deficit / self.rate
+
+            wait = self._reset_at - now
+            if deficit > self.capacity:
+                wait += (deficit - self.capacity) / self.rate
+            return max(wait, 0.0)
+
+    def acquire(self) -> float:
+        """
+        Takes one token, sleeping only when the budget requires it.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            logger.info('Rate limit budget exhausted, waiting %.2fs', wait)
+            metrics.incr('rate_limit_waits')
+            metrics.incr('rate_limit_wait_seconds', wait)
+            self._sleep(wait)
+        return wait
+
+    def update(self, headers: Mapping) -> None:
+        """
+        Synchronizes the bucket with the `X-Ratelimit-*` response headers.
+
+        Args:
+            headers: The response headers. Missing or malformed values are
+                ignored and the bucket keeps its local estimate.
+        """
+        remaining = _header_float(headers, 'X-Ratelimit-Remaining')
+        if remaining is None:
+            return
+
+        reset = _header_float(headers, 'X-Ratelimit-Reset')
+        used = _header_float(headers, 'X-Ratelimit-Used')
+
+        with self._lock:
+            now = self._clock()
+            if used is not None and remaining + used > 0:
+                self.capacity = remaining + used
+            self._tokens = remaining
+            self._reset_at = now + reset if reset is not None else None
+            self._updated_at = now
@@ -1,12 +1,54 @@
 import requests
-import time
+from typing import TYPE_CHECKING, Any, Iterator
 from requests.auth import HTTPBasicAuth
 from datetime import timedelta
+from data_ingestion.extract.http import DEFAULT_TIMEOUT, build_session
+from data_ingestion.extract.rate_limit import RateLimiter
+from data_ingestion.utils import json_codec, metrics
+from data_ingestion.utils.fullname import fullname_id
 from data_ingestion.utils.logger import get_logger
+from data_ingestion.utils.retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from data_ingestion.extract.token_provider import RedditTokenProvider
 
 logger = get_logger(__name__)
 
 
+class RedditAPIError(Exception):
+    """
+    Raised when the Reddit API answers with an unexpected status code.
+
+    Attributes:
+        status_code (int): The HTTP status code.
+        retry_after (float | None): Seconds to wait before retrying, taken
+            from the Retry-After header when present.
+    """
+
+    def __init__(
+        self, message: str, status_code: int, retry_after: float | None = None
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _retry_after(response: requests.Response) -> float | None:
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Tells whether a Reddit request failure is worth retrying.
+    """
+    if isinstance(error, RedditAPIError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
 class RedditAuth:
     """
     A class to handle Reddit API authentication using OAuth2.
@@ -17,6 +59,8 @@ class RedditAuth:
         username (str): The Reddit username.
         password (str): The Reddit password.
         user_agent (str): The application name
+        session (requests.Session): The pooled HTTP session used for requests.
+        timeout (float): Timeout in seconds for each request.
     """
 
     def __init__(
@@ -26,12 +70,16 @@ class RedditAuth:
         username: str,
         password: str,
         user_agent: str,
+        session: requests.Session | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
     ):
         self.client_id = client_id
         self.client_secret = client_secret
         self.username = username
         self.password = password
         self.user_agent = user_agent
+        self.session = session or build_session(pool_size=1)
+        self.timeout = timeout
 
     def access_token(self) -> str:
         """
@@ -40,6 +88,16 @@ class RedditAuth:
         Returns:
             str: The access token.
         """
+        return self.request_token()['access_token']
+
+    def request_token(self) -> dict:
+        """
+        Requests a new access token for Reddit API using OAuth2.
+
+        Returns:
+            dict: The token response, holding 'access_token' and
+                'expires_in' (seconds).
+        """
         auth: HTTPBasicAuth = HTTPBasicAuth(self.client_id, self.client_secret)
         data: dict[str, str] = {
             'grant_type': 'password',
@@ -48,17 +106,19 @@ class RedditAuth:
         }
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 'https://www.reddit.com/api/v1/access_token',
                 auth=auth,
                 data=data,
                 headers={'User-Agent': self.user_agent},
+                timeout=self.timeout,
             )
         except requests.RequestException as e:
             logger.error(f'Error obtaining access token: {e}')
             raise Exception(f'Error obtaining access token: {e}')
 
-        token = response.json().get('access_token')
+        payload = response.json()
+        token = payload.get('access_token')
 
         if response.status_code != 200:
             logger.error(
@@ -72,9 +132,9 @@ class RedditAuth:
             raise Exception('Access token not found in Reddit API response.')
 
         logger.info(
-            f'Access token obtained successfully. Expires in {timedelta(seconds=response.json().get("expires_in", 0))}.'
+            f'Access token obtained successfully. Expires in {timedelta(seconds=payload.get("expires_in", 0))}.'
         )
-        return token
+        return payload
 
 
 class RedditExtractor:
@@ -87,21 +147,48 @@ class RedditExtractor:
         username (str): The Reddit username.
         password (str): The Reddit password.
         user_agent (str): The application name
+        session (requests.Session): The pooled keep-alive HTTP session, shared
+            by every ingestion worker.
+        timeout (float): Timeout in seconds for each request.
+        token_provider (RedditTokenProvider | None): When set, the token is
+            taken from it on every request instead of the static `token`.
+        retry_policy (RetryPolicy | None): When set, 429/5xx responses and
+            connection errors are retried according to it.
+        base_url (str): Root of the API (a local fake server in benchmarks).
     """
 
     base_url: str
-    token: str
+    token: str | None
     user_agent: str
     headers: dict[str, str]
+    rate_limiter: RateLimiter
+    session: requests.Session
+    timeout: float
+    token_provider: 'RedditTokenProvider | None'
+    retry_policy: RetryPolicy | None
+
+    # Largest number of ids accepted by /api/morechildren.
+    MORE_CHILDREN_BATCH = 100
 
     def __init__(
         self,
-        token: str,
+        token: str | None,
         user_agent: str,
+        rate_limiter: RateLimiter | None = None,
+        session: requests.Session | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        token_provider: 'RedditTokenProvider | None' = None,
+        retry_policy: RetryPolicy | None = None,
+        base_url: str = 'https://oauth.reddit.com',
     ):
-        self.base_url = 'https://oauth.reddit.com'
+        self.base_url = base_url
         self.token = token
         self.user_agent = user_agent
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.session = session or build_session()
+        self.timeout = timeout
+        self.token_provider = token_provider
+        self.retry_policy = retry_policy
 
         self.headers = {
             'Authorization': f'bearer {self.token}',
@@ -109,6 +196,39 @@ class RedditExtractor:
         }
         logger.info('RedditExtractor initialized')
 
+    def _get(self, url: str, params: dict) -> requests.Response:
+        """
+        Issues a GET request within the shared rate limit budget.
+
+        With a token provider, a 401 response invalidates the token and the
+        request is retried once with a fresh one.
+        """
+        retried = False
+        while True:
+            if self.token_provider is None:
+                token, headers = self.token, self.headers
+            else:
+                token = self.token_provider.token()
+                headers = {
+                    'Authorization': f'bearer {token}',
+                    'User-Agent': self.user_agent,
+                }
+
+            self.rate_limiter.acquire()
+            metrics.incr('requests')
+            with metrics.timer('page_fetch'):
+                response = self.session.get(
+                    url, headers=headers, params=params, timeout=self.timeout
+                )
+            self.rate_limiter.update(response.headers)
+
+            if response.status_code != 401 or self.token_provider is None or retried:
+                return response
+
+            logger.warning('Access token rejected by Reddit API, refreshing it')
+            self.token_provider.invalidate(token)
+            retried = True
+
     def fetch_thread_before(
         self, subreddit: str, fullname: str, limit: int = 25
     ) -> dict:
@@ -119,46 +239,143 @@ class RedditExtractor:
             'before': fullname,
         }
 
-        response = requests.get(url, headers=self.headers, params=params)
+        return self._get_json(
+            url, params, error=f'Failed to fetch thread from subreddit: {subreddit}'
+        )
 
-        if response.status_code == 200:
-            return response.json()
-        else:
-            logger.error(f'Failed to fetch thread from subreddit: {subreddit}')
-            raise Exception(
-                f'[{response.status_code}] Failed to fetch thread from subreddit: {subreddit}'
+    def fetch_thread_after(
+        self, subreddit: str, fullname: str, limit: int = 100
+    ) -> dict:
+        """
+        Fetches the page of threads older than `fullname` (the newest page
+        when it is empty), walking the feed back in time.
+        """
+        thread_endpoint = f'/r/{subreddit}/new'
+        url = f'{self.base_url}{thread_endpoint}'
+        params = {
+            'limit': limit,
+            'after': fullname,
+        }
+
+        return self._get_json(
+            url, params, error=f'Failed to fetch thread from subreddit: {subreddit}'
+        )
+
+    def anchor_exists(self, subreddit: str, fullname: str) -> bool:
+        """
+        Tells whether a post can still be used as a pagination anchor.
+
+        Reddit answers an empty listing when the `before` anchor was deleted
+        or removed, exactly as when nothing was posted since. Probing one
+        item `after` the anchor tells both cases apart: it is only non-empty
+        while the anchor is still part of the listing (or, in the rare case
+        of the listing's very last post, never).
+        """
+        page = self.fetch_thread_after(subreddit=subreddit, fullname=fullname, limit=1)
+        return bool(page.get('data', {}).get('children'))
+
+    def scan_newer_than(
+        self,
+        subreddit: str,
+        fullname: str,
+        since: float | None = None,
+        limit: int = 100,
+        max_pages: int = 10,
+    ) -> list[dict]:
+        """
+        Fetches the threads newer than `fullname` without using it as an
+        anchor, by walking the feed back from the newest post.
+
+        The walk stops at the first post created at or before `fullname`
+        (ids grow with creation time) or before the `since` created_utc
+        bound, or after `max_pages` pages.
+
+        Returns:
+            list[dict]: The pages holding only the newer threads, newest page
+                first, as returned by batch().
+        """
+        threshold = fullname_id(fullname)
+        result: list[dict] = []
+        after = ''
+
+        for _ in range(max_pages):
+            page = self.fetch_thread_after(
+                subreddit=subreddit, fullname=after, limit=limit
             )
+            data = page.get('data', {})
+            children = data.get('children', [])
+            newer = [
+                child
+                for child in children
+                if fullname_id(child['data']['name']) > threshold
+                and (since is None or child['data'].get('created_utc', since) >= since)
+            ]
 
-    def batch(
+            if newer:
+                result.append({**page, 'data': {**data, 'children': newer}})
+            if len(newer) < len(children) or not children or data.get('after') is None:
+                return result
+            after = children[-1]['data']['name']
+
+        logger.warning(
+            f'Scan of {subreddit} stopped after {max_pages} pages, '
+            f'older threads may be missing'
+        )
+        return result
+
+    def _get_json(self, url: str, params: dict, error: str) -> Any:
+        """
+        Fetches a JSON document, retrying transient failures if configured.
+        Listings are objects, but a comments page is a pair of listings.
+
+        Raises:
+            RedditAPIError: If the final response is not a 200.
+        """
+
+        def fetch() -> Any:
+            response = self._get(url, params)
+
+            if response.status_code == 200:
+                with metrics.timer('decode'):
+                    return json_codec.loads(response.content)
+
+            logger.error(error)
+            raise RedditAPIError(
+                f'[{response.status_code}] {error}',
+                status_code=response.status_code,
+                retry_after=_retry_after(response),
+            )
+
+        if self.retry_policy is None:
+            return fetch()
+        return self.retry_policy.call(fetch, is_retryable, description=url)
+
+    def iter_pages(
         self,
         subreddit: str,
         fullname: str,
         limit: int = 25,
-    ) -> list[dict]:
+    ) -> Iterator[dict]:
         """
-        Performs an incremental sync of new threads using a pagination anchor.
+        Lazily walks the subreddit feed forward from a pagination anchor.
 
-        This method traverses the subreddit feed backwards from a specific point
-        (the 'fullname' anchor) towards the most recent post. It uses the 'before'
-        parameter to fetch batches of data until no newer items are found.
+        Pages are yielded as soon as they are fetched, oldest first: the first
+        page holds the threads right after the 'fullname' anchor and the last
+        one the most recent threads. Only the current page is held in memory.
 
         Args:
             subreddit (str): The name of the subreddit to synchronize.
             fullname (str): The fullname (type_id) of the item to use as the
-                anchor point for the slice. The sync fetches items created
-                after this point.
+                anchor point for the slice.
             limit (int, optional): The maximum number of items to return in
                 each slice of the listing. Defaults to 25 (max is 100).
 
-        Returns:
-            list[dict]: A list of JSON response dictionaries containing the
-                newly fetched batches of threads.
+        Yields:
+            dict: Each non-empty JSON listing response.
         """
-
-        result: list = []
         before: str = fullname
 
-        while before is not None:
+        while True:
             try:
                 response = self.fetch_thread_before(
                     subreddit=subreddit, fullname=before, limit=limit
@@ -169,24 +386,159 @@ class RedditExtractor:
                 )
                 raise e
 
-            if len(response.get('data', {}).get('children', [])) == 0:
-                before = None
-            else:
-                logger.info(f'Fetched threads successfully from subreddit: {subreddit}')
+            children = response.get('data', {}).get('children', [])
+            if len(children) == 0:
+                return
 
-                before = (
-                    response.get('data', {})
-                    .get('children', [{}])[0]
-                    .get('data', {})
-                    .get('name', '')
-                )
+            logger.info('Fetched threads successfully from subreddit: %s', subreddit)
+            before = children[0].get('data', {}).get('name', '')
+            yield response
+
+    def batch(
+        self,
+        subreddit: str,
+        fullname: str,
+        limit: int = 25,
+    ) -> list[dict]:
+        """
+        Performs an incremental sync of new threads using a pagination anchor.
+
+        This method traverses the subreddit feed backwards from a specific point
+        (the 'fullname' anchor) towards the most recent post. It uses the 'before'
+        parameter to fetch batches of data until no newer items are found.
 
-                result.insert(0, response)
-            
-            time.sleep(1)
+        Args:
+            subreddit (str): The name of the subreddit to synchronize.
+            fullname (str): The fullname (type_id) of the item to use as the
+                anchor point for the slice. The sync fetches items created
+                after this point.
+            limit (int, optional): The maximum number of items to return in
+                each slice of the listing. Defaults to 25 (max is 100).
 
+        Returns:
+            list[dict]: A list of JSON response dictionaries containing the
+                newly fetched batches of threads, newest page first.
+        """
+        result = list(
+            self.iter_pages(subreddit=subreddit, fullname=fullname, limit=limit)
+        )
+        result.reverse()
         return result
 
-    def fetch_comments(self, subreddit) -> None:
-        comments_endpoint = '#'
-        pass
+    def fetch_comments(
+        self, subreddit: str, article: str, limit: int = 500
+    ) -> list[dict]:
+        """
+        Fetches the comment tree of a post.
+
+        Args:
+            subreddit (str): The subreddit of the post.
+            article (str): The post fullname (t3_...) or id.
+            limit (int, optional): Maximum number of comments returned by
+                Reddit; the rest is summarized in 'more' stubs.
+
+        Returns:
+            list[dict]: Reddit's pair of listings: the post and its comments.
+        """
+        article_id = article.removeprefix('t3_')
+        comments_endpoint = f'/r/{subreddit}/comments/{article_id}'
+        url = f'{self.base_url}{comments_endpoint}'
+        params = {
+            'limit': limit,
+            'sort': 'new',
+            'raw_json': 1,
+        }
+
+        return self._get_json(
+            url, params, error=f'Failed to fetch comments of {article} in {subreddit}'
+        )
+
+    def fetch_more_children(self, article: str, children: list[str]) -> list[dict]:
+        """
+        Expands 'more' stubs of a post through /api/morechildren.
+
+        Args:
+            article (str): The post fullname (t3_...).
+            children (list[str]): Comment ids to expand, at most
+                MORE_CHILDREN_BATCH per call.
+
+        Returns:
+            list[dict]: The expanded things, flat (see their 'parent_id'),
+                possibly including further 'more' stubs.
+        """
+        url = f'{self.base_url}/api/morechildren'
+        params = {
+            'api_type': 'json',
+            'link_id': article,
+            'children': ','.join(children),
+            'limit_children': False,
+            'raw_json': 1,
+        }
+
+        response = self._get_json(
+            url, params, error=f'Failed to expand comments of {article}'
+        )
+        return response.get('json', {}).get('data', {}).get('things', [])
+
+    def fetch_comment_tree(self, subreddit: str, article: str) -> dict:
+        """
+        Fetches the comment tree of a post and expands all of its 'more'
+        stubs, MORE_CHILDREN_BATCH ids per /api/morechildren call.
+
+        'Continue this thread' stubs (deep threads, without ids) are left in
+        the tree.
+
+        Returns:
+            dict: {'article', 'subreddit', 'listing', 'more'} where 'listing'
+                is the response of fetch_comments and 'more' holds the
+                expanded comments, flat.
+        """
+        article = article if article.startswith('t3_') else f't3_{article}'
+        listing = self.fetch_comments(subreddit, article)
+
+        pending = _more_ids(listing[1] if len(listing) > 1 else {})
+        more: list[dict] = []
+
+        while pending:
+            children = pending[: self.MORE_CHILDREN_BATCH]
+            pending = pending[self.MORE_CHILDREN_BATCH :]
+
+            for thing in self.fetch_more_children(article, children):
+                if thing.get('kind') == 'more':
+                    pending += thing.get('data', {}).get('children', [])
+                else:
+                    more.append(thing)
+
+        logger.info(
+            'Fetched comments of %s in %s (%d expanded from stubs)',
+            article,
+            subreddit,
+            len(more),
+        )
+        return {
+            'article': article,
+            'subreddit': subreddit,
+            'listing': listing,
+            'more': more,
+        }
+
+
+def _more_ids(listing: dict) -> list[str]:
+    """
+    Collects the comment ids held by the 'more' stubs of a listing.
+    """
+    ids: list[str] = []
+    stack = [listing]
+
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        for child in node.get('data', {}).get('children', []):
+            data = child.get('data', {})
+            if child.get('kind') == 'more':
+                ids += data.get('children', [])
+            else:
+                stack.append(data.get('replies'))
+
+    return ids
@@ -0,0 +1,263 @@
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from data_ingestion.extract.http import DEFAULT_TIMEOUT
+from data_ingestion.extract.rate_limit import RateLimiter
+from data_ingestion.extract.reddit import RedditAPIError
+from data_ingestion.utils import json_codec, metrics
+from data_ingestion.utils.logger import get_logger
+from data_ingestion.utils.retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from data_ingestion.extract.token_provider import RedditTokenProvider
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _Response:
+    status: int
+    payload: dict | None
+    retry_after: float | None = None
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Tells whether an async Reddit request failure is worth retrying.
+    """
+    if isinstance(error, RedditAPIError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, (OSError, asyncio.TimeoutError))
+
+
+def _retry_after(headers) -> float | None:
+    try:
+        return float(headers.get('Retry-After'))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class AsyncRedditExtractor:
+    """
+    An asyncio counterpart of RedditExtractor built on aiohttp.
+
+    A single event loop can poll hundreds of subreddits: the number of
+    requests in flight is capped by a semaphore, and every request draws from
+    the same RateLimiter the synchronous extractor uses.
+
+    Attributes:
+        token (str): The OAuth2 access token.
+        user_agent (str): The application name.
+        rate_limiter (RateLimiter): The shared request budget.
+        max_in_flight (int): Maximum number of concurrent HTTP requests.
+        timeout (float): Timeout in seconds for each request.
+        token_provider (RedditTokenProvider | None): When set, the token is
+            taken from it on every request instead of the static `token`.
+            Refreshes block the loop briefly, about once per token lifetime.
+        retry_policy (RetryPolicy | None): When set, 429/5xx responses and
+            connection errors are retried according to it.
+        base_url (str): Root of the API (a local fake server in benchmarks).
+    """
+
+    base_url: str
+    token: str | None
+    user_agent: str
+    headers: dict[str, str]
+    rate_limiter: RateLimiter
+    max_in_flight: int
+    timeout: float
+    token_provider: 'RedditTokenProvider | None'
+    retry_policy: RetryPolicy | None
+
+    def __init__(
+        self,
+        token: str | None,
+        user_agent: str,
+        rate_limiter: RateLimiter | None = None,
+        session=None,
+        max_in_flight: int = 100,
+        timeout: float = DEFAULT_TIMEOUT,
+        token_provider: 'RedditTokenProvider | None' = None,
+        retry_policy: RetryPolicy | None = None,
+        base_url: str = 'https://oauth.reddit.com',
+    ):
+        self.base_url = base_url
+        self.token = token
+        self.user_agent = user_agent
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.token_provider = token_provider
+        self.retry_policy = retry_policy
+
+        self.headers = {
+            'Authorization': f'bearer {self.token}',
+            'User-Agent': self.user_agent,
+        }
+
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore: asyncio.Semaphore | None = None
+        logger.info('AsyncRedditExtractor initialized')
+
+    async def __aenter__(self) -> 'AsyncRedditExtractor':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _get_session(self):
+        if self._session is None:
+            try:
+                import aiohttp
+            except ImportError as e:
+                raise ImportError(
+                    'AsyncRedditExtractor requires aiohttp: install cryptocore[async]'
+                ) from e
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_in_flight),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'Accept-Encoding': 'gzip, deflate'},
+            )
+        return self._session
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    async def close(self) -> None:
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+            self._session = None
+
+    async def _get(self, url: str, params: dict) -> '_Response':
+        """
+        Issues a GET request within the in-flight cap and the rate limit.
+
+        With a token provider, a 401 response invalidates the token and the
+        request is retried once with a fresh one.
+        """
+        retried = False
+        while True:
+            if self.token_provider is None:
+                token, headers = self.token, self.headers
+            else:
+                token = self.token_provider.token()
+                headers = {
+                    'Authorization': f'bearer {token}',
+                    'User-Agent': self.user_agent,
+                }
+
+            async with self._get_semaphore():
+                wait = self.rate_limiter.reserve()
+                if wait > 0:
+                    metrics.incr('rate_limit_waits')
+                    metrics.incr('rate_limit_wait_seconds', wait)
+                    await asyncio.sleep(wait)
+
+                metrics.incr('requests')
+                with metrics.timer('page_fetch'):
+                    async with self._get_session().get(
+                        url, headers=headers, params=params
+                    ) as response:
+                        self.rate_limiter.update(response.headers)
+                        content = await response.read()
+                        status, response_headers = response.status, response.headers
+
+                payload = None
+                if status == 200:
+                    with metrics.timer('decode'):
+                        payload = json_codec.loads(content)
+                result = _Response(
+                    status=status,
+                    payload=payload,
+                    retry_after=_retry_after(response_headers),
+                )
+
+            if result.status != 401 or self.token_provider is None or retried:
+                return result
+
+            logger.warning('Access token rejected by Reddit API, refreshing it')
+            self.token_provider.invalidate(token)
+            retried = True
+
+    async def fetch_thread_before(
+        self, subreddit: str, fullname: str, limit: int = 25
+    ) -> dict:
+        thread_endpoint = f'/r/{subreddit}/new'
+        url = f'{self.base_url}{thread_endpoint}'
+        params = {
+            'limit': str(limit),
+            'before': fullname,
+        }
+
+        return await self._get_json(
+            url, params, error=f'Failed to fetch thread from subreddit: {subreddit}'
+        )
+
+    async def _get_json(self, url: str, params: dict, error: str) -> dict:
+        """
+        Fetches a JSON document, retrying transient failures if configured.
+
+        Raises:
+            RedditAPIError: If the final response is not a 200.
+        """
+
+        async def fetch() -> dict:
+            response = await self._get(url, params)
+            if response.status == 200:
+                return response.payload
+
+            logger.error(error)
+            raise RedditAPIError(
+                f'[{response.status}] {error}',
+                status_code=response.status,
+                retry_after=response.retry_after,
+            )
+
+        if self.retry_policy is None:
+            return await fetch()
+        return await self.retry_policy.acall(fetch, is_retryable, description=url)
+
+    async def batch(
+        self,
+        subreddit: str,
+        fullname: str,
+        limit: int = 25,
+    ) -> list[dict]:
+        """
+        Performs an incremental sync of new threads using a pagination anchor.
+
+        Same contract as RedditExtractor.batch: pages are returned newest
+        first.
+        """
+        result: list = []
+        before: str = fullname
+
+        while before is not None:
+            try:
+                response = await self.fetch_thread_before(
+                    subreddit=subreddit, fullname=before, limit=limit
+                )
+            except Exception as e:
+                logger.error(
+                    f'Error occurred while fetching threads from subreddit: {subreddit}'
+                )
+                raise e
+
+            children = response.get('data', {}).get('children', [])
+            if len(children) == 0:
+                before = None
+            else:
+                logger.info(
+                    'Fetched threads successfully from subreddit: %s', subreddit
+                )
+                before = children[0].get('data', {}).get('name', '')
+                result.append(response)
+
+        result.reverse()
+        return result
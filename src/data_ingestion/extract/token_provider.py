@@ -0,0 +1,141 @@
+import json
+import os
+import stat
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from data_ingestion.extract.reddit import RedditAuth
+from data_ingestion.utils import metrics
+from data_ingestion.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RedditTokenProvider:
+    """
+    Caches a Reddit OAuth2 token and refreshes it before it expires.
+
+    The provider is shared by every worker: the token is fetched once and
+    renewed `refresh_margin` seconds before its expiry, so a long batch never
+    runs into an expired token. With a `cache_path`, the token is also kept
+    on disk (owner read/write only) so back-to-back runs skip the OAuth round
+    trip.
+
+    Attributes:
+        auth (RedditAuth): Used to request new tokens.
+        cache_path (Path | None): Optional on-disk token cache.
+        refresh_margin (float): Seconds before expiry at which the token is
+            renewed.
+    """
+
+    auth: RedditAuth
+    cache_path: Path | None
+    refresh_margin: float
+
+    def __init__(
+        self,
+        auth: RedditAuth,
+        cache_path: str | None = None,
+        refresh_margin: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.auth = auth
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.refresh_margin = refresh_margin
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._token: str | None = None
+        self._expires_at = 0.0
+        self._cache_loaded = False
+
+    def token(self) -> str:
+        """
+        Returns a valid access token, refreshing it if it is about to expire.
+        """
+        with self._lock:
+            if not self._cache_loaded:
+                self._cache_loaded = True
+                self._load_cache()
+
+            if (
+                self._token is None
+                or self._clock() >= self._expires_at - self.refresh_margin
+            ):
+                self._refresh()
+
+            return self._token
+
+    def invalidate(self, token: str | None = None) -> None:
+        """
+        Drops the cached token so the next call fetches a new one.
+
+        Args:
+            token: The token that was rejected. If another worker already
+                replaced it, nothing is dropped, so concurrent 401s trigger a
+                single refresh.
+        """
+        with self._lock:
+            if token is None or token == self._token:
+                self._token = None
+                self._expires_at = 0.0
+
+    def _refresh(self) -> None:
+        with metrics.timer('auth'):
+            payload = self.auth.request_token()
+        self._token = payload['access_token']
+        self._expires_at = self._clock() + float(payload.get('expires_in', 3600))
+        self._save_cache()
+
+    def _cache_owner(self) -> str:
+        return f'{self.auth.client_id}:{self.auth.username}'
+
+    def _load_cache(self) -> None:
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+
+        try:
+            mode = self.cache_path.stat().st_mode
+            if mode & (stat.S_IRWXG | stat.S_IRWXO):
+                logger.warning(
+                    f'Ignoring token cache readable by other users: {self.cache_path}'
+                )
+                return
+
+            cached = json.loads(self.cache_path.read_text(encoding='utf-8'))
+            if cached.get('owner') != self._cache_owner():
+                return
+
+            self._token = cached['access_token']
+            self._expires_at = float(cached['expires_at'])
+            logger.info('Access token loaded from cache.')
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f'Ignoring unreadable token cache {self.cache_path}: {e}')
+
+    def _save_cache(self) -> None:
+        if self.cache_path is None:
+            return
+
+        payload = json.dumps(
+            {
+                'owner': self._cache_owner(),
+                'access_token': self._token,
+                'expires_at': self._expires_at,
+            }
+        ).encode('utf-8')
+
+        tmp_path = self.cache_path.with_name(f'.{self.cache_path.name}.tmp')
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                os.write(fd, payload)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f'Failed to write token cache {self.cache_path}: {e}')
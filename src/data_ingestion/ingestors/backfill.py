@@ -0,0 +1,185 @@
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from data_ingestion.extract.reddit import RedditExtractor
+from data_ingestion.load.aws_s3 import AWSServiceS3
+from data_ingestion.load.checkpoint import BackfillState, S3BackfillStore
+from data_ingestion.load.dedup import S3SeenIndexStore, SeenIndex
+from data_ingestion.load.s3_key import RedditS3Key
+from data_ingestion.utils import metrics
+from data_ingestion.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def in_shard(subreddit: str, shard: int, shards: int) -> bool:
+    """
+    Tells whether a subreddit belongs to a shard, by a stable hash of its
+    name, so every backfill process can pick its share independently.
+    """
+    return zlib.crc32(subreddit.casefold().encode('utf-8')) % shards == shard
+
+
+class RedditBackfiller:
+    """
+    Crawls the history of subreddits backwards with `after` pagination.
+
+    Each page is stored as its own object under
+    `raw/reddit_backfill/<subreddit>/`, in the RedditS3Key format, so it
+    never interferes with the forward-sync checkpoints under `raw/reddit/`.
+    The BackfillState is written after every page: a crashed or stopped
+    backfill resumes from the last stored page (which may be stored twice
+    if the crash happened between the upload and the state write).
+
+    Attributes:
+        extractor (RedditExtractor): Fetches the pages.
+        storage (AWSServiceS3): Where the pages are written.
+        states (S3BackfillStore): Where the progress is kept.
+        limit (int): Page size (Reddit accepts up to 100).
+        until (float | None): Oldest creation timestamp to fetch.
+        max_pages (int | None): Depth cap, in pages, per subreddit.
+        seen (S3SeenIndexStore | None): When set, the threads already stored
+            (e.g. by the forward sync) are not stored again, and the
+            backfilled ones are added to the index.
+    """
+
+    DATASET = 'reddit_backfill'
+    # Pages between two writes of the seen index (about 2 MB each).
+    SEEN_FLUSH_PAGES = 20
+
+    def __init__(
+        self,
+        extractor: RedditExtractor,
+        storage: AWSServiceS3,
+        states: S3BackfillStore,
+        limit: int = 100,
+        until: float | None = None,
+        max_pages: int | None = None,
+        seen: S3SeenIndexStore | None = None,
+    ):
+        self.extractor = extractor
+        self.storage = storage
+        self.states = states
+        self.limit = limit
+        self.until = until
+        self.max_pages = max_pages
+        self.seen = seen
+
+    def backfill_subreddit(self, subreddit: str) -> BackfillState:
+        """
+        Backfills a subreddit from its saved state until the date bound, the
+        depth cap or the end of the listing.
+        """
+        state = self.states.get(subreddit) or BackfillState()
+        if state.done:
+            logger.info(f'Backfill of {subreddit} already complete')
+            return state
+
+        logger.info(f'Backfilling {subreddit} from {state.after or "the newest post"}')
+        index = self.seen.get(subreddit) if self.seen is not None else None
+
+        while self.max_pages is None or state.pages < self.max_pages:
+            page = self.extractor.fetch_thread_after(
+                subreddit=subreddit, fullname=state.after or '', limit=self.limit
+            )
+            data = page.get('data', {})
+            children = data.get('children', [])
+            reached_bound = False
+
+            if self.until is not None:
+                kept = [
+                    child
+                    for child in children
+                    if child.get('data', {}).get('created_utc', 0) >= self.until
+                ]
+                reached_bound = len(kept) < len(children)
+                children = kept
+
+            if children:
+                self._store(
+                    subreddit, {**page, 'data': {**data, 'children': children}}, index
+                )
+                state.after = children[-1]['data']['name']
+                state.pages += 1
+                state.posts += len(children)
+
+            state.done = reached_bound or not children or data.get('after') is None
+            state.updated_at = datetime.now().timestamp()
+            if index is not None and state.pages % self.SEEN_FLUSH_PAGES == 0:
+                self.seen.put(subreddit, index)
+            self.states.put(subreddit, state)
+
+            if state.done:
+                break
+
+        if index is not None:
+            self.seen.put(subreddit, index)
+
+        logger.info(
+            f'Backfill of {subreddit}: {state.pages} pages, {state.posts} posts'
+            f'{" (complete)" if state.done else ""}'
+        )
+        return state
+
+    def _store(self, subreddit: str, page: dict, index: SeenIndex | None) -> None:
+        if index is not None:
+            pages = index.drop_seen([page])
+            if not pages:
+                logger.info(f'Page of {subreddit} already stored, skipping it')
+                return
+            page = pages[0]
+
+        children = page['data']['children']
+        s3_key = RedditS3Key.build(
+            subreddit=subreddit,
+            head=children[0]['data']['name'],
+            tail=children[-1]['data']['name'],
+            extension=self.storage.codec.extension,
+            dataset=self.DATASET,
+        ).to_s3_key()
+
+        self.storage.upload(s3_key=s3_key, data=[page])
+
+        if index is not None:
+            for child in children:
+                index.add(child['data']['name'])
+        logger.info(f'Backfilled {len(children)} posts of {subreddit} -> {s3_key}')
+
+    def _safe_backfill(self, subreddit: str) -> None:
+        try:
+            with metrics.scope(subreddit):
+                self.backfill_subreddit(subreddit)
+        except Exception as e:
+            logger.error(f'Error during backfill of {subreddit}: {e}')
+
+    def run(
+        self,
+        subreddits: list[str],
+        max_workers: int = 1,
+        shard: int = 0,
+        shards: int = 1,
+    ) -> None:
+        """
+        Backfills the subreddits of a shard.
+
+        Args:
+            subreddits: All the subreddits to backfill.
+            max_workers: Subreddits backfilled in parallel by this process.
+            shard: Index of this process's shard, in [0, shards).
+            shards: Number of processes sharing the backfill.
+        """
+        subreddits = [
+            subreddit for subreddit in subreddits if in_shard(subreddit, shard, shards)
+        ]
+        logger.info(f'Backfill shard {shard}/{shards}: {subreddits}')
+
+        if max_workers <= 1:
+            for subreddit in subreddits:
+                self._safe_backfill(subreddit)
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='backfill'
+        ) as pool:
+            list(pool.map(self._safe_backfill, subreddits))
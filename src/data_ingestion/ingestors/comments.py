@@ -0,0 +1,185 @@
+import contextvars
+import json
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from data_ingestion.extract.reddit import RedditExtractor
+from data_ingestion.load.aws_s3 import AWSServiceS3
+from data_ingestion.load.compression import Codec
+from data_ingestion.load.s3_key import RedditS3Key
+from data_ingestion.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RedditCommentIngestor:
+    """
+    Fetches the comment trees of freshly ingested posts and stores them.
+
+    The trees of a batch of posts are fetched concurrently (each one being a
+    comments call plus its /api/morechildren expansions) through the same
+    extractor, hence within the same rate limit budget as the threads. They
+    are streamed, in post order, into one object per batch named like the
+    thread object: `raw/reddit_comments/<subreddit>/<date>/h-<head>-t-<tail>-...`
+    where head and tail are the newest and oldest post of the batch.
+
+    Fresh posts have few comments yet, so with `refetch_after` every batch
+    is fetched again once, that many seconds later, into a new object of
+    the same name with a later timestamp. The pending re-fetches are kept
+    under `state/` per subreddit, so they survive restarts, and are run by
+    refetch_due().
+
+    Attributes:
+        extractor (RedditExtractor): Shared with the thread ingestion.
+        storage (AWSServiceS3): Where the comment objects are written.
+        max_workers (int): Comment trees fetched at the same time.
+        refetch_after (float): Seconds before a batch is fetched again (0
+            disables the re-fetch).
+    """
+
+    DATASET = 'reddit_comments'
+    _STATE = 'state/reddit_comments/{subreddit}/_refetch.json'
+
+    def __init__(
+        self,
+        extractor: RedditExtractor,
+        storage: AWSServiceS3,
+        max_workers: int = 4,
+        refetch_after: float = 0.0,
+    ):
+        self.extractor = extractor
+        self.storage = storage
+        self.max_workers = max_workers
+        self.refetch_after = refetch_after
+
+        # Batches are scheduled by the spool flusher thread as well.
+        self._lock = threading.Lock()
+        # Earliest due re-fetch of each subreddit whose state was read.
+        self._due: dict[str, float] = {}
+
+    def _fetch(self, subreddit: str, article: str) -> dict | None:
+        try:
+            return self.extractor.fetch_comment_tree(subreddit, article)
+        except Exception as e:
+            logger.error(f'Failed to fetch comments of {article} in {subreddit}: {e}')
+            return None
+
+    def ingest(self, subreddit: str, articles: list[str]) -> str | None:
+        """
+        Stores the comment trees of a batch of posts.
+
+        Args:
+            subreddit: The subreddit of the posts.
+            articles: Post fullnames, newest first.
+
+        Returns:
+            The S3 key written, or None when there was nothing to store.
+        """
+        if not articles:
+            return None
+
+        s3_key = self._ingest(subreddit, articles)
+
+        if self.refetch_after > 0:
+            entry = {'articles': articles, 'due': time.time() + self.refetch_after}
+            with self._lock:
+                self._write_state(subreddit, self._read_state(subreddit) + [entry])
+
+        return s3_key
+
+    def refetch_due(self, subreddit: str, now: float | None = None) -> int:
+        """
+        Fetches again the batches of `subreddit` whose re-fetch is due.
+
+        The state is only read again once the earliest known re-fetch is
+        due. A failed re-fetch is logged and not retried.
+
+        Returns:
+            The number of batches fetched again.
+        """
+        if self.refetch_after <= 0:
+            return 0
+
+        now = time.time() if now is None else now
+        with self._lock:
+            if self._due.get(subreddit, -math.inf) > now:
+                return 0
+
+            entries = self._read_state(subreddit)
+            due = [entry for entry in entries if entry['due'] <= now]
+            if due:
+                self._write_state(
+                    subreddit, [entry for entry in entries if entry['due'] > now]
+                )
+            else:
+                self._due[subreddit] = min(
+                    (entry['due'] for entry in entries), default=math.inf
+                )
+
+        for entry in due:
+            try:
+                self._ingest(subreddit, entry['articles'])
+            except Exception as e:
+                logger.error(f'Failed to re-fetch comments for {subreddit}: {e}')
+
+        return len(due)
+
+    def _read_state(self, subreddit: str) -> list[dict]:
+        body = self.storage.read(self._STATE.format(subreddit=subreddit))
+        if body is None:
+            return []
+
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            logger.warning(f'Ignoring malformed re-fetch state for {subreddit}: {e}')
+            return []
+
+    def _write_state(self, subreddit: str, entries: list[dict]) -> None:
+        # Like the checkpoint pointers, the state is never compressed.
+        self.storage.upload(
+            s3_key=self._STATE.format(subreddit=subreddit), data=entries, codec=Codec()
+        )
+        self._due[subreddit] = min(
+            (entry['due'] for entry in entries), default=math.inf
+        )
+
+    def _ingest(self, subreddit: str, articles: list[str]) -> str | None:
+        s3_key = RedditS3Key.build(
+            subreddit=subreddit,
+            head=articles[0],
+            tail=articles[-1],
+            extension=self.storage.codec.extension,
+            dataset=self.DATASET,
+        ).to_s3_key()
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix='comments'
+        ) as pool:
+            # Each fetch runs in a copy of the caller's context, so it is
+            # recorded under the caller's metrics scope.
+            context = contextvars.copy_context()
+            trees = pool.map(
+                lambda article: context.copy().run(self._fetch, subreddit, article),
+                articles,
+            )
+
+            with self.storage.open_writer(s3_key) as writer:
+                for tree in trees:
+                    if tree is not None:
+                        writer.write(tree)
+
+                if writer.items == 0:
+                    writer.abort()
+
+        if writer.items == 0:
+            logger.warning(f'No comments fetched for subreddit: {subreddit}')
+            return None
+
+        logger.info(
+            f'Successfully ingested comments of {writer.items} posts '
+            f'from {subreddit} -> {s3_key}'
+        )
+        return s3_key
@@ -0,0 +1,142 @@
+import queue
+import threading
+from typing import Callable
+
+from data_ingestion.ingestors.reddit import RedditIngestor, StagedBatch
+from data_ingestion.utils import metrics
+from data_ingestion.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Tells a stage worker that its inbox is exhausted.
+_DONE = object()
+
+
+class IngestionPipeline:
+    """
+    Runs the ingestion as three overlapping stages linked by bounded queues.
+
+    - extract: checkpoint lookup, Reddit pagination, dedup and naming of
+      the batch of each subreddit;
+    - encode: JSON encoding and compression of each batch;
+    - load: S3 upload, checkpoint, dedup index and comments.
+
+    Each stage has its own worker threads. A full queue blocks the stage
+    feeding it, so at most `queue_size` batches wait between two stages and
+    memory stays bounded, while uploads of finished subreddits run during
+    the pagination of the next ones.
+
+    Attributes:
+        ingestor (RedditIngestor): Provides the work done by each stage.
+        extract_workers (int): Subreddits paginated at the same time.
+        encode_workers (int): Batches encoded at the same time.
+        load_workers (int): Uploads in flight.
+        queue_size (int): Capacity of each queue between two stages.
+    """
+
+    def __init__(
+        self,
+        ingestor: RedditIngestor,
+        extract_workers: int = 4,
+        encode_workers: int = 1,
+        load_workers: int = 4,
+        queue_size: int = 8,
+    ):
+        self.ingestor = ingestor
+        self.extract_workers = extract_workers
+        self.encode_workers = encode_workers
+        self.load_workers = load_workers
+        self.queue_size = queue_size
+
+    def _extract(self, subreddit: str) -> StagedBatch | None:
+        checkpoint, result = self.ingestor.extract(subreddit)
+        return self.ingestor.stage(subreddit, result, checkpoint)
+
+    def _encode(self, batch: StagedBatch) -> StagedBatch:
+        batch.body = self.ingestor.storage.encode(batch.pages)
+        # The encoded body replaces the pages, which can be freed.
+        batch.pages = []
+        return batch
+
+    def _load(self, batch: StagedBatch) -> None:
+        self.ingestor.load(batch)
+
+    def _start_stage(
+        self,
+        name: str,
+        workers: int,
+        func: Callable,
+        inbox: queue.Queue,
+        outbox: queue.Queue | None,
+    ) -> list[threading.Thread]:
+        """
+        Starts the workers of a stage. Each one applies `func` to the items
+        of `inbox` until it gets _DONE, and passes the results on to
+        `outbox`. A failing item is logged and dropped.
+        """
+
+        def work() -> None:
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    return
+
+                subreddit = item if isinstance(item, str) else item.subreddit
+                try:
+                    with metrics.scope(subreddit):
+                        result = func(item)
+                except Exception as e:
+                    logger.error(f'Error during {name} of {subreddit}: {e}')
+                    continue
+
+                if outbox is not None and result is not None:
+                    outbox.put(result)
+
+        threads = [
+            threading.Thread(target=work, name=f'{name}-{i}', daemon=True)
+            for i in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    @staticmethod
+    def _finish(
+        threads: list[threading.Thread], outbox: queue.Queue | None, workers: int
+    ) -> None:
+        for thread in threads:
+            thread.join()
+        if outbox is not None:
+            for _ in range(workers):
+                outbox.put(_DONE)
+
+    def run(self, subreddits: list[str]) -> None:
+        """
+        Ingests the subreddits through the pipeline, returning once every
+        batch is stored.
+        """
+        self.ingestor.plan(subreddits)
+
+        todo: queue.Queue = queue.Queue()
+        to_encode: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        to_load: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        for subreddit in subreddits:
+            todo.put(subreddit)
+        for _ in range(self.extract_workers):
+            todo.put(_DONE)
+
+        extractors = self._start_stage(
+            'extract', self.extract_workers, self._extract, todo, to_encode
+        )
+        encoders = self._start_stage(
+            'encode', self.encode_workers, self._encode, to_encode, to_load
+        )
+        loaders = self._start_stage(
+            'load', self.load_workers, self._load, to_load, None
+        )
+
+        # Each stage is told to stop once the one feeding it has drained.
+        self._finish(extractors, to_encode, self.encode_workers)
+        self._finish(encoders, to_load, self.load_workers)
+        self._finish(loaders, None, 0)
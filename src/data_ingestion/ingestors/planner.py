@@ -0,0 +1,95 @@
+import math
+from dataclasses import dataclass
+from datetime import datetime
+
+from data_ingestion.load.checkpoint import Checkpoint
+
+
+@dataclass
+class Plan:
+    subreddit: str
+    limit: int
+    expected_posts: int
+    expected_requests: int
+
+
+class RequestPlanner:
+    """
+    Picks the page size of each subreddit from its observed post velocity.
+
+    The number of posts waiting since the last checkpoint is estimated as
+    `velocity * elapsed`. The page size is the smallest one that fetches
+    them in a single page (with some headroom), bounded by Reddit's 100
+    items per page, so a busy subreddit needs the minimum number of round
+    trips while a quiet one keeps small responses.
+
+    Attributes:
+        min_limit (int): Smallest page size used.
+        max_limit (int): Largest page size accepted by Reddit (100).
+        default_velocity (float): Posts per second assumed when a
+            checkpoint has no velocity yet.
+        headroom (float): Multiplier applied to the estimate.
+    """
+
+    # Listings never go further back than ~1000 items.
+    LISTING_CAP = 1000
+
+    def __init__(
+        self,
+        min_limit: int = 25,
+        max_limit: int = 100,
+        default_velocity: float = 0.01,
+        headroom: float = 1.5,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.default_velocity = default_velocity
+        self.headroom = headroom
+
+    def plan(
+        self,
+        subreddit: str,
+        checkpoint: Checkpoint | None,
+        now: float | None = None,
+    ) -> Plan:
+        """
+        Plans the next incremental sync of a subreddit.
+
+        Args:
+            subreddit: The subreddit name.
+            checkpoint: Its latest checkpoint, if any. Without one, the sync
+                only fetches the newest page, so the largest page is used.
+            now: Current timestamp (defaults to now).
+        """
+        if checkpoint is None:
+            return Plan(
+                subreddit=subreddit,
+                limit=self.max_limit,
+                expected_posts=self.max_limit,
+                expected_requests=2,
+            )
+
+        now = datetime.now().timestamp() if now is None else now
+        velocity = checkpoint.velocity
+        if velocity is None:
+            velocity = self.default_velocity
+        elapsed = max(now - checkpoint.updated_at, 0.0)
+        expected_posts = min(math.ceil(velocity * elapsed), self.LISTING_CAP)
+
+        limit = self.page_size(expected_posts)
+
+        # One request per page plus the final empty page that ends the sync.
+        return Plan(
+            subreddit=subreddit,
+            limit=limit,
+            expected_posts=expected_posts,
+            expected_requests=math.ceil(expected_posts / limit) + 1,
+        )
+
+    def page_size(self, expected_posts: int) -> int:
+        """
+        Returns the page size fitting `expected_posts` in as few pages as
+        possible, within [min_limit, max_limit].
+        """
+        limit = math.ceil(expected_posts * self.headroom)
+        return max(self.min_limit, min(self.max_limit, limit))
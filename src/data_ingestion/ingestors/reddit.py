@@ -1,56 +1,480 @@
+import math
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime
+
 from data_ingestion.load.s3_key import RedditS3Key
 from data_ingestion.load.aws_s3 import AWSServiceS3
+from data_ingestion.load.checkpoint import Checkpoint, S3CheckpointStore
+from data_ingestion.load.compression import detect_codec
+from data_ingestion.load.dedup import S3SeenIndexStore, SeenIndex
+from data_ingestion.load.spool import LocalSpool, SpoolRecord
 from data_ingestion.extract.reddit import RedditExtractor
+from data_ingestion.ingestors.comments import RedditCommentIngestor
+from data_ingestion.ingestors.planner import Plan, RequestPlanner
+from data_ingestion.utils import json_codec, metrics
+from data_ingestion.utils.fullname import fullname_id
 from data_ingestion.utils.logger import get_logger
+from data_ingestion.utils.profiling import Profiler
 
 logger = get_logger(__name__)
 
 
+def _newer_than(result: list[dict], fullname: str) -> list[dict]:
+    """
+    Keeps only the threads created after `fullname`, dropping empty pages.
+    """
+    threshold = fullname_id(fullname)
+    pages = []
+
+    for page in result:
+        children = [
+            child
+            for child in page.get('data', {}).get('children', [])
+            if fullname_id(child['data']['name']) > threshold
+        ]
+        if children:
+            pages.append({**page, 'data': {**page['data'], 'children': children}})
+
+    return pages
+
+
+@dataclass
+class StagedBatch:
+    """
+    A fetched batch on its way to S3.
+
+    Attributes:
+        subreddit (str): The subreddit of the batch.
+        s3_key (str): The key the batch is stored under.
+        pages (list[dict]): The listing pages, newest first.
+        articles (list[str]): The fullnames of the threads in the pages.
+        previous (Checkpoint | None): The checkpoint the batch follows.
+        index (SeenIndex | None): The dedup index the batch was checked
+            against, updated once it is stored.
+        body (bytes | None): The encoded pages, once encoded.
+    """
+
+    subreddit: str
+    s3_key: str
+    pages: list[dict]
+    articles: list[str]
+    previous: Checkpoint | None = None
+    index: SeenIndex | None = None
+    body: bytes | None = None
+
+
 class RedditIngestor:
-    def __init__(self, extractor: RedditExtractor, storage: AWSServiceS3):
+    # Earlier posts of the last object probed when the anchor is lost.
+    MAX_FALLBACK_ANCHORS = 5
+    # Stored batches and seconds between two writes of a seen index (about
+    # 1.8 MB each); flush_seen() writes what is left.
+    SEEN_FLUSH_BATCHES = 20
+    SEEN_FLUSH_INTERVAL = 300.0
+
+    def __init__(
+        self,
+        extractor: RedditExtractor,
+        storage: AWSServiceS3,
+        streaming: bool = False,
+        checkpoints: S3CheckpointStore | None = None,
+        planner: RequestPlanner | None = None,
+        comments: RedditCommentIngestor | None = None,
+        anchor_recovery: bool = False,
+        seen: S3SeenIndexStore | None = None,
+        spool: LocalSpool | None = None,
+        profiler: Profiler | None = None,
+    ):
         """
         Initializes the RedditIngestor.
 
         Args:
             extractor: An instance of RedditExtractor.
             storage: An instance of AWSServiceS3.
+            streaming: If True, pages are streamed to S3 as they are fetched
+                instead of accumulating the whole backlog in memory.
+            checkpoints: An optional pointer store. When set, the latest key
+                is read from it instead of listing the subreddit prefix, and
+                it is updated after each successful upload.
+            planner: An optional RequestPlanner. When set, the page size of
+                each subreddit is derived from its post velocity instead of
+                the fixed 25, and the expected request count is logged before
+                the run starts.
+            comments: An optional RedditCommentIngestor. When set, the
+                comment trees of every stored batch of posts are ingested
+                right after it, and fetched again once due (see
+                RedditCommentIngestor.refetch_due) by the next ingestion of
+                the subreddit.
+            anchor_recovery: If True, an empty sync is checked for a lost
+                anchor (the checkpoint post was deleted or removed), and the
+                new threads are then found from earlier posts of the last
+                object or by a bounded scan of the feed.
+            seen: An optional dedup index store. When set, the threads
+                already stored by an earlier run are dropped before upload.
+            spool: An optional local write-ahead spool. When set, load()
+                only appends the encoded batch to the spool, and the upload,
+                checkpoint, dedup index and comments follow once a
+                SpoolFlusher calls upload_spooled(). The next sync of a
+                subreddit starts from its newest spooled batch.
+            profiler: An optional Profiler. When set, every ingestion of a
+                single subreddit is profiled with cProfile and tracemalloc,
+                one at a time.
         """
         self.extractor = extractor
         self.storage = storage
+        self.streaming = streaming
+        self.checkpoints = checkpoints
+        self.planner = planner
+        self.comments = comments
+        self.anchor_recovery = anchor_recovery
+        self.seen = seen
+        self.spool = spool
+        self.profiler = profiler
 
-    def _get_last_checkpoint(self, subreddit: str) -> str | None:
+        # Seen indexes loaded so far, kept across polls in daemon mode, with
+        # the batches added to each since its last write and when it was.
+        self._seen_indexes: dict[str, SeenIndex] = {}
+        self._seen_unsaved: dict[str, int] = {}
+        self._seen_written: dict[str, float] = {}
+        self._seen_lock = threading.Lock()
+
+        # Checkpoints read by plan(), consumed by the following ingestion.
+        self._planned: dict[str, Checkpoint | None] = {}
+
+    def _get_checkpoint(self, subreddit: str) -> Checkpoint | None:
         """
-        Retrieves the last processed 'head' fullname from the latest S3 object key.
+        Finds the latest checkpoint, preferring the checkpoint pointer.
+
+        The prefix listing is only used when there is no pointer yet, and its
+        result is written back so the next lookup is a single GET.
         """
+        with metrics.timer('checkpoint_lookup', subreddit):
+            return self._lookup_checkpoint(subreddit)
+
+    def _lookup_checkpoint(self, subreddit: str) -> Checkpoint | None:
+        if self.checkpoints is not None:
+            checkpoint = self.checkpoints.get(subreddit)
+            if checkpoint is not None:
+                return checkpoint
+
         prefix = f'raw/reddit/{subreddit}/'
         latest_key = self.storage.latest_key(prefix=prefix)
 
         if not latest_key:
             return None
 
+        checkpoint = Checkpoint.from_key(latest_key)
+        if self.checkpoints is not None:
+            logger.info(f'Rebuilding checkpoint pointer for {subreddit}')
+            self._put_checkpoint(subreddit, checkpoint)
+
+        return checkpoint
+
+    def _take_checkpoint(self, subreddit: str) -> Checkpoint | None:
+        """
+        Returns the checkpoint read by plan(), or looks it up.
+        """
+        if subreddit in self._planned:
+            checkpoint = self._planned.pop(subreddit)
+        else:
+            checkpoint = self._get_checkpoint(subreddit)
+        return self._spooled_checkpoint(subreddit, checkpoint)
+
+    def _spooled_checkpoint(
+        self, subreddit: str, checkpoint: Checkpoint | None
+    ) -> Checkpoint | None:
+        """
+        Moves a checkpoint past the batches still waiting in the spool, so
+        they are not fetched again before they reach S3.
+        """
+        if self.spool is None:
+            return checkpoint
+
+        record = self.spool.latest(subreddit)
+        if record is None:
+            return checkpoint
+
+        head = RedditS3Key.from_s3_key(record.s3_key).head
+        stored = self._head(subreddit, checkpoint)
+        if stored is not None and fullname_id(stored) >= fullname_id(head):
+            return checkpoint
+
+        logger.info(f'Resuming {subreddit} from spooled batch {record.s3_key}')
+        return Checkpoint(
+            key=record.s3_key,
+            updated_at=record.created_at,
+            posts=len(record.articles),
+            velocity=checkpoint.velocity if checkpoint else None,
+            cursor=checkpoint.cursor if checkpoint else None,
+        )
+
+    def _get_latest_key(self, subreddit: str) -> str | None:
+        """
+        Finds the latest S3 object key, preferring the checkpoint pointer.
+        """
+        checkpoint = self._get_checkpoint(subreddit)
+        return checkpoint.key if checkpoint else None
+
+    def _commit(
+        self,
+        subreddit: str,
+        s3_key: str,
+        posts: int = 0,
+        previous: Checkpoint | None = None,
+    ) -> None:
+        """
+        Points the subreddit checkpoint at a freshly uploaded key, recording
+        the number of posts ingested since the `previous` checkpoint.
+        """
+        self._put_checkpoint(
+            subreddit, Checkpoint.build(s3_key, posts=posts, previous=previous)
+        )
+
+    def _put_checkpoint(self, subreddit: str, checkpoint: Checkpoint) -> None:
+        """
+        The data is already stored at this point, so a failure here is only
+        logged: the next run re-reads from the previous checkpoint.
+        """
+        if self.checkpoints is None:
+            return
+
         try:
-            head = RedditS3Key.from_s3_key(latest_key).head
+            self.checkpoints.put(subreddit, checkpoint)
+        except Exception as e:
+            logger.error(f'Failed to update checkpoint for {subreddit}: {e}')
+
+    def _head(self, subreddit: str, checkpoint: Checkpoint | None) -> str | None:
+        """
+        Parses the last processed 'head' fullname out of a checkpoint key.
+        """
+        if checkpoint is None:
+            return None
+
+        try:
+            head = RedditS3Key.from_s3_key(checkpoint.key).head
             logger.info(f'Last checkpoint found for {subreddit}: {head}')
             return head
         except ValueError:
-            logger.warning(f'Could not parse checkpoint from key: {latest_key}')
+            logger.warning(f'Could not parse checkpoint from key: {checkpoint.key}')
             return None
 
-    def ingest_subreddit(self, subreddit: str) -> None:
+    def _get_last_checkpoint(self, subreddit: str) -> str | None:
+        """
+        Retrieves the last processed 'head' fullname from the latest S3 object key.
+        """
+        return self._head(subreddit, self._get_checkpoint(subreddit))
+
+    def _page_size(self, subreddit: str, checkpoint: Checkpoint | None) -> int:
+        if self.planner is None:
+            return 25
+        return self.planner.plan(subreddit, checkpoint).limit
+
+    def plan(self, subreddits: list[str]) -> list[Plan]:
+        """
+        Plans the incremental sync of each subreddit and logs the expected
+        number of requests. The checkpoints read here are reused by the
+        ingestion that follows, so planning costs no extra S3 calls.
+        """
+        if self.planner is None:
+            return []
+
+        plans = []
+        for subreddit in subreddits:
+            try:
+                checkpoint = self._get_checkpoint(subreddit)
+            except Exception as e:
+                logger.error(f'Failed to plan ingestion of {subreddit}: {e}')
+                continue
+
+            self._planned[subreddit] = checkpoint
+            plan = self.planner.plan(subreddit, checkpoint)
+            logger.info(
+                f'Planned {subreddit}: ~{plan.expected_posts} posts, '
+                f'limit={plan.limit}, ~{plan.expected_requests} requests'
+            )
+            plans.append(plan)
+
+        total = sum(plan.expected_requests for plan in plans)
+        logger.info(f'Expecting ~{total} requests for {len(plans)} subreddits')
+        return plans
+
+    def ingest_subreddit(self, subreddit: str) -> int:
         """
         Orchestrates the data extraction and storage for a specific subreddit.
+
+        Returns:
+            The number of posts ingested.
         """
+        if self.profiler is None:
+            posts = self._ingest_subreddit(subreddit)
+        else:
+            with self.profiler.profile(subreddit):
+                posts = self._ingest_subreddit(subreddit)
+
+        self._refetch_comments(subreddit)
+        return posts
+
+    def _ingest_subreddit(self, subreddit: str) -> int:
         logger.info(f'Starting ingestion for subreddit: {subreddit}')
 
-        last_fullname = self._get_last_checkpoint(subreddit)
+        checkpoint = self._take_checkpoint(subreddit)
+        last_fullname = self._head(subreddit, checkpoint)
+        limit = self._page_size(subreddit, checkpoint)
+
+        if self.streaming:
+            posts = self._stream(subreddit, last_fullname or '', limit, checkpoint)
+            if posts or not last_fullname:
+                return posts
+            result = self._recover(subreddit, checkpoint, last_fullname, limit)
+            return self._store(subreddit, result, checkpoint) if result else 0
+
+        result = self._fetch(subreddit, checkpoint, last_fullname, limit)
+        return self._store(subreddit, result, checkpoint)
 
+    def extract(self, subreddit: str) -> tuple[Checkpoint | None, list[dict]]:
+        """
+        Runs the extraction half of ingest_subreddit: finds the checkpoint
+        and fetches the threads that follow it.
+
+        Returns:
+            The checkpoint and the fetched pages, newest first.
+        """
+        logger.info(f'Starting ingestion for subreddit: {subreddit}')
+
+        checkpoint = self._take_checkpoint(subreddit)
+        last_fullname = self._head(subreddit, checkpoint)
+        limit = self._page_size(subreddit, checkpoint)
+
+        return checkpoint, self._fetch(subreddit, checkpoint, last_fullname, limit)
+
+    def _fetch(
+        self,
+        subreddit: str,
+        checkpoint: Checkpoint | None,
+        last_fullname: str | None,
+        limit: int,
+    ) -> list[dict]:
         result = self.extractor.batch(
-            subreddit=subreddit, fullname=last_fullname or '', limit=25
+            subreddit=subreddit, fullname=last_fullname or '', limit=limit
         )
 
+        if not result and last_fullname:
+            result = self._recover(subreddit, checkpoint, last_fullname, limit)
+
+        return result
+
+    def _recover(
+        self, subreddit: str, checkpoint: Checkpoint, head: str, limit: int
+    ) -> list[dict]:
+        """
+        Finds the threads newer than `head` when it may be a lost anchor.
+
+        The anchor is only probed when the checkpoint velocity expected at
+        least one new thread: for a quiet subreddit an empty sync is the
+        normal case, and the expectation grows with every empty sync since
+        the checkpoint does not move. When the anchor is still valid the
+        empty sync was genuine. Otherwise
+        the earlier posts of the last stored object are tried as anchors,
+        newest first, and the threads at or before `head` are dropped. As a
+        last resort, the feed is scanned back from the newest post down to
+        `head`'s creation time.
+        """
+        if (
+            not self.anchor_recovery
+            or self._expected_posts(checkpoint) < 1
+            or self.extractor.anchor_exists(subreddit, head)
+        ):
+            return []
+
+        logger.warning(f'Checkpoint anchor {head} of {subreddit} is gone, recovering')
+        posts = self._stored_posts(checkpoint)
+
+        for candidate in posts[: self.MAX_FALLBACK_ANCHORS]:
+            if candidate['name'] == head:
+                continue
+            if not self.extractor.anchor_exists(subreddit, candidate['name']):
+                continue
+
+            logger.info(f'Resuming {subreddit} from earlier anchor {candidate["name"]}')
+            result = self.extractor.batch(
+                subreddit=subreddit, fullname=candidate['name'], limit=limit
+            )
+            return _newer_than(result, head)
+
+        since = next(
+            (post.get('created_utc') for post in posts if post['name'] == head), None
+        )
+        logger.info(f'Scanning {subreddit} for threads newer than {head}')
+        return self.extractor.scan_newer_than(
+            subreddit=subreddit, fullname=head, since=since, limit=max(limit, 100)
+        )
+
+    def _expected_posts(self, checkpoint: Checkpoint | None) -> float:
+        """
+        Estimates the threads posted since `checkpoint` from its velocity,
+        unbounded when the velocity is not known yet.
+        """
+        if checkpoint is None or checkpoint.velocity is None:
+            return math.inf
+        elapsed = datetime.now().timestamp() - checkpoint.updated_at
+        return checkpoint.velocity * max(elapsed, 0.0)
+
+    def _stored_posts(self, checkpoint: Checkpoint) -> list[dict]:
+        """
+        Returns the posts of the checkpoint object, newest first.
+        """
+        try:
+            body = self.storage.read(checkpoint.key)
+            pages = json_codec.loads(body) if body else []
+            posts = [
+                child['data']
+                for page in pages
+                for child in page.get('data', {}).get('children', [])
+            ]
+        except Exception as e:
+            logger.warning(f'Could not read posts of {checkpoint.key}: {e}')
+            return []
+
+        return sorted(posts, key=lambda post: fullname_id(post['name']), reverse=True)
+
+    def _store(
+        self,
+        subreddit: str,
+        result: list[dict],
+        previous: Checkpoint | None = None,
+    ) -> int:
+        """
+        Uploads a fetched batch under a key named after its head and tail,
+        returning the number of posts stored.
+        """
+        batch = self.stage(subreddit, result, previous)
+        if batch is None:
+            return 0
+        return self.load(batch)
+
+    def stage(
+        self,
+        subreddit: str,
+        result: list[dict],
+        previous: Checkpoint | None = None,
+    ) -> StagedBatch | None:
+        """
+        Drops the threads already stored and names the batch after its head
+        and tail. Returns None when there is nothing left to store.
+        """
         if not result:
             logger.warning(f'No new data fetched for subreddit: {subreddit}')
-            return
+            return None
+
+        index = self._get_seen_index(subreddit)
+        if index is not None:
+            result = index.drop_seen(result)
+            if not result:
+                logger.info(f'Every fetched thread of {subreddit} is already stored')
+                return None
 
         try:
             head = (
@@ -69,19 +493,470 @@ class RedditIngestor:
             )
         except (IndexError, KeyError) as e:
             logger.error(f'Failed to extract head/tail for {subreddit}: {e}')
+            return None
+
+        s3_key = RedditS3Key.build(
+            subreddit=subreddit,
+            head=head,
+            tail=tail,
+            extension=self.storage.codec.extension,
+        ).to_s3_key()
+
+        articles = [
+            child.get('data', {}).get('name', '')
+            for page in result
+            for child in page.get('data', {}).get('children', [])
+        ]
+
+        return StagedBatch(
+            subreddit=subreddit,
+            s3_key=s3_key,
+            pages=result,
+            articles=articles,
+            previous=previous,
+            index=index,
+        )
+
+    def load(self, batch: StagedBatch) -> int:
+        """
+        Uploads a staged batch (already encoded, if its body is set) and
+        moves the checkpoint past it, returning the number of posts stored.
+
+        With a spool, the batch is only appended to it: the upload and what
+        follows are left to upload_spooled().
+        """
+        if self.spool is not None:
+            return self._spool(batch)
+
+        if batch.body is None:
+            self.storage.upload(s3_key=batch.s3_key, data=batch.pages)
+        else:
+            self.storage.upload_encoded(batch.s3_key, batch.body)
+
+        return self._loaded(batch)
+
+    def _loaded(self, batch: StagedBatch) -> int:
+        """
+        Records a batch now stored in S3: checkpoint, dedup index, comments.
+        """
+        subreddit, articles = batch.subreddit, batch.articles
+        metrics.incr('posts', len(articles), subreddit)
+        self._commit(subreddit, batch.s3_key, len(articles), batch.previous)
+        self._remember(subreddit, batch.index, articles)
+        logger.info(f'Successfully ingested {subreddit} -> {batch.s3_key}')
+        self._ingest_comments(subreddit, articles)
+        return len(articles)
+
+    def _spool(self, batch: StagedBatch) -> int:
+        body = batch.body
+        if body is None:
+            body = self.storage.encode(batch.pages)
+
+        self.spool.append(
+            SpoolRecord(
+                subreddit=batch.subreddit,
+                s3_key=batch.s3_key,
+                articles=batch.articles,
+                body=body,
+                previous=asdict(batch.previous) if batch.previous else None,
+                created_at=datetime.now().timestamp(),
+            )
+        )
+        logger.info(f'Spooled {len(batch.articles)} posts of {batch.subreddit}')
+        return len(batch.articles)
+
+    def upload_spooled(self, records: list[SpoolRecord]) -> int:
+        """
+        Stores spooled batches of one subreddit, oldest first, as a single
+        object, then records them like load() does.
+
+        Several records are coalesced: their pages are decoded and merged
+        newest first under a key spanning the newest head and the oldest
+        tail, and their posts are counted since the oldest `previous`.
+
+        Returns:
+            The number of posts stored.
+        """
+        with metrics.scope(records[0].subreddit):
+            return self._upload_spooled(records)
+
+    def _upload_spooled(self, records: list[SpoolRecord]) -> int:
+        first, last = records[0], records[-1]
+        previous = Checkpoint(**first.previous) if first.previous else None
+        articles = [article for record in records for article in record.articles]
+
+        if len(records) == 1:
+            s3_key, body = first.s3_key, first.body
+            codec = detect_codec(s3_key)
+        else:
+            pages = []
+            for record in reversed(records):
+                pages += json_codec.loads(
+                    detect_codec(record.s3_key).decompress(record.body)
+                )
+            s3_key = RedditS3Key.build(
+                subreddit=first.subreddit,
+                head=RedditS3Key.from_s3_key(last.s3_key).head,
+                tail=RedditS3Key.from_s3_key(first.s3_key).tail,
+                extension=self.storage.codec.extension,
+            ).to_s3_key()
+            body, codec = self.storage.encode(pages), self.storage.codec
+            logger.info(
+                f'Coalesced {len(records)} spooled batches of {first.subreddit}'
+            )
+
+        self.storage.upload_encoded(s3_key, body, codec)
+
+        return self._loaded(
+            StagedBatch(
+                subreddit=first.subreddit,
+                s3_key=s3_key,
+                pages=[],
+                articles=articles,
+                previous=previous,
+                index=self._get_seen_index(first.subreddit),
+            )
+        )
+
+    def _get_seen_index(self, subreddit: str) -> SeenIndex | None:
+        """
+        Loads the dedup index of a subreddit, once per ingestor. Without it
+        the batch is stored as is, so a failure here is only logged.
+        """
+        if self.seen is None:
+            return None
+        if subreddit in self._seen_indexes:
+            return self._seen_indexes[subreddit]
+
+        try:
+            index = self.seen.get(subreddit)
+        except Exception as e:
+            logger.error(f'Failed to load seen index for {subreddit}: {e}')
+            return None
+
+        self._seen_indexes[subreddit] = index
+        return index
+
+    def _remember(
+        self, subreddit: str, index: SeenIndex | None, articles: list[str]
+    ) -> None:
+        """
+        Adds freshly stored fullnames to the dedup index of a subreddit,
+        writing it every SEEN_FLUSH_BATCHES batches or SEEN_FLUSH_INTERVAL
+        seconds. The watermark keeps the forward sync safe from an index
+        that lags behind the stored objects.
+        """
+        if index is None:
+            return
+
+        for article in articles:
+            index.add(article)
+
+        now = time.monotonic()
+        with self._seen_lock:
+            unsaved = self._seen_unsaved.get(subreddit, 0) + 1
+            self._seen_unsaved[subreddit] = unsaved
+            written = self._seen_written.setdefault(subreddit, now)
+
+        if (
+            unsaved >= self.SEEN_FLUSH_BATCHES
+            or now - written >= self.SEEN_FLUSH_INTERVAL
+        ):
+            self._write_seen(subreddit, index)
+
+    def _write_seen(self, subreddit: str, index: SeenIndex) -> None:
+        try:
+            self.seen.put(subreddit, index)
+        except Exception as e:
+            logger.error(f'Failed to update seen index for {subreddit}: {e}')
             return
 
-        s3_key = RedditS3Key.build(subreddit=subreddit, head=head, tail=tail).to_s3_key()
+        with self._seen_lock:
+            self._seen_unsaved[subreddit] = 0
+            self._seen_written[subreddit] = time.monotonic()
+
+    def flush_seen(self) -> None:
+        """
+        Writes the dedup indexes updated since their last write. Called at
+        the end of run(), and by the runner once every mode is done.
+        """
+        with self._seen_lock:
+            unsaved = [
+                subreddit for subreddit, count in self._seen_unsaved.items() if count
+            ]
+        for subreddit in unsaved:
+            self._write_seen(subreddit, self._seen_indexes[subreddit])
+
+    def _stream(
+        self,
+        subreddit: str,
+        fullname: str,
+        limit: int = 25,
+        previous: Checkpoint | None = None,
+    ) -> int:
+        """
+        Streams pages to a staging object, then moves it to its final key.
+
+        The head is only known once the last page arrives, so the pages are
+        written under a staging key outside `raw/` and renamed afterwards.
+        Pages are stored in fetch order, oldest page first, unlike the
+        batches of load() (newest page first): the object is marked with the
+        `page-order: oldest-first` metadata so readers can tell them apart.
+        """
+        extension = self.storage.codec.extension
+        staging_key = f'tmp/reddit/{subreddit}/{uuid.uuid4().hex}.json{extension}'
+        head = tail = None
+        articles: list[str] = []
+        index = self._get_seen_index(subreddit)
+
+        with self.storage.open_writer(
+            staging_key, metadata={'page-order': 'oldest-first'}
+        ) as writer:
+            for page in self.extractor.iter_pages(
+                subreddit=subreddit, fullname=fullname, limit=limit
+            ):
+                # A missing or stale checkpoint (no forward sync yet after a
+                # backfill, a failed pointer write) refetches stored threads.
+                if index is not None:
+                    kept = index.drop_seen([page])
+                    if not kept:
+                        continue
+                    page = kept[0]
+                children = page['data']['children']
+                articles += [child['data']['name'] for child in children]
+                if tail is None:
+                    tail = children[-1]['data']['name']
+                head = children[0]['data']['name']
+                writer.write(page)
+
+            if head is None:
+                writer.abort()
 
-        self.storage.upload(s3_key=s3_key, data=result)
+        if head is None:
+            logger.warning(f'No new data fetched for subreddit: {subreddit}')
+            return 0
+
+        s3_key = RedditS3Key.build(
+            subreddit=subreddit, head=head, tail=tail, extension=extension
+        ).to_s3_key()
+
+        self.storage.move(staging_key, s3_key)
+        metrics.incr('posts', len(articles), subreddit)
+        self._commit(subreddit, s3_key, len(articles), previous)
+        self._remember(subreddit, index, articles)
         logger.info(f'Successfully ingested {subreddit} -> {s3_key}')
+        self._ingest_comments(subreddit, articles)
+        return len(articles)
 
-    def run(self, subreddits: list[str]) -> None:
+    def _ingest_comments(self, subreddit: str, articles: list[str]) -> None:
         """
-        Runs the ingestion process for a list of subreddits.
+        Ingests the comments of a stored batch of posts, newest post first.
+
+        The posts are already committed, so a failure here is only logged.
+        """
+        if self.comments is None:
+            return
+
+        try:
+            self.comments.ingest(
+                subreddit, sorted(articles, key=fullname_id, reverse=True)
+            )
+        except Exception as e:
+            logger.error(f'Failed to ingest comments for {subreddit}: {e}')
+
+    def _refetch_comments(self, subreddit: str) -> None:
+        """
+        Fetches again the comments of the earlier batches that are due.
+        """
+        if self.comments is None:
+            return
+
+        try:
+            self.comments.refetch_due(subreddit)
+        except Exception as e:
+            logger.error(f'Failed to re-fetch comments for {subreddit}: {e}')
+
+    def ingest_group(self, subreddits: list[str]) -> None:
+        """
+        Ingests several low-traffic subreddits through one combined listing.
+
+        The group is paginated as `/r/a+b+c/new`, then the children are split
+        by their 'subreddit' field. Children at or before a member's own
+        position are dropped, so each member gets its own pages, RedditS3Key
+        and checkpoint exactly as if it had been ingested alone.
+
+        A member's position is the newer of its head and its group cursor:
+        the newest fullname the combined listing returned when the member was
+        last stored, kept on its checkpoint. The group starts from the oldest
+        position, so a quiet member does not drag it back to its last
+        thread. Members without a checkpoint are ingested on their own, and
+        an empty listing whose anchor is gone sends every member through the
+        single-subreddit recovery.
         """
+        logger.info(f'Starting combined ingestion for subreddits: {subreddits}')
+
+        stored: dict[str, Checkpoint | None] = {}
+        checkpoints: dict[str, Checkpoint] = {}
+        positions: dict[str, str] = {}
         for subreddit in subreddits:
+            if subreddit in self._planned:
+                checkpoint = self._planned.pop(subreddit)
+            else:
+                checkpoint = self._get_checkpoint(subreddit)
+            spooled = self._spooled_checkpoint(subreddit, checkpoint)
+            head = self._head(subreddit, spooled)
+            if not head:
+                self._ingest_alone(subreddit, spooled)
+                continue
+
+            stored[subreddit] = checkpoint
+            checkpoints[subreddit] = spooled
+            positions[subreddit] = max(
+                filter(None, (head, spooled.cursor)), key=fullname_id
+            )
+
+        if not positions:
+            return
+
+        anchor = min(positions.values(), key=fullname_id)
+        group = '+'.join(positions)
+        limit = 25
+        if self.planner is not None:
+            # The group shares one listing: size it for the combined volume.
+            limit = self.planner.page_size(
+                sum(
+                    self.planner.plan(subreddit, checkpoint).expected_posts
+                    for subreddit, checkpoint in checkpoints.items()
+                )
+            )
+        result = self.extractor.batch(subreddit=group, fullname=anchor, limit=limit)
+
+        expected = sum(map(self._expected_posts, checkpoints.values()))
+        if not result and self.anchor_recovery and expected >= 1:
+            if not self.extractor.anchor_exists(group, anchor):
+                # Each member recovers from its own head (see _recover), and
+                # a cursor on the lost post is dropped.
+                logger.warning(
+                    f'Group anchor {anchor} is gone, ingesting {list(positions)} alone'
+                )
+                for subreddit, checkpoint in checkpoints.items():
+                    if checkpoint.cursor == anchor:
+                        checkpoint = replace(checkpoint, cursor=None)
+                        if stored[subreddit] is not None:
+                            self._put_checkpoint(
+                                subreddit, replace(stored[subreddit], cursor=None)
+                            )
+                    self._ingest_alone(subreddit, checkpoint)
+                return
+
+        members = {subreddit.casefold(): subreddit for subreddit in positions}
+        demuxed: dict[str, list[dict]] = {subreddit: [] for subreddit in positions}
+        cursor = anchor
+
+        for page in result:
+            children_by_subreddit: dict[str, list[dict]] = {}
+            for child in page.get('data', {}).get('children', []):
+                data = child.get('data', {})
+                if fullname_id(data['name']) > fullname_id(cursor):
+                    cursor = data['name']
+                subreddit = members.get(data.get('subreddit', '').casefold())
+                if subreddit is None:
+                    continue
+                if fullname_id(data['name']) <= fullname_id(positions[subreddit]):
+                    continue
+                children_by_subreddit.setdefault(subreddit, []).append(child)
+
+            for subreddit, children in children_by_subreddit.items():
+                demuxed[subreddit].append(
+                    {**page, 'data': {**page['data'], 'children': children}}
+                )
+
+        # Like _safe_ingest, a failing member never affects the others, and
+        # keeps its cursor so the group fetches its posts again.
+        for subreddit, pages in demuxed.items():
             try:
-                self.ingest_subreddit(subreddit)
+                with metrics.scope(subreddit):
+                    if pages:
+                        self._store(
+                            subreddit,
+                            pages,
+                            replace(checkpoints[subreddit], cursor=cursor),
+                        )
+                    elif stored[subreddit] is not None and cursor != anchor:
+                        self._put_checkpoint(
+                            subreddit, replace(stored[subreddit], cursor=cursor)
+                        )
             except Exception as e:
                 logger.error(f'Error during ingestion of {subreddit}: {e}')
+
+            with metrics.scope(subreddit):
+                self._refetch_comments(subreddit)
+
+    def _ingest_alone(self, subreddit: str, checkpoint: Checkpoint | None) -> None:
+        """
+        Ingests a member of a combined group on its own, from the checkpoint
+        already read for the group, logging any error so it never affects
+        the other members.
+        """
+        self._planned[subreddit] = checkpoint
+        try:
+            with metrics.scope(subreddit):
+                self.ingest_subreddit(subreddit)
+        except Exception as e:
+            logger.error(f'Error during ingestion of {subreddit}: {e}')
+
+    def _safe_ingest(self, subreddits: str | list[str]) -> None:
+        """
+        Ingests a subreddit (or a combined group), logging any error so it
+        never affects the others.
+        """
+        try:
+            if isinstance(subreddits, list):
+                self.ingest_group(subreddits)
+            else:
+                with metrics.scope(subreddits):
+                    self.ingest_subreddit(subreddits)
+        except Exception as e:
+            logger.error(f'Error during ingestion of {subreddits}: {e}')
+
+    def run(
+        self,
+        subreddits: list[str],
+        max_workers: int = 1,
+        combined: list[str] | None = None,
+        group_size: int = 10,
+    ) -> None:
+        """
+        Runs the ingestion process for a list of subreddits.
+
+        Args:
+            subreddits: The subreddits to ingest.
+            max_workers: Size of the worker pool. With 1 (the default) the
+                subreddits are ingested sequentially; otherwise they are
+                ingested in parallel, sharing the extractor's request budget.
+            combined: Low-traffic subreddits (among `subreddits`) to fetch
+                through combined listings instead of one chain each.
+            group_size: Maximum number of subreddits per combined listing.
+        """
+        combined = [
+            subreddit for subreddit in combined or [] if subreddit in subreddits
+        ]
+        work: list[str | list[str]] = [
+            subreddit for subreddit in subreddits if subreddit not in combined
+        ]
+        work += [
+            combined[i : i + group_size] for i in range(0, len(combined), group_size)
+        ]
+
+        self.plan(subreddits)
+
+        if max_workers <= 1:
+            for item in work:
+                self._safe_ingest(item)
+        else:
+            with ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix='ingestor'
+            ) as pool:
+                list(pool.map(self._safe_ingest, work))
+
+        self.flush_seen()
@@ -0,0 +1,107 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from data_ingestion.extract.reddit_async import AsyncRedditExtractor
+from data_ingestion.ingestors.planner import RequestPlanner
+from data_ingestion.ingestors.reddit import RedditIngestor
+from data_ingestion.load.aws_s3 import AWSServiceS3
+from data_ingestion.load.checkpoint import S3CheckpointStore
+from data_ingestion.load.dedup import S3SeenIndexStore
+from data_ingestion.utils import metrics
+from data_ingestion.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncRedditIngestor(RedditIngestor):
+    def __init__(
+        self,
+        extractor: AsyncRedditExtractor,
+        storage: AWSServiceS3,
+        max_concurrency: int = 50,
+        storage_workers: int = 8,
+        checkpoints: S3CheckpointStore | None = None,
+        planner: RequestPlanner | None = None,
+        seen: S3SeenIndexStore | None = None,
+    ):
+        """
+        Initializes the AsyncRedditIngestor.
+
+        Reddit requests run on the event loop; S3 listing and uploads are
+        blocking boto3 calls, so they run on a small dedicated thread pool.
+
+        Args:
+            extractor: An instance of AsyncRedditExtractor.
+            storage: An instance of AWSServiceS3.
+            max_concurrency: Maximum number of subreddits ingested at once.
+            storage_workers: Threads available for S3 calls.
+            checkpoints: An optional checkpoint pointer store.
+            planner: An optional RequestPlanner sizing the pages.
+            seen: An optional dedup index store dropping the threads
+                already stored by an earlier run.
+        """
+        super().__init__(
+            extractor=extractor,
+            storage=storage,
+            checkpoints=checkpoints,
+            planner=planner,
+            seen=seen,
+        )
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=storage_workers, thread_name_prefix='storage'
+        )
+
+    async def _in_executor(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        # Carries the metrics scope of the calling task into the thread.
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._executor, partial(context.run, func, *args, **kwargs)
+        )
+
+    async def ingest_subreddit(self, subreddit: str) -> int:
+        """
+        Orchestrates the data extraction and storage for a specific subreddit.
+        """
+        logger.info(f'Starting ingestion for subreddit: {subreddit}')
+
+        checkpoint = await self._in_executor(self._take_checkpoint, subreddit)
+        last_fullname = self._head(subreddit, checkpoint)
+
+        result = await self.extractor.batch(
+            subreddit=subreddit,
+            fullname=last_fullname or '',
+            limit=self._page_size(subreddit, checkpoint),
+        )
+
+        return await self._in_executor(self._store, subreddit, result, checkpoint)
+
+    async def _safe_ingest(self, subreddit: str, semaphore: asyncio.Semaphore) -> None:
+        async with semaphore:
+            try:
+                with metrics.scope(subreddit):
+                    await self.ingest_subreddit(subreddit)
+            except Exception as e:
+                logger.error(f'Error during ingestion of {subreddit}: {e}')
+
+    async def run(self, subreddits: list[str]) -> None:
+        """
+        Runs the ingestion process for a list of subreddits concurrently.
+        """
+        await self._in_executor(self.plan, subreddits)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        await asyncio.gather(
+            *(self._safe_ingest(subreddit, semaphore) for subreddit in subreddits)
+        )
+
+        await self._in_executor(self.flush_seen)
+
+    def close(self) -> None:
+        """
+        Releases the storage thread pool.
+        """
+        self._executor.shutdown(wait=True)
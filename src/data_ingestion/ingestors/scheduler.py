@@ -0,0 +1,176 @@
+import heapq
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable
+
+from data_ingestion.ingestors.reddit import RedditIngestor
+from data_ingestion.utils import metrics
+from data_ingestion.utils.logger import get_logger
+from data_ingestion.utils.retry import RetryPolicy
+
+logger = get_logger(__name__)
+
+
+class PollingScheduler:
+    """
+    Polls each subreddit on its own interval until stopped.
+
+    The interval of a subreddit is the time it takes to accumulate about
+    `target_posts` new posts at its observed velocity (a moving average of
+    posts per second between polls), bounded by [min_interval,
+    max_interval]. Busy subreddits are therefore polled every few seconds
+    and quiet ones every few minutes. A failed poll doubles the interval of
+    that subreddit. The ingestor, its HTTP session and token provider are
+    reused across polls, and the retry budget is refilled every
+    `max_interval` seconds instead of once per process.
+
+    Attributes:
+        ingestor (RedditIngestor): Runs each poll.
+        subreddits (list[str]): The subreddits to poll.
+        min_interval (float): Shortest delay between two polls, in seconds.
+        max_interval (float): Longest delay between two polls, in seconds.
+        target_posts (int): Posts expected per poll when sizing intervals.
+        max_workers (int): Polls running at the same time.
+        retry_policy (RetryPolicy | None): Its budget is reset periodically.
+    """
+
+    # Weight of the latest observation in the velocity moving average.
+    SMOOTHING = 0.5
+
+    def __init__(
+        self,
+        ingestor: RedditIngestor,
+        subreddits: list[str],
+        min_interval: float = 5.0,
+        max_interval: float = 300.0,
+        target_posts: int = 25,
+        max_workers: int = 1,
+        retry_policy: RetryPolicy | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ingestor = ingestor
+        self.subreddits = subreddits
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_posts = target_posts
+        self.max_workers = max_workers
+        self.retry_policy = retry_policy
+        self._clock = clock
+
+        self._stop = threading.Event()
+        self._velocity: dict[str, float] = {}
+        self._interval: dict[str, float] = {}
+        self._last_poll: dict[str, float] = {}
+
+        now = self._clock()
+        self._budget_reset_at = now
+        # Every subreddit is due right away.
+        self._queue: list[tuple[float, str]] = [
+            (now, subreddit) for subreddit in subreddits
+        ]
+        heapq.heapify(self._queue)
+
+    def stop(self) -> None:
+        """
+        Asks run() to return once the polls in progress finish.
+        """
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def interval(self, subreddit: str) -> float:
+        """
+        Returns the current polling interval of a subreddit.
+        """
+        return self._interval.get(subreddit, self.min_interval)
+
+    def _poll(self, subreddit: str) -> int | None:
+        """
+        Ingests a subreddit, returning its post count or None on failure.
+        """
+        try:
+            with metrics.scope(subreddit):
+                return self.ingestor.ingest_subreddit(subreddit)
+        except Exception as e:
+            logger.error(f'Error during ingestion of {subreddit}: {e}')
+            return None
+
+    def _reschedule(self, subreddit: str, started_at: float, posts: int | None) -> None:
+        """
+        Updates the velocity of a subreddit and queues its next poll.
+        """
+        previous = self._last_poll.get(subreddit)
+        self._last_poll[subreddit] = started_at
+
+        if posts is None:
+            interval = min(self.max_interval, self.interval(subreddit) * 2)
+        elif previous is None or started_at <= previous:
+            # The first poll only catches up: it says nothing about velocity.
+            interval = self.min_interval
+        else:
+            observed = posts / (started_at - previous)
+            velocity = self._velocity.get(subreddit)
+            if velocity is not None:
+                observed = self.SMOOTHING * observed + (1 - self.SMOOTHING) * velocity
+            self._velocity[subreddit] = observed
+
+            interval = (
+                self.target_posts / observed if observed > 0 else self.max_interval
+            )
+            interval = max(self.min_interval, min(self.max_interval, interval))
+
+        self._interval[subreddit] = interval
+        heapq.heappush(self._queue, (self._clock() + interval, subreddit))
+        logger.info(f'Next poll of {subreddit} in {interval:.1f}s')
+
+    def _refill_budget(self, now: float) -> None:
+        if self.retry_policy is None:
+            return
+        if now - self._budget_reset_at >= self.max_interval:
+            self.retry_policy.reset_budget()
+            self._budget_reset_at = now
+
+    def run(self) -> None:
+        """
+        Polls the subreddits as they come due, until stop() is called.
+        """
+        logger.info(f'Polling {len(self.subreddits)} subreddits')
+        running: dict[Future, tuple[str, float]] = {}
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix='poller'
+        ) as pool:
+            while not self._stop.is_set():
+                now = self._clock()
+                self._refill_budget(now)
+
+                while (
+                    self._queue
+                    and self._queue[0][0] <= now
+                    and len(running) < self.max_workers
+                ):
+                    _, subreddit = heapq.heappop(self._queue)
+                    future = pool.submit(self._poll, subreddit)
+                    running[future] = (subreddit, now)
+
+                timeout = None
+                if self._queue and len(running) < self.max_workers:
+                    timeout = max(self._queue[0][0] - now, 0.0)
+
+                if not running:
+                    self._stop.wait(timeout)
+                    continue
+
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    subreddit, started_at = running.pop(future)
+                    self._reschedule(subreddit, started_at, future.result())
+
+            # Let the polls in progress finish so their checkpoints land.
+            for future in running:
+                future.result()
+
+        logger.info('Polling stopped')
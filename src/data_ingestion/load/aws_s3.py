@@ -1,10 +1,12 @@
-import json
 import re
+import threading
+from functools import partial
 from typing import Callable
 
-import boto3
-
+from data_ingestion.load.compression import Codec, detect_codec
+from data_ingestion.utils import json_codec, metrics
 from data_ingestion.utils.logger import get_logger
+from data_ingestion.utils.retry import RetryPolicy
 
 
 logger = get_logger(__name__)
@@ -25,48 +27,396 @@ class AWSClientS3:
         self.aws_secret_access_key = aws_secret_access_key
         self.region_name = region_name
 
-        try:
-            self._client = boto3.client(
-                's3',
-                aws_access_key_id=self.aws_access_key_id,
-                aws_secret_access_key=self.aws_secret_access_key,
-                region_name=self.region_name,
-            )
-        except Exception as e:
-            logger.error(f'Failed to create S3 client: {e}')
-            raise Exception(f'Failed to create S3 client: {e}')
+        self._client = None
+        self._lock = threading.Lock()
 
     @property
     def client(self):
-        return self._client
+        """
+        The boto3 S3 client, created on first access: importing boto3 and
+        building the client take a noticeable share of a cold start, which
+        a run with nothing to upload never needs to pay.
+        """
+        with self._lock:
+            if self._client is None:
+                try:
+                    import boto3
 
+                    self._client = boto3.client(
+                        's3',
+                        aws_access_key_id=self.aws_access_key_id,
+                        aws_secret_access_key=self.aws_secret_access_key,
+                        region_name=self.region_name,
+                    )
+                except Exception as e:
+                    logger.error(f'Failed to create S3 client: {e}')
+                    raise Exception(f'Failed to create S3 client: {e}')
+            return self._client
+
+
+_RETRYABLE_CODES = {
+    'InternalError',
+    'RequestTimeout',
+    'ServiceUnavailable',
+    'SlowDown',
+    'Throttling',
+}
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Tells whether an S3 call failure is worth retrying.
+    """
+    # A failing S3 call means botocore is already loaded.
+    from botocore.exceptions import (
+        ClientError,
+        ConnectionClosedError,
+        EndpointConnectionError,
+        ReadTimeoutError,
+    )
+
+    if isinstance(
+        error, (ConnectionClosedError, EndpointConnectionError, ReadTimeoutError)
+    ):
+        return True
+    if isinstance(error, ClientError):
+        code = error.response.get('Error', {}).get('Code')
+        status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0)
+        return code in _RETRYABLE_CODES or status >= 500
+    return False
+
+
+def _call(retry_policy: RetryPolicy | None, func: Callable, *args, **kwargs):
+    # Calls carrying a body are uploads; the others (GET, LIST, COPY...) are
+    # timed together as plain S3 requests.
+    body = kwargs.get('Body')
+    if body is not None:
+        metrics.incr('upload_bytes', len(body))
+
+    with metrics.timer('upload' if body is not None else 's3_request'):
+        if retry_policy is None:
+            return func(*args, **kwargs)
+        return retry_policy.call(
+            partial(func, *args, **kwargs),
+            is_retryable,
+            description=getattr(func, '__name__', 'S3 call'),
+        )
+
+
+class S3JsonArrayWriter:
+    """
+    Streams JSON documents into a single S3 object holding a JSON array.
+
+    Items are encoded (and compressed, with a codec) as they are written and
+    buffered until a part is full, which is then sent through a multipart
+    upload, so memory stays bounded by `part_size` whatever the number of
+    items. Objects that never fill a part are sent with a single put_object
+    instead.
+
+    Incomplete multipart uploads left by a crashed process are not visible as
+    objects; the bucket should have an AbortIncompleteMultipartUpload
+    lifecycle rule to reclaim them.
+    """
+
+    MIN_PART_SIZE = 5 * 1024 * 1024
 
-class AWSServiceS3:
     def __init__(
         self,
         client,
         bucket_name: str,
+        s3_key: str,
+        part_size: int = 8 * 1024 * 1024,
+        retry_policy: RetryPolicy | None = None,
+        codec: Codec | None = None,
+        metadata: dict[str, str] | None = None,
     ):
         self.client = client
         self.bucket_name = bucket_name
+        self.s3_key = s3_key
+        self.metadata = metadata
+        self.part_size = max(part_size, self.MIN_PART_SIZE)
+        self.retry_policy = retry_policy
+        self.codec = codec or Codec()
+
+        self._compressor = self.codec.compressor()
+        self._buffer = bytearray(self._compressor.compress(b'['))
+        self._items = 0
+        self._upload_id: str | None = None
+        self._parts: list[dict] = []
+        self._closed = False
+
+    def __enter__(self) -> 'S3JsonArrayWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+    @property
+    def items(self) -> int:
+        return self._items
 
-    def upload(self, s3_key: str, data: dict) -> bool:
+    def _put_params(self) -> dict:
+        params = {
+            'Bucket': self.bucket_name,
+            'Key': self.s3_key,
+            'ContentType': 'application/json',
+        }
+        if self.codec.content_encoding:
+            params['ContentEncoding'] = self.codec.content_encoding
+        if self.metadata:
+            params['Metadata'] = self.metadata
+        return params
+
+    def write(self, item: dict) -> None:
+        chunk = json_codec.dumps(item)
+        if self._items:
+            chunk = b',' + chunk
+        self._buffer += self._compressor.compress(chunk)
+        self._items += 1
+
+        if len(self._buffer) >= self.part_size:
+            self._flush_part()
+
+    def _flush_part(self) -> None:
+        if self._upload_id is None:
+            response = _call(
+                self.retry_policy,
+                self.client.create_multipart_upload,
+                **self._put_params(),
+            )
+            self._upload_id = response['UploadId']
+
+        part_number = len(self._parts) + 1
+        response = _call(
+            self.retry_policy,
+            self.client.upload_part,
+            Bucket=self.bucket_name,
+            Key=self.s3_key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=bytes(self._buffer),
+        )
+        self._parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+        self._buffer.clear()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._buffer += self._compressor.compress(b']')
+        self._buffer += self._compressor.flush()
+
+        try:
+            if self._upload_id is None:
+                _call(
+                    self.retry_policy,
+                    self.client.put_object,
+                    Body=bytes(self._buffer),
+                    **self._put_params(),
+                )
+            else:
+                self._flush_part()
+                _call(
+                    self.retry_policy,
+                    self.client.complete_multipart_upload,
+                    Bucket=self.bucket_name,
+                    Key=self.s3_key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={'Parts': self._parts},
+                )
+        except Exception as e:
+            self.abort()
+            logger.error(f'Failed to upload data to S3: {e}')
+            raise Exception(f'Failed to upload data to S3: {e}')
+        finally:
+            self._buffer = bytearray()
+
+        logger.debug(
+            'streamed %d items to s3://%s/%s',
+            self._items,
+            self.bucket_name,
+            self.s3_key,
+        )
+
+    def abort(self) -> None:
+        self._closed = True
+        self._buffer = bytearray()
+        if self._upload_id is None:
+            return
+
+        upload_id, self._upload_id = self._upload_id, None
         try:
-            json_data = json.dumps(data, ensure_ascii=False).encode('utf-8')
-            self.client.put_object(
+            _call(
+                self.retry_policy,
+                self.client.abort_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=self.s3_key,
+                UploadId=upload_id,
+            )
+        except Exception as e:
+            logger.warning(f'Failed to abort multipart upload {upload_id}: {e}')
+
+
+class AWSServiceS3:
+    def __init__(
+        self,
+        client,
+        bucket_name: str,
+        retry_policy: RetryPolicy | None = None,
+        codec: Codec | None = None,
+    ):
+        """
+        Args:
+            client: A boto3 S3 client, or an AWSClientS3 whose client is
+                then only created on the first S3 call.
+            bucket_name: The bucket holding the data.
+            retry_policy: Optional policy for transient S3 failures.
+            codec: Compression applied to uploads. Callers are expected to
+                end data keys with `codec.extension`.
+        """
+        self._client = client
+        self.bucket_name = bucket_name
+        self.retry_policy = retry_policy
+        self.codec = codec or Codec()
+
+    @property
+    def client(self):
+        if isinstance(self._client, AWSClientS3):
+            return self._client.client
+        return self._client
+
+    def upload(self, s3_key: str, data: dict, codec: Codec | None = None) -> bool:
+        codec = codec or self.codec
+        try:
+            body = self.encode(data, codec)
+        except Exception as e:
+            logger.error(f'Failed to upload data to S3: {e}')
+            raise Exception(f'Failed to upload data to S3: {e}')
+        return self.upload_encoded(s3_key, body, codec)
+
+    def encode(self, data, codec: Codec | None = None) -> bytes:
+        """
+        Serializes and compresses a document the way upload() stores it, so
+        the CPU work can run apart from the network call.
+        """
+        with metrics.timer('encode'):
+            return (codec or self.codec).compress(json_codec.dumps(data))
+
+    def upload_encoded(
+        self, s3_key: str, body: bytes, codec: Codec | None = None
+    ) -> bool:
+        """
+        Uploads a document already serialized by encode() with `codec`.
+        """
+        codec = codec or self.codec
+        try:
+            params = {'ContentType': 'application/json'}
+            if codec.content_encoding:
+                params['ContentEncoding'] = codec.content_encoding
+            _call(
+                self.retry_policy,
+                self.client.put_object,
                 Bucket=self.bucket_name,
                 Key=s3_key,
-                Body=json_data,
-                ContentType='application/json',
+                Body=body,
+                **params,
             )
             logger.info('Successfully uploaded to s3')
-            logger.debug(f'uploaded in this s3 key: s3://{self.bucket_name}/{s3_key}')
+            logger.debug(
+                'uploaded in this s3 key: s3://%s/%s', self.bucket_name, s3_key
+            )
             return True
         except Exception as e:
             logger.error(f'Failed to upload data to S3: {e}')
             raise Exception(f'Failed to upload data to S3: {e}')
 
-    _TM_PATTERN = re.compile(r'-tm-([\d.]+)\.json$')
+    def upload_bytes(
+        self,
+        s3_key: str,
+        body: bytes,
+        content_type: str = 'application/octet-stream',
+    ) -> None:
+        """
+        Uploads an opaque binary object as is (never compressed).
+        """
+        try:
+            _call(
+                self.retry_policy,
+                self.client.put_object,
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                Body=body,
+                ContentType=content_type,
+            )
+        except Exception as e:
+            logger.error(f'Failed to upload data to S3: {e}')
+            raise Exception(f'Failed to upload data to S3: {e}')
+
+    def read(self, s3_key: str) -> bytes | None:
+        """
+        Reads an object body, returning None if the key does not exist.
+
+        Compressed objects are detected from their Content-Encoding (or key
+        suffix) and returned decompressed.
+        """
+        try:
+            response = _call(
+                self.retry_policy,
+                self.client.get_object,
+                Bucket=self.bucket_name,
+                Key=s3_key,
+            )
+            codec = detect_codec(s3_key, response.get('ContentEncoding'))
+            return codec.decompress(response['Body'].read())
+        except self.client.exceptions.NoSuchKey:
+            return None
+        except Exception as e:
+            logger.error(f'Failed to read object from S3: {e}')
+            raise Exception(f'Failed to read object from S3: {e}')
+
+    def open_writer(
+        self, s3_key: str, metadata: dict[str, str] | None = None
+    ) -> S3JsonArrayWriter:
+        """
+        Opens a streaming writer that stores a JSON array under `s3_key`,
+        with optional user metadata (kept by move()).
+        """
+        return S3JsonArrayWriter(
+            client=self.client,
+            bucket_name=self.bucket_name,
+            s3_key=s3_key,
+            retry_policy=self.retry_policy,
+            codec=self.codec,
+            metadata=metadata,
+        )
+
+    def move(self, source_key: str, s3_key: str) -> None:
+        """
+        Renames an object with a server-side copy followed by a delete.
+        """
+        try:
+            _call(
+                self.retry_policy,
+                self.client.copy_object,
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                CopySource={'Bucket': self.bucket_name, 'Key': source_key},
+            )
+            _call(
+                self.retry_policy,
+                self.client.delete_object,
+                Bucket=self.bucket_name,
+                Key=source_key,
+            )
+            logger.debug('moved s3://%s/%s -> %s', self.bucket_name, source_key, s3_key)
+        except Exception as e:
+            logger.error(f'Failed to move object in S3: {e}')
+            raise Exception(f'Failed to move object in S3: {e}')
+
+    _TM_PATTERN = re.compile(r'-tm-([\d.]+)\.json(?:\.gz|\.zst)?$')
 
     def _tm_sort_key(self, s3_object: dict) -> tuple:
         match = self._TM_PATTERN.search(s3_object['Key'])
@@ -74,23 +424,65 @@ class AWSServiceS3:
             return (float(match.group(1)), s3_object['Key'])
         return (s3_object['LastModified'].timestamp(), s3_object['Key'])
 
+    def _latest_object(
+        self,
+        prefix: str,
+        rank: Callable[[dict], tuple],
+        delimiter: str | None = None,
+    ) -> tuple[dict | None, list[str]]:
+        """
+        Scans a prefix for its highest-ranked object.
+
+        Returns:
+            tuple: The latest object (or None) and, when a delimiter is
+                given, the common prefixes found directly under `prefix`.
+        """
+        paginator = self.client.get_paginator('list_objects_v2')
+        params = {'Bucket': self.bucket_name, 'Prefix': prefix}
+        if delimiter:
+            params['Delimiter'] = delimiter
+
+        latest_object = None
+        partitions: list[str] = []
+        for page in paginator.paginate(**params):
+            partitions.extend(p['Prefix'] for p in page.get('CommonPrefixes', []))
+            contents = page.get('Contents', [])
+            if contents:
+                page_latest = max(contents, key=rank)
+                if latest_object is None or rank(page_latest) > rank(latest_object):
+                    latest_object = page_latest
+
+        return latest_object, partitions
+
     def latest_key(
         self,
         prefix: str,
         sort_key: Callable[[dict], tuple] | None = None,
     ) -> str | None:
+        """
+        Finds the most recent object key under a prefix.
+
+        Keys are expected to be partitioned by date right below the prefix
+        (`<prefix><YYYY-MM-DD>/...`). The partitions are discovered with a
+        delimited listing and scanned newest first, stopping at the first
+        non-empty one, so the cost is a handful of LIST calls instead of one
+        per thousand objects ever written. Objects stored directly under the
+        prefix are still taken into account.
+        """
         try:
-            paginator = self.client.get_paginator('list_objects_v2')
-            pages = paginator.paginate(Bucket=self.bucket_name, Prefix=prefix)
             rank = sort_key or self._tm_sort_key
 
-            latest_object = None
-            for page in pages:
-                contents = page.get('Contents', [])
-                if contents:
-                    page_latest = max(contents, key=rank)
-                    if latest_object is None or rank(page_latest) > rank(latest_object):
-                        latest_object = page_latest
+            latest_object, partitions = self._latest_object(prefix, rank, delimiter='/')
+
+            for partition in sorted(partitions, reverse=True):
+                partition_latest, _ = self._latest_object(partition, rank)
+                if partition_latest is None:
+                    continue
+                if latest_object is None or rank(partition_latest) > rank(
+                    latest_object
+                ):
+                    latest_object = partition_latest
+                break
 
             return latest_object['Key'] if latest_object else None
 
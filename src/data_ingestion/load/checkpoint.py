@@ -0,0 +1,130 @@
+import json
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+from data_ingestion.load.aws_s3 import AWSServiceS3
+from data_ingestion.load.compression import Codec
+from data_ingestion.load.s3_key import RedditS3Key
+from data_ingestion.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Checkpoint:
+    key: str
+    updated_at: float
+    posts: int = 0
+    velocity: float | None = None
+    # Newest fullname returned by the combined listing of the subreddit's
+    # group: its posts up to there are all stored (see ingest_group).
+    cursor: str | None = None
+
+    # Weight of the latest observation in the velocity moving average.
+    _SMOOTHING = 0.5
+
+    @classmethod
+    def build(
+        cls, key: str, posts: int = 0, previous: 'Checkpoint | None' = None
+    ) -> 'Checkpoint':
+        """
+        Builds the checkpoint following `previous`, updating the moving
+        average of the post velocity (posts per second) with the `posts`
+        ingested since then. The group cursor is carried over.
+        """
+        now = datetime.now().timestamp()
+        velocity = None
+        cursor = previous.cursor if previous is not None else None
+
+        if previous is not None and now > previous.updated_at:
+            observed = posts / (now - previous.updated_at)
+            if previous.velocity is None:
+                velocity = observed
+            else:
+                velocity = (
+                    cls._SMOOTHING * observed + (1 - cls._SMOOTHING) * previous.velocity
+                )
+
+        return cls(
+            key=key, updated_at=now, posts=posts, velocity=velocity, cursor=cursor
+        )
+
+    @classmethod
+    def from_key(cls, key: str) -> 'Checkpoint':
+        """
+        Rebuilds a checkpoint from a data key found by listing the bucket.
+        """
+        try:
+            updated_at = RedditS3Key.from_s3_key(key).timestamp
+        except ValueError:
+            updated_at = datetime.now().timestamp()
+        return cls(key=key, updated_at=updated_at)
+
+
+@dataclass
+class BackfillState:
+    """
+    Progress of the historical backfill of a subreddit.
+
+    Attributes:
+        after (str | None): Fullname of the oldest post stored so far, the
+            `after` anchor of the next page (None before the first page).
+        pages (int): Pages stored so far.
+        posts (int): Posts stored so far.
+        done (bool): Whether the backfill reached its bound or the end of
+            the listing.
+        updated_at (float): When the state was last written.
+    """
+
+    after: str | None = None
+    pages: int = 0
+    posts: int = 0
+    done: bool = False
+    updated_at: float = 0.0
+
+
+class S3CheckpointStore:
+    """
+    Keeps a small pointer object per subreddit naming its latest data key.
+
+    Reading the pointer is a single GET whatever the size of the history,
+    unlike AWSServiceS3.latest_key which lists every object under the
+    subreddit prefix. S3 PUTs are atomic, so a reader sees either the
+    previous pointer or the new one. Pointers live under `state/` so they
+    never show up in the `raw/` listings.
+    """
+
+    _TEMPLATE = 'state/reddit/{subreddit}/_checkpoint.json'
+    _STATE = Checkpoint
+
+    def __init__(self, storage: AWSServiceS3):
+        self.storage = storage
+
+    def _key(self, subreddit: str) -> str:
+        return self._TEMPLATE.format(subreddit=subreddit)
+
+    def get(self, subreddit: str):
+        body = self.storage.read(self._key(subreddit))
+        if body is None:
+            return None
+
+        try:
+            return self._STATE(**json.loads(body))
+        except (TypeError, ValueError) as e:
+            logger.warning(f'Ignoring malformed checkpoint for {subreddit}: {e}')
+            return None
+
+    def put(self, subreddit: str, checkpoint) -> None:
+        # Pointers are tiny: never compress them, whatever the data codec.
+        self.storage.upload(
+            s3_key=self._key(subreddit), data=asdict(checkpoint), codec=Codec()
+        )
+
+
+class S3BackfillStore(S3CheckpointStore):
+    """
+    Keeps the BackfillState of each subreddit beside its checkpoint pointer.
+    """
+
+    _TEMPLATE = 'state/reddit/{subreddit}/_backfill.json'
+    _STATE = BackfillState
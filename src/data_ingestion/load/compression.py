@@ -0,0 +1,117 @@
+import gzip
+import zlib
+
+
+class Codec:
+    """
+    Compression codec applied to the objects written to S3.
+
+    Attributes:
+        name (str): The codec name used in the configuration.
+        extension (str): Suffix appended to the object key ('' for none).
+        content_encoding (str | None): Value of the Content-Encoding header.
+        level (int | None): Compression level, codec specific.
+    """
+
+    name: str = 'none'
+    extension: str = ''
+    content_encoding: str | None = None
+
+    def __init__(self, level: int | None = None):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+    def compressor(self):
+        """
+        Returns an incremental compressor exposing compress() and flush().
+        """
+        return _IdentityCompressor()
+
+
+class _IdentityCompressor:
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b''
+
+
+class GzipCodec(Codec):
+    name = 'gzip'
+    extension = '.gz'
+    content_encoding = 'gzip'
+
+    def __init__(self, level: int | None = None):
+        super().__init__(6 if level is None else level)
+
+    def compress(self, data: bytes) -> bytes:
+        return gzip.compress(data, compresslevel=self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return gzip.decompress(data)
+
+    def compressor(self):
+        # wbits=31 writes a gzip header and trailer instead of a raw zlib stream.
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+
+class ZstdCodec(Codec):
+    name = 'zstd'
+    extension = '.zst'
+    content_encoding = 'zstd'
+
+    def __init__(self, level: int | None = None):
+        super().__init__(3 if level is None else level)
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                'The zstd codec requires zstandard: install cryptocore[zstd]'
+            ) from e
+        self._zstd = zstandard
+
+    def compress(self, data: bytes) -> bytes:
+        return self._zstd.ZstdCompressor(level=self.level).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        # decompressobj also handles frames written without a content size.
+        return self._zstd.ZstdDecompressor().decompressobj().decompress(data)
+
+    def compressor(self):
+        return self._zstd.ZstdCompressor(level=self.level).compressobj()
+
+
+CODECS: dict[str, type[Codec]] = {
+    Codec.name: Codec,
+    GzipCodec.name: GzipCodec,
+    ZstdCodec.name: ZstdCodec,
+}
+
+
+def get_codec(name: str = 'none', level: int | None = None) -> Codec:
+    """
+    Builds a codec by name ('none', 'gzip' or 'zstd').
+    """
+    try:
+        return CODECS[name](level=level)
+    except KeyError:
+        raise ValueError(f'Unknown compression codec: {name}')
+
+
+def detect_codec(s3_key: str, content_encoding: str | None = None) -> Codec:
+    """
+    Finds the codec of a stored object from its Content-Encoding header,
+    falling back to its key suffix.
+    """
+    for codec in CODECS.values():
+        if content_encoding and codec.content_encoding == content_encoding:
+            return codec()
+    for codec in CODECS.values():
+        if codec.extension and s3_key.endswith(codec.extension):
+            return codec()
+    return Codec()
@@ -0,0 +1,170 @@
+import struct
+
+from data_ingestion.load.aws_s3 import AWSServiceS3
+from data_ingestion.utils.bloom import BloomFilter
+from data_ingestion.utils.fullname import fullname_id
+from data_ingestion.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SeenIndex:
+    """
+    The fullnames already stored for a subreddit.
+
+    A Bloom filter remembers the stored fullnames, and a high watermark the
+    largest id among them. Ids grow with creation time, so a post above the
+    watermark is new for sure and is never looked up: the filter's false
+    positives can only affect overlapping windows (anchor fallbacks,
+    backfills), never the forward sync.
+
+    Past its capacity the filter's false positive rate climbs quickly
+    (about 6% at twice the capacity, 73% at five times), so a full index
+    fails open: nothing is reported as seen, and duplicates are stored
+    rather than new posts dropped.
+
+    Attributes:
+        bloom (BloomFilter): The stored fullnames.
+        watermark (int): The largest id stored, -1 when empty.
+        count (int): Number of fullnames added.
+        capacity (int | None): Fullnames the filter was sized for, or None
+            when unknown (never considered full).
+    """
+
+    _HEADER = struct.Struct('>qQ')
+
+    def __init__(
+        self,
+        bloom: BloomFilter,
+        watermark: int = -1,
+        count: int = 0,
+        capacity: int | None = None,
+    ):
+        self.bloom = bloom
+        self.watermark = watermark
+        self.count = count
+        self.capacity = capacity
+
+    @property
+    def full(self) -> bool:
+        return self.capacity is not None and self.count > self.capacity
+
+    def seen(self, fullname: str) -> bool:
+        if self.full:
+            return False
+        return fullname_id(fullname) <= self.watermark and fullname in self.bloom
+
+    def add(self, fullname: str) -> None:
+        self.bloom.add(fullname)
+        self.watermark = max(self.watermark, fullname_id(fullname))
+        self.count += 1
+
+    def merge(self, other: 'SeenIndex') -> None:
+        """
+        Adds the fullnames of another index of the same subreddit. The count
+        becomes the larger of the two, as their fullnames may overlap.
+
+        Raises:
+            ValueError: If the two filters are not sized alike.
+        """
+        self.bloom.update(other.bloom)
+        self.watermark = max(self.watermark, other.watermark)
+        self.count = max(self.count, other.count)
+
+    def drop_seen(self, pages: list[dict]) -> list[dict]:
+        """
+        Removes the children already stored from listing pages, dropping the
+        pages left empty.
+        """
+        result = []
+        for page in pages:
+            children = page.get('data', {}).get('children', [])
+            kept = [child for child in children if not self.seen(child['data']['name'])]
+            if len(kept) == len(children):
+                result.append(page)
+            elif kept:
+                result.append({**page, 'data': {**page['data'], 'children': kept}})
+        return result
+
+    def to_bytes(self) -> bytes:
+        return self._HEADER.pack(self.watermark, self.count) + self.bloom.to_bytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'SeenIndex':
+        """
+        Raises:
+            ValueError: If `data` is not a serialized index.
+        """
+        try:
+            watermark, count = cls._HEADER.unpack_from(data)
+        except struct.error as e:
+            raise ValueError(f'Invalid seen index: {e}')
+        bloom = BloomFilter.from_bytes(data[cls._HEADER.size :])
+        return cls(bloom=bloom, watermark=watermark, count=count)
+
+
+class S3SeenIndexStore:
+    """
+    Keeps the SeenIndex of each subreddit beside its checkpoint pointer.
+
+    The default sizing (1M fullnames at a 0.1% false positive rate) takes
+    about 1.8 MB per subreddit. An index filled beyond its capacity stops
+    dropping threads (see SeenIndex) and a warning is logged: raise the
+    capacity for subreddits holding more posts.
+
+    The forward sync and the backfiller each keep their own copy of an
+    index, so put() merges the stored index into the written one first:
+    one writer never erases the fullnames added by the other.
+    """
+
+    _TEMPLATE = 'state/reddit/{subreddit}/_seen.bloom'
+
+    def __init__(
+        self,
+        storage: AWSServiceS3,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+    ):
+        self.storage = storage
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+    def _key(self, subreddit: str) -> str:
+        return self._TEMPLATE.format(subreddit=subreddit)
+
+    def get(self, subreddit: str) -> SeenIndex:
+        """
+        Loads the index of a subreddit, or a new empty one.
+        """
+        body = self.storage.read(self._key(subreddit))
+        if body is not None:
+            try:
+                index = SeenIndex.from_bytes(body)
+                index.capacity = self.capacity
+                return index
+            except ValueError as e:
+                logger.warning(f'Ignoring malformed seen index for {subreddit}: {e}')
+
+        return SeenIndex(
+            BloomFilter.for_capacity(self.capacity, self.error_rate),
+            capacity=self.capacity,
+        )
+
+    def put(self, subreddit: str, index: SeenIndex) -> None:
+        """
+        Writes the index of a subreddit, merged (in place) with the one
+        stored by other writers since it was loaded.
+        """
+        body = self.storage.read(self._key(subreddit))
+        if body is not None:
+            try:
+                index.merge(SeenIndex.from_bytes(body))
+            except ValueError as e:
+                logger.warning(f'Overwriting seen index of {subreddit}: {e}')
+
+        if index.count > self.capacity:
+            logger.warning(
+                f'Seen index of {subreddit} holds {index.count} fullnames, '
+                f'above its capacity of {self.capacity}: no longer deduplicating'
+            )
+        self.storage.upload_bytes(self._key(subreddit), index.to_bytes())
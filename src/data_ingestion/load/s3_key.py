@@ -10,12 +10,15 @@ class RedditS3Key:
     tail: str
     date: str
     timestamp: float
+    extension: str = ''
+    dataset: str = 'reddit'
 
     _PATTERN = re.compile(
-        r'raw/reddit/(?P<subreddit>[^/]+)/(?P<date>[^/]+)/'
-        r'h-(?P<head>[^-]+)-t-(?P<tail>[^-]+)-tm-(?P<timestamp>[\d.]+)\.json$'
+        r'raw/(?P<dataset>reddit(?:_[a-z]+)?)/(?P<subreddit>[^/]+)/(?P<date>[^/]+)/'
+        r'h-(?P<head>[^-]+)-t-(?P<tail>[^-]+)-tm-(?P<timestamp>[\d.]+)\.json'
+        r'(?P<extension>\.gz|\.zst)?$'
     )
-    _TEMPLATE = 'raw/reddit/{subreddit}/{date}/h-{head}-t-{tail}-tm-{timestamp}.json'
+    _TEMPLATE = 'raw/{dataset}/{subreddit}/{date}/h-{head}-t-{tail}-tm-{timestamp}.json{extension}'
 
     def to_s3_key(self) -> str:
         return self._TEMPLATE.format(
@@ -24,6 +27,8 @@ class RedditS3Key:
             head=self.head,
             tail=self.tail,
             timestamp=self.timestamp,
+            extension=self.extension,
+            dataset=self.dataset,
         )
 
     @classmethod
@@ -37,10 +42,24 @@ class RedditS3Key:
             head=match.group('head'),
             tail=match.group('tail'),
             timestamp=float(match.group('timestamp')),
+            extension=match.group('extension') or '',
+            dataset=match.group('dataset'),
         )
 
     @classmethod
-    def build(cls, subreddit: str, head: str, tail: str) -> 'RedditS3Key':
+    def build(
+        cls,
+        subreddit: str,
+        head: str,
+        tail: str,
+        extension: str = '',
+        dataset: str = 'reddit',
+    ) -> 'RedditS3Key':
+        """
+        Builds a key stamped with the current time. `dataset` selects the
+        top-level prefix (e.g. 'reddit_comments'), so other datasets never
+        show up in the listings of the threads under `raw/reddit/`.
+        """
         now = datetime.now()
         return cls(
             subreddit=subreddit,
@@ -48,4 +67,6 @@ class RedditS3Key:
             tail=tail,
             date=now.strftime('%Y-%m-%d'),
             timestamp=now.timestamp(),
+            extension=extension,
+            dataset=dataset,
         )
@@ -0,0 +1,356 @@
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+
+from data_ingestion.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class SpoolRecord:
+    """
+    A batch waiting in the spool for its upload.
+
+    Attributes:
+        subreddit (str): The subreddit of the batch.
+        s3_key (str): The key the batch is stored under.
+        articles (list[str]): The fullnames of the threads in the batch.
+        body (bytes): The encoded batch, as produced by AWSServiceS3.encode
+            with the codec matching the extension of `s3_key`. Empty in the
+            records returned by LocalSpool.pending() until loaded.
+        previous (dict | None): The checkpoint the batch follows.
+        created_at (float): When the batch was spooled.
+        segment (str): Segment file holding the record (set by the spool).
+        offset (int): Position of the record in its segment (idem).
+    """
+
+    subreddit: str
+    s3_key: str
+    articles: list[str]
+    body: bytes = field(default=b'', repr=False)
+    previous: dict | None = None
+    created_at: float = 0.0
+    segment: str = ''
+    offset: int = -1
+
+
+class LocalSpool:
+    """
+    An append-only, fsync'ed on-disk queue of batches waiting for S3.
+
+    Records are appended to segment files (`<seq>.seg`). Each one is framed
+    by its lengths and a CRC32, so a record torn by a crash is detected and
+    ignored on replay. Uploaded records are acknowledged in a companion
+    `<seq>.ack` file, and a segment is deleted once all of its records are
+    acknowledged and a newer segment exists, or when a later spool opens
+    the directory. Pending records therefore survive restarts and are
+    uploaded by the next process.
+
+    The segments are scanned once, when the spool opens; from then on the
+    pending records are tracked in memory without their bodies, which are
+    only read back by load() when the record is uploaded.
+
+    Attributes:
+        directory (Path): Where the segments are kept.
+        segment_size (int): Size in bytes above which a new segment starts.
+        fsync (bool): Whether appends and acks are fsync'ed.
+    """
+
+    _FRAME = struct.Struct('>III')
+    _ACK = struct.Struct('>Q')
+
+    def __init__(
+        self,
+        directory: str,
+        segment_size: int = 64 * 1024 * 1024,
+        fsync: bool = True,
+    ):
+        self.directory = Path(directory)
+        self.segment_size = segment_size
+        self.fsync = fsync
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        # (segment, offset) -> pending record without its body, oldest first.
+        self._pending: dict[tuple[str, int], SpoolRecord] = {}
+        # Pending records per segment, and newest pending record per subreddit.
+        self._counts: dict[str, int] = {}
+        self._latest: dict[str, SpoolRecord] = {}
+
+        segments = self._segments()
+        sequence = int(segments[-1].stem) + 1 if segments else 0
+        self._current = self.directory / f'{sequence:08d}.seg'
+        self._load(segments)
+
+    def _load(self, segments: list[Path]) -> None:
+        """
+        Indexes the pending records of the segments left by previous spools,
+        deleting those whose records were all acknowledged (ack() never
+        deletes the segment it appends to).
+        """
+        for segment in segments:
+            acked = self._acked(segment)
+            pending = [
+                record for record in self._scan(segment) if record.offset not in acked
+            ]
+            if not pending:
+                segment.unlink()
+                segment.with_suffix('.ack').unlink(missing_ok=True)
+                continue
+            for record in pending:
+                self._index(record)
+
+        # Acks of segments deleted before their own ack file.
+        for ack_path in self.directory.glob('*.ack'):
+            if not ack_path.with_suffix('.seg').exists():
+                ack_path.unlink()
+
+    def _index(self, record: SpoolRecord) -> None:
+        self._pending[(record.segment, record.offset)] = record
+        self._counts[record.segment] = self._counts.get(record.segment, 0) + 1
+        self._latest[record.subreddit] = record
+
+    def _segments(self) -> list[Path]:
+        return sorted(self.directory.glob('*.seg'))
+
+    def _sync(self, file) -> None:
+        file.flush()
+        if self.fsync:
+            os.fsync(file.fileno())
+
+    def append(self, record: SpoolRecord) -> SpoolRecord:
+        """
+        Durably appends a record, returning it with its position set.
+        """
+        meta = asdict(record)
+        del meta['body'], meta['segment'], meta['offset']
+        meta_bytes = json.dumps(meta).encode('utf-8')
+        crc = zlib.crc32(record.body, zlib.crc32(meta_bytes))
+        frame = self._FRAME.pack(len(meta_bytes), len(record.body), crc)
+
+        with self._lock:
+            if (
+                self._current.exists()
+                and self._current.stat().st_size >= self.segment_size
+            ):
+                sequence = int(self._current.stem) + 1
+                self._current = self.directory / f'{sequence:08d}.seg'
+
+            with open(self._current, 'ab') as file:
+                offset = file.tell()
+                file.write(frame + meta_bytes + record.body)
+                self._sync(file)
+
+            record.segment = self._current.name
+            record.offset = offset
+            self._index(replace(record, body=b''))
+
+        return record
+
+    def _acked(self, segment: Path) -> set[int]:
+        ack_path = segment.with_suffix('.ack')
+        if not ack_path.exists():
+            return set()
+
+        data = ack_path.read_bytes()
+        size = self._ACK.size
+        return {
+            self._ACK.unpack_from(data, i)[0]
+            for i in range(0, len(data) - len(data) % size, size)
+        }
+
+    def _read_frame(self, file, offset: int) -> tuple[dict, bytes] | None:
+        """
+        Reads the record framed at `offset`, or None when it is torn.
+        """
+        file.seek(offset)
+        header = file.read(self._FRAME.size)
+        if len(header) < self._FRAME.size:
+            return None
+
+        meta_len, body_len, crc = self._FRAME.unpack(header)
+        meta_bytes = file.read(meta_len)
+        body = file.read(body_len)
+        if (
+            len(meta_bytes) < meta_len
+            or len(body) < body_len
+            or zlib.crc32(body, zlib.crc32(meta_bytes)) != crc
+        ):
+            return None
+        return json.loads(meta_bytes), body
+
+    def _scan(self, segment: Path) -> Iterator[SpoolRecord]:
+        """
+        Yields the records of a segment without their bodies, one frame in
+        memory at a time.
+        """
+        size = segment.stat().st_size
+        with open(segment, 'rb') as file:
+            offset = 0
+            while offset + self._FRAME.size <= size:
+                frame = self._read_frame(file, offset)
+                if frame is None:
+                    logger.warning(f'Ignoring torn record at {segment.name}:{offset}')
+                    break
+
+                meta, _ = frame
+                yield SpoolRecord(**meta, segment=segment.name, offset=offset)
+                offset = file.tell()
+
+    def load(self, record: SpoolRecord) -> SpoolRecord:
+        """
+        Returns the record with its body read back from its segment.
+        """
+        segment = self.directory / record.segment
+        with open(segment, 'rb') as file:
+            frame = self._read_frame(file, record.offset)
+        if frame is None:
+            raise Exception(
+                f'Corrupted spool record at {record.segment}:{record.offset}'
+            )
+        return replace(record, body=frame[1])
+
+    def pending(self) -> list[SpoolRecord]:
+        """
+        Returns the records not acknowledged yet, oldest first, without
+        their bodies (see load()).
+        """
+        with self._lock:
+            return list(self._pending.values())
+
+    def latest(self, subreddit: str) -> SpoolRecord | None:
+        """
+        Returns the newest pending record of a subreddit.
+        """
+        with self._lock:
+            return self._latest.get(subreddit)
+
+    def ack(self, record: SpoolRecord) -> None:
+        """
+        Marks a record as uploaded, deleting its segment once fully acked.
+        """
+        segment = self.directory / record.segment
+
+        with self._lock:
+            with open(segment.with_suffix('.ack'), 'ab') as file:
+                file.write(self._ACK.pack(record.offset))
+                self._sync(file)
+
+            if self._pending.pop((record.segment, record.offset), None) is None:
+                return
+
+            latest = self._latest.get(record.subreddit)
+            if (latest.segment, latest.offset) == (record.segment, record.offset):
+                del self._latest[record.subreddit]
+                for item in reversed(self._pending.values()):
+                    if item.subreddit == record.subreddit:
+                        self._latest[record.subreddit] = item
+                        break
+
+            self._counts[record.segment] -= 1
+            if self._counts[record.segment] or segment == self._current:
+                return
+
+            del self._counts[record.segment]
+            segment.unlink(missing_ok=True)
+            segment.with_suffix('.ack').unlink(missing_ok=True)
+
+
+class SpoolFlusher:
+    """
+    Uploads the spooled records in the background.
+
+    Records are uploaded per subreddit in spool order, and the first failure
+    stops the subreddit until the next flush, so a checkpoint never moves
+    past a batch that is not stored yet. With `coalesce`, the pending
+    records of a subreddit are merged into objects of up to
+    `max_coalesced` records, so a long backlog is never held in memory
+    at once.
+
+    Attributes:
+        spool (LocalSpool): The spool to drain.
+        upload (Callable): Stores a list of records of one subreddit as one
+            object (RedditIngestor.upload_spooled).
+        interval (float): Seconds between two flushes.
+        coalesce (bool): Whether pending records are merged per subreddit.
+        max_coalesced (int): Records merged into one object at most.
+    """
+
+    def __init__(
+        self,
+        spool: LocalSpool,
+        upload,
+        interval: float = 5.0,
+        coalesce: bool = False,
+        max_coalesced: int = 50,
+    ):
+        self.spool = spool
+        self.upload = upload
+        self.interval = interval
+        self.coalesce = coalesce
+        self.max_coalesced = max(max_coalesced, 1)
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def flush(self) -> int:
+        """
+        Uploads the pending records, returning how many are still pending.
+        """
+        by_subreddit: dict[str, list[SpoolRecord]] = {}
+        for record in self.spool.pending():
+            by_subreddit.setdefault(record.subreddit, []).append(record)
+
+        left = 0
+        for subreddit, records in by_subreddit.items():
+            size = self.max_coalesced if self.coalesce else 1
+            groups = [records[i : i + size] for i in range(0, len(records), size)]
+
+            for i, group in enumerate(groups):
+                try:
+                    self.upload([self.spool.load(record) for record in group])
+                except Exception as e:
+                    logger.error(f'Failed to flush spooled {subreddit} batch: {e}')
+                    left += sum(len(rest) for rest in groups[i:])
+                    break
+
+                for record in group:
+                    self.spool.ack(record)
+
+        return left
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.flush()
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        """
+        Starts flushing in the background, beginning with the records left
+        by previous runs.
+        """
+        self._thread = threading.Thread(
+            target=self._run, name='spool-flusher', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 60.0) -> None:
+        """
+        Stops the background flushes, then tries to drain the spool for up
+        to `timeout` seconds. What is left is uploaded by the next run.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+        deadline = time.monotonic() + timeout
+        while self.flush() and time.monotonic() < deadline:
+            time.sleep(min(self.interval, max(deadline - time.monotonic(), 0)))
@@ -1,73 +1,422 @@
+import asyncio
+import signal
+import threading
+from datetime import datetime, timezone
+
+import requests
+
 from data_ingestion.utils.logger import get_logger
-from data_ingestion.config.env_settings import AWSConfig, RedditConfig
+from data_ingestion.config.env_settings import (
+    AWSConfig,
+    IngestionConfig,
+    RedditConfig,
+)
+from data_ingestion.extract.http import build_session
 from data_ingestion.extract.reddit import RedditExtractor, RedditAuth
+from data_ingestion.extract.reddit_async import AsyncRedditExtractor
+from data_ingestion.extract.token_provider import RedditTokenProvider
 from data_ingestion.load.aws_s3 import AWSClientS3, AWSServiceS3
+from data_ingestion.load.checkpoint import S3BackfillStore, S3CheckpointStore
+from data_ingestion.load.compression import get_codec
+from data_ingestion.load.dedup import S3SeenIndexStore
+from data_ingestion.load.spool import LocalSpool, SpoolFlusher
+from data_ingestion.ingestors.backfill import RedditBackfiller
+from data_ingestion.ingestors.comments import RedditCommentIngestor
+from data_ingestion.ingestors.pipeline import IngestionPipeline
+from data_ingestion.ingestors.planner import RequestPlanner
 from data_ingestion.ingestors.reddit import RedditIngestor
+from data_ingestion.ingestors.reddit_async import AsyncRedditIngestor
+from data_ingestion.ingestors.scheduler import PollingScheduler
+from data_ingestion.utils import metrics
+from data_ingestion.utils.profiling import Profiler
+from data_ingestion.utils.retry import RetryPolicy
 from time import perf_counter as pc
 
 
 logger = get_logger(__name__)
 
+SUBREDDITS: list[str] = [
+    'CryptoCurrency',
+    'Bitcoin',
+    'Ethereum',
+    'ethtrader',
+    'dogecoin',
+    'CryptoMoonshots',
+    'btc',
+    'BitcoinBeginners',
+    'CryptoTechnology',
+]
 
-def runner():
-    clock = {'init': pc(), 'end': 0}
 
-    logger.info('CryptoCore ingestion data_ingestion start')
+async def _run_async(
+    extractor: AsyncRedditExtractor,
+    storage: AWSServiceS3,
+    subreddits: list[str],
+    max_concurrency: int,
+    planner: RequestPlanner | None = None,
+    seen: S3SeenIndexStore | None = None,
+) -> None:
+    ingestor = AsyncRedditIngestor(
+        extractor=extractor,
+        storage=storage,
+        max_concurrency=max_concurrency,
+        checkpoints=S3CheckpointStore(storage),
+        planner=planner,
+        seen=seen,
+    )
+    try:
+        async with extractor:
+            await ingestor.run(subreddits)
+    finally:
+        ingestor.close()
 
-    # 1. Config
-    reddit_config = RedditConfig()
-    aws_config = AWSConfig()
 
+def _stop_on_signals(scheduler: PollingScheduler) -> None:
+    """
+    Stops the scheduler gracefully on SIGTERM (container stop) or SIGINT.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+
+    def handler(signum, frame):
+        logger.info(f'Received signal {signum}, stopping after current polls')
+        scheduler.stop()
+
+    signal.signal(signal.SIGTERM, handler)
+    signal.signal(signal.SIGINT, handler)
+
+
+def _connect(
+    reddit_config: RedditConfig,
+    aws_config: AWSConfig,
+    ingestion_config: IngestionConfig,
+) -> tuple[RetryPolicy, requests.Session, RedditTokenProvider, AWSServiceS3]:
+    """
+    Builds the clients shared by every mode: the retry policy, the HTTP
+    session, the token provider and the S3 storage.
+    """
     # 2. Auth
-    token: str = RedditAuth(
-        client_id=reddit_config.client_id,
-        client_secret=reddit_config.client_secret,
-        username=reddit_config.username,
-        password=reddit_config.password_account,
-        user_agent=reddit_config.user_agent,
-    ).access_token()
+    # Shared by the extractor and the storage so they draw from one budget.
+    retry_policy = RetryPolicy(
+        max_attempts=ingestion_config.retry_max_attempts,
+        base_delay=ingestion_config.retry_base_delay,
+        max_delay=ingestion_config.retry_max_delay,
+        budget=ingestion_config.retry_budget,
+    )
+    session = build_session(pool_size=ingestion_config.http_pool_size)
 
-    # 3. Extractor
-    red_extractor: RedditExtractor = RedditExtractor(
-        token=token,
-        user_agent=reddit_config.user_agent,
+    token_provider = RedditTokenProvider(
+        auth=RedditAuth(
+            client_id=reddit_config.client_id,
+            client_secret=reddit_config.client_secret,
+            username=reddit_config.username,
+            password=reddit_config.password_account,
+            user_agent=reddit_config.user_agent,
+            session=session,
+            timeout=ingestion_config.http_timeout,
+        ),
+        cache_path=ingestion_config.token_cache_path,
     )
+    # Fail fast on bad credentials; served from the cache when it is fresh.
+    token_provider.token()
 
-    # 4. Storage
+    # 3. Storage
     aws_client: AWSClientS3 = AWSClientS3(
         aws_access_key_id=aws_config.access_key_id,
         aws_secret_access_key=aws_config.secret_access_key,
         region_name=aws_config.default_region,
     )
 
+    # The boto3 client is only built by the first S3 call.
     aws_service: AWSServiceS3 = AWSServiceS3(
-        client=aws_client.client,
+        client=aws_client,
         bucket_name=aws_config.bucket_name,
+        retry_policy=retry_policy,
+        codec=get_codec(
+            ingestion_config.compression, ingestion_config.compression_level
+        ),
     )
 
-    # 5. Ingestor
-    red_ingestor: RedditIngestor = RedditIngestor(
-        extractor=red_extractor,
-        storage=aws_service,
+    return retry_policy, session, token_provider, aws_service
+
+
+def _seen_store(
+    storage: AWSServiceS3, ingestion_config: IngestionConfig
+) -> S3SeenIndexStore | None:
+    if not ingestion_config.dedup:
+        return None
+    return S3SeenIndexStore(
+        storage,
+        capacity=ingestion_config.dedup_capacity,
+        error_rate=ingestion_config.dedup_error_rate,
     )
 
-    # 6. Run
-    subreddits: list[str] = [
-        'CryptoCurrency',
-        'Bitcoin',
-        'Ethereum',
-        'ethtrader',
-        'dogecoin',
-        'CryptoMoonshots',
-        'btc',
-        'BitcoinBeginners',
-        'CryptoTechnology',
-    ]
-
-    red_ingestor.run(subreddits)
+
+def _export_metrics(ingestion_config: IngestionConfig) -> threading.Event | None:
+    """
+    Writes the metrics files every `metrics_interval` seconds until the
+    returned event is set (see _finish_metrics). Nothing is exported when
+    no metrics directory is configured.
+    """
+    if not ingestion_config.metrics_dir:
+        return None
+
+    done = threading.Event()
+
+    def export() -> None:
+        while not done.wait(ingestion_config.metrics_interval):
+            metrics.REGISTRY.write(ingestion_config.metrics_dir)
+
+    threading.Thread(target=export, name='metrics-export', daemon=True).start()
+    return done
+
+
+def _finish_metrics(
+    ingestion_config: IngestionConfig, export: threading.Event | None
+) -> None:
+    if export is None:
+        return
+    export.set()
+    metrics.REGISTRY.write(ingestion_config.metrics_dir)
+    logger.info(f'Metrics written to {ingestion_config.metrics_dir}')
+
+
+def _profiler(
+    ingestion_config: IngestionConfig, profile: bool | None
+) -> Profiler | None:
+    """
+    Builds the Profiler of a profiled run, writing into a new timestamped
+    directory under `profile_dir`, and hooks it into the metrics timers so
+    each stage is tracked too.
+    """
+    if not (ingestion_config.profile if profile is None else profile):
+        return None
+
+    run = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    profiler = Profiler(f'{ingestion_config.profile_dir}/{run}')
+    metrics.REGISTRY.stage_hook = profiler.stage
+    logger.info(f'Profiling the ingestion into {profiler.directory}')
+    return profiler
+
+
+def runner(profile: bool | None = None):
+    """
+    Runs the ingestion of SUBREDDITS.
+
+    Args:
+        profile: If True, each subreddit ingestion is profiled with cProfile
+            and tracemalloc (see Profiler). Defaults to the `profile` setting.
+    """
+    clock = {'init': pc(), 'end': 0}
+
+    logger.info('CryptoCore ingestion data_ingestion start')
+
+    # 1. Config
+    reddit_config = RedditConfig()
+    aws_config = AWSConfig()
+    ingestion_config = IngestionConfig()
+    metrics_export = _export_metrics(ingestion_config)
+
+    # 2. Auth + 3. Storage
+    retry_policy, session, token_provider, aws_service = _connect(
+        reddit_config, aws_config, ingestion_config
+    )
+
+    # 4. Extractor + Ingestor + Run
+    planner = None
+    if ingestion_config.adaptive_page_size:
+        planner = RequestPlanner(
+            min_limit=ingestion_config.min_page_size,
+            max_limit=ingestion_config.max_page_size,
+        )
+
+    if ingestion_config.daemon and ingestion_config.async_mode:
+        logger.warning('Daemon mode polls with the threaded ingestor, ignoring async')
+    elif ingestion_config.async_mode and ingestion_config.comments:
+        logger.warning('Comments are only ingested by the threaded ingestor')
+    elif ingestion_config.async_mode and ingestion_config.spool_dir:
+        logger.warning('The spool is only used by the threaded ingestor')
+
+    profiler = _profiler(ingestion_config, profile)
+    if (
+        profiler is not None
+        and ingestion_config.async_mode
+        and not ingestion_config.daemon
+    ):
+        logger.warning('Profiling only covers the threaded ingestor')
+    elif profiler is not None and ingestion_config.pipeline:
+        logger.warning('Profiling runs the subreddits one by one, not in a pipeline')
+    elif profiler is not None and ingestion_config.max_workers > 1:
+        logger.warning('Profiled subreddits are ingested one at a time')
+
+    spool = None
+    if ingestion_config.spool_dir:
+        spool = LocalSpool(ingestion_config.spool_dir)
+        if ingestion_config.streaming:
+            logger.warning('Streaming writes straight to S3, disabled by the spool')
+
+    if ingestion_config.async_mode and not ingestion_config.daemon:
+        async_extractor = AsyncRedditExtractor(
+            token=None,
+            user_agent=reddit_config.user_agent,
+            token_provider=token_provider,
+            retry_policy=retry_policy,
+            max_in_flight=ingestion_config.async_max_in_flight,
+            timeout=ingestion_config.http_timeout,
+        )
+        asyncio.run(
+            _run_async(
+                extractor=async_extractor,
+                storage=aws_service,
+                subreddits=SUBREDDITS,
+                max_concurrency=ingestion_config.async_max_in_flight,
+                planner=planner,
+                seen=_seen_store(aws_service, ingestion_config),
+            )
+        )
+    else:
+        red_extractor: RedditExtractor = RedditExtractor(
+            token=None,
+            user_agent=reddit_config.user_agent,
+            token_provider=token_provider,
+            retry_policy=retry_policy,
+            session=session,
+            timeout=ingestion_config.http_timeout,
+        )
+
+        comments = None
+        if ingestion_config.comments:
+            comments = RedditCommentIngestor(
+                extractor=red_extractor,
+                storage=aws_service,
+                max_workers=ingestion_config.comments_workers,
+                refetch_after=ingestion_config.comments_refetch_after,
+            )
+
+        red_ingestor: RedditIngestor = RedditIngestor(
+            extractor=red_extractor,
+            storage=aws_service,
+            streaming=ingestion_config.streaming and spool is None,
+            checkpoints=S3CheckpointStore(aws_service),
+            planner=planner,
+            comments=comments,
+            anchor_recovery=ingestion_config.anchor_recovery,
+            seen=_seen_store(aws_service, ingestion_config),
+            spool=spool,
+            profiler=profiler,
+        )
+
+        # Uploads what previous runs left in the spool, then what this one
+        # adds; stopped (and drained) once the ingestion is over.
+        flusher = None
+        if spool is not None:
+            flusher = SpoolFlusher(
+                spool=spool,
+                upload=red_ingestor.upload_spooled,
+                interval=ingestion_config.spool_flush_interval,
+                coalesce=ingestion_config.spool_coalesce,
+                max_coalesced=ingestion_config.spool_coalesce_max_records,
+            )
+            flusher.start()
+
+        if ingestion_config.daemon:
+            scheduler = PollingScheduler(
+                ingestor=red_ingestor,
+                subreddits=SUBREDDITS,
+                min_interval=ingestion_config.poll_min_interval,
+                max_interval=ingestion_config.poll_max_interval,
+                target_posts=ingestion_config.poll_target_posts,
+                max_workers=ingestion_config.max_workers,
+                retry_policy=retry_policy,
+            )
+            _stop_on_signals(scheduler)
+            scheduler.run()
+        elif ingestion_config.pipeline and profiler is None:
+            if ingestion_config.combined_subreddits or ingestion_config.streaming:
+                logger.warning(
+                    'The pipeline fetches every subreddit on its own, '
+                    'ignoring combined listings and streaming'
+                )
+            IngestionPipeline(
+                ingestor=red_ingestor,
+                extract_workers=ingestion_config.pipeline_extract_workers,
+                encode_workers=ingestion_config.pipeline_encode_workers,
+                load_workers=ingestion_config.pipeline_load_workers,
+                queue_size=ingestion_config.pipeline_queue_size,
+            ).run(SUBREDDITS)
+        else:
+            red_ingestor.run(
+                SUBREDDITS,
+                max_workers=ingestion_config.max_workers,
+                combined=ingestion_config.combined_subreddits,
+                group_size=ingestion_config.combined_group_size,
+            )
+
+        if flusher is not None:
+            flusher.stop()
+        red_ingestor.flush_seen()
 
     clock['end'] = pc()
+    _finish_metrics(ingestion_config, metrics_export)
+    if profiler is not None:
+        metrics.REGISTRY.stage_hook = None
 
     logger.info(
         f'CryptoCore data_ingestion finished in {(clock.get("end") - clock.get("init")):.2f} seconds'
     )
+
+
+def backfill_runner(
+    subreddits: list[str] | None = None,
+    until: float | None = None,
+    max_pages: int | None = None,
+    shard: int = 0,
+    shards: int = 1,
+    max_workers: int = 1,
+):
+    """
+    Crawls the history of the subreddits (SUBREDDITS by default) backwards,
+    resuming from the saved backfill state of each one.
+    """
+    clock = {'init': pc(), 'end': 0}
+
+    logger.info('CryptoCore backfill start')
+
+    reddit_config = RedditConfig()
+    aws_config = AWSConfig()
+    ingestion_config = IngestionConfig()
+    metrics_export = _export_metrics(ingestion_config)
+
+    retry_policy, session, token_provider, aws_service = _connect(
+        reddit_config, aws_config, ingestion_config
+    )
+
+    extractor = RedditExtractor(
+        token=None,
+        user_agent=reddit_config.user_agent,
+        token_provider=token_provider,
+        retry_policy=retry_policy,
+        session=session,
+        timeout=ingestion_config.http_timeout,
+    )
+    backfiller = RedditBackfiller(
+        extractor=extractor,
+        storage=aws_service,
+        states=S3BackfillStore(aws_service),
+        until=until,
+        max_pages=max_pages,
+        seen=_seen_store(aws_service, ingestion_config),
+    )
+    backfiller.run(
+        subreddits or SUBREDDITS,
+        max_workers=max_workers,
+        shard=shard,
+        shards=shards,
+    )
+
+    clock['end'] = pc()
+    _finish_metrics(ingestion_config, metrics_export)
+
+    logger.info(
+        f'CryptoCore backfill finished in {clock["end"] - clock["init"]:.2f} seconds'
+    )
@@ -0,0 +1,87 @@
+import hashlib
+import math
+import struct
+
+
+class BloomFilter:
+    """
+    A fixed-size Bloom filter over strings.
+
+    Membership tests never miss an added key, and report a key that was never
+    added with probability `error_rate` once `capacity` keys are stored. The
+    k bit positions of a key are derived from a single blake2b digest by
+    double hashing (h1 + i * h2), so add() and `in` cost O(k) whatever the
+    number of keys.
+
+    Attributes:
+        size (int): Number of bits.
+        hashes (int): Number of bit positions per key.
+    """
+
+    _HEADER = struct.Struct('>4sQI')
+    _MAGIC = b'BLM1'
+
+    def __init__(self, size: int, hashes: int, bits: bytearray | None = None):
+        self.size = size
+        self.hashes = hashes
+        self._bits = bits if bits is not None else bytearray((size + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float = 0.001) -> 'BloomFilter':
+        """
+        Builds the smallest filter holding `capacity` keys at `error_rate`.
+        """
+        size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        hashes = max(1, round(size / capacity * math.log(2)))
+        return cls(size=size, hashes=hashes)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    def update(self, other: 'BloomFilter') -> None:
+        """
+        Adds every key of `other` (a bitwise OR of the two filters).
+
+        Raises:
+            ValueError: If the filters are not sized alike.
+        """
+        if (other.size, other.hashes) != (self.size, self.hashes):
+            raise ValueError('Cannot merge Bloom filters of different sizes')
+        self._bits = bytearray(
+            (
+                int.from_bytes(self._bits, 'big') | int.from_bytes(other._bits, 'big')
+            ).to_bytes(len(self._bits), 'big')
+        )
+
+    def to_bytes(self) -> bytes:
+        return self._HEADER.pack(self._MAGIC, self.size, self.hashes) + self._bits
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'BloomFilter':
+        """
+        Raises:
+            ValueError: If `data` is not a serialized filter.
+        """
+        try:
+            magic, size, hashes = cls._HEADER.unpack_from(data)
+        except struct.error as e:
+            raise ValueError(f'Invalid Bloom filter: {e}')
+
+        bits = bytearray(data[cls._HEADER.size :])
+        if magic != cls._MAGIC or len(bits) != (size + 7) // 8:
+            raise ValueError('Invalid Bloom filter')
+        return cls(size=size, hashes=hashes, bits=bits)
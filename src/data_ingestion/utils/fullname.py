@@ -0,0 +1,12 @@
+def fullname_id(fullname: str) -> int:
+    """
+    Converts a Reddit fullname (e.g. 't3_1abcd2') to its numeric id.
+
+    Ids are base-36 and assigned sequentially, so they order items by
+    creation time within a kind.
+
+    Raises:
+        ValueError: If the fullname is malformed.
+    """
+    _, _, base36 = fullname.partition('_')
+    return int(base36, 36)
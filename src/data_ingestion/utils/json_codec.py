@@ -0,0 +1,30 @@
+import json
+from typing import Any
+
+# orjson is an optional speedup (cryptocore[speedups]); stdlib json otherwise.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+BACKEND: str = 'orjson' if orjson is not None else 'json'
+
+
+def loads(data: bytes | str) -> Any:
+    """
+    Decodes a JSON document straight from the raw response body.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encodes a JSON document to UTF-8 bytes without an intermediate str
+    when orjson is available.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
@@ -1,13 +1,168 @@
 from __future__ import annotations
+import atexit
+import json
 import logging
+import os
+import queue
+import threading
+from datetime import datetime, timezone
 from logging import Logger
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Optional
 
 
 DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
+# Variáveis de ambiente do modo assíncrono (lidas na criação de cada logger,
+# antes da configuração da aplicação, pois os loggers nascem no import).
+QUEUE_ENV = 'INGESTION_LOG_QUEUE'
+JSON_ENV = 'INGESTION_LOG_JSON'
+SAMPLING_ENV = 'INGESTION_LOG_SAMPLING'
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formata cada registro como uma linha JSON.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Mantém 1 a cada `every` registros até `max_level`; os de nível acima
+    (WARNING, ERROR...) passam sempre.
+
+    Aplicado no próprio logger, descarta as mensagens do hot path na thread
+    que as emite, antes de qualquer formatação.
+    """
+
+    def __init__(self, every: int, max_level: int = logging.INFO):
+        super().__init__()
+        self.every = max(every, 1)
+        self.max_level = max_level
+        self._seen = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        with self._lock:
+            self._seen += 1
+            return (self._seen - 1) % self.every == 0
+
+
+class _QueueHandler(QueueHandler):
+    # O QueueHandler padrão formata a mensagem na thread que loga; aqui o
+    # registro vai intacto (a fila é local, nada é serializado) e toda a
+    # formatação fica para a thread do listener.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+_listener: QueueListener | None = None
+_queue_handler: QueueHandler | None = None
+_listener_lock = threading.Lock()
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _sampling(name: str) -> int | None:
+    """
+    Lê a taxa de amostragem de um logger de INGESTION_LOG_SAMPLING, no
+    formato 'data_ingestion.extract.reddit=100,data_ingestion.load.aws_s3=10'.
+    """
+    for item in os.environ.get(SAMPLING_ENV, '').split(','):
+        logger_name, _, every = item.partition('=')
+        if logger_name.strip() == name and every.strip().isdigit():
+            return int(every)
+    return None
+
+
+def _build_handlers(
+    level: int,
+    log_file: Optional[str],
+    max_bytes: int,
+    backup_count: int,
+    formatter: logging.Formatter,
+) -> list[logging.Handler]:
+    # Console handler
+    ch = logging.StreamHandler()
+    ch.setLevel(level)
+    ch.setFormatter(formatter)
+    handlers: list[logging.Handler] = [ch]
+
+    # File handler (rotating)
+    if log_file:
+        log_path = Path(log_file)
+        if log_path.parent:
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+        fh = RotatingFileHandler(
+            filename=str(log_path),
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding='utf-8',
+        )
+        fh.setLevel(level)
+        fh.setFormatter(formatter)
+        handlers.append(fh)
+
+    return handlers
+
+
+def _shared_queue_handler(
+    level: int,
+    log_file: Optional[str],
+    max_bytes: int,
+    backup_count: int,
+    formatter: logging.Formatter,
+) -> QueueHandler:
+    """
+    Retorna o QueueHandler compartilhado por todos os loggers, iniciando na
+    primeira chamada o QueueListener que escreve no console e no arquivo.
+    Os handlers do primeiro logger configurado valem para todos.
+    """
+    global _listener, _queue_handler
+
+    with _listener_lock:
+        if _queue_handler is None:
+            records: queue.Queue = queue.Queue(-1)
+            _listener = QueueListener(
+                records,
+                *_build_handlers(level, log_file, max_bytes, backup_count, formatter),
+                respect_handler_level=True,
+            )
+            _listener.start()
+            atexit.register(stop_listener)
+            _queue_handler = _QueueHandler(records)
+        return _queue_handler
+
+
+def stop_listener() -> None:
+    """
+    Esvazia a fila e para o QueueListener (chamado também no atexit).
+    """
+    global _listener, _queue_handler
+
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+        _listener = None
+        _queue_handler = None
+
 
 def get_logger(
     name: str = __name__,
@@ -17,6 +172,9 @@ def get_logger(
     backup_count: int = 5,
     fmt: str = DEFAULT_FORMAT,
     force: bool = False,
+    use_queue: Optional[bool] = None,
+    json_lines: Optional[bool] = None,
+    sample_every: Optional[int] = None,
 ) -> Logger:
     """
     Retorna um logger configurado com Console + opcional RotatingFileHandler.
@@ -29,6 +187,13 @@ def get_logger(
     - backup_count: quantos arquivos de backup manter.
     - fmt: formato da mensagem de log.
     - force: se True, reconfigura mesmo que handlers já existam.
+    - use_queue: se True, os registros passam por um QueueHandler e são
+      escritos por uma thread de fundo (QueueListener), sem I/O na thread
+      que loga. Padrão: variável INGESTION_LOG_QUEUE.
+    - json_lines: se True, cada registro é escrito como uma linha JSON.
+      Padrão: variável INGESTION_LOG_JSON.
+    - sample_every: mantém 1 a cada N registros de nível INFO ou abaixo.
+      Padrão: a taxa do logger em INGESTION_LOG_SAMPLING, se houver.
     """
     logger = logging.getLogger(name)
     logger.setLevel(level)
@@ -40,29 +205,30 @@ def get_logger(
     if force and logger.handlers:
         for h in list(logger.handlers):
             logger.removeHandler(h)
+        for f in list(logger.filters):
+            logger.removeFilter(f)
 
-    formatter = logging.Formatter(fmt)
+    if use_queue is None:
+        use_queue = _env_flag(QUEUE_ENV)
+    if json_lines is None:
+        json_lines = _env_flag(JSON_ENV)
+    if sample_every is None:
+        sample_every = _sampling(name)
 
-    # Console handler
-    ch = logging.StreamHandler()
-    ch.setLevel(level)
-    ch.setFormatter(formatter)
-    logger.addHandler(ch)
+    formatter = JsonFormatter() if json_lines else logging.Formatter(fmt)
 
-    # File handler (rotating)
-    if log_file:
-        log_path = Path(log_file)
-        if log_path.parent:
-            log_path.parent.mkdir(parents=True, exist_ok=True)
-        fh = RotatingFileHandler(
-            filename=str(log_path),
-            maxBytes=max_bytes,
-            backupCount=backup_count,
-            encoding='utf-8',
+    if sample_every and sample_every > 1:
+        logger.addFilter(SamplingFilter(sample_every))
+
+    if use_queue:
+        logger.addHandler(
+            _shared_queue_handler(level, log_file, max_bytes, backup_count, formatter)
         )
-        fh.setLevel(level)
-        fh.setFormatter(formatter)
-        logger.addHandler(fh)
+    else:
+        for handler in _build_handlers(
+            level, log_file, max_bytes, backup_count, formatter
+        ):
+            logger.addHandler(handler)
 
     logger.propagate = False
     return logger
@@ -0,0 +1,203 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Subreddit the current thread (or asyncio task) is working on.
+_subreddit: contextvars.ContextVar[str] = contextvars.ContextVar(
+    'metrics_subreddit', default=''
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metrics:
+    """
+    Stage timers and counters of an ingestion run, broken down by subreddit.
+
+    Timers record the number of calls, the total and the longest duration of
+    a stage (auth, checkpoint_lookup, page_fetch, decode, encode, upload);
+    counters keep a running sum (posts, requests, upload_bytes, retries,
+    rate_limit_wait_seconds...). The subreddit label is taken from the
+    enclosing scope(), so the HTTP, S3 and rate limit layers record metrics
+    without knowing which subreddit they serve. Thread-safe.
+
+    Attributes:
+        stage_hook: An optional callable returning a context manager for a
+            stage name (e.g. Profiler.stage), entered around every timed
+            block.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (stage, subreddit) -> [count, total seconds, max seconds]
+        self._timers: dict[tuple[str, str], list[float]] = {}
+        # (name, subreddit) -> sum
+        self._counters: dict[tuple[str, str], float] = {}
+        self.started_at = time.time()
+        self.stage_hook = None
+
+    @contextmanager
+    def scope(self, subreddit: str):
+        """
+        Labels the metrics recorded in the block with `subreddit`.
+        """
+        token = _subreddit.set(subreddit)
+        try:
+            yield
+        finally:
+            _subreddit.reset(token)
+
+    def observe(self, stage: str, seconds: float, subreddit: str | None = None) -> None:
+        key = (stage, _subreddit.get() if subreddit is None else subreddit)
+        with self._lock:
+            timer = self._timers.setdefault(key, [0, 0.0, 0.0])
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2] = max(timer[2], seconds)
+
+    @contextmanager
+    def timer(self, stage: str, subreddit: str | None = None):
+        """
+        Times the block as one call of `stage`, even when it raises.
+        """
+        hook = self.stage_hook
+        start = self._clock()
+        try:
+            if hook is None:
+                yield
+            else:
+                with hook(stage):
+                    yield
+        finally:
+            self.observe(stage, self._clock() - start, subreddit)
+
+    def incr(self, name: str, value: float = 1, subreddit: str | None = None) -> None:
+        key = (name, _subreddit.get() if subreddit is None else subreddit)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+            self.started_at = time.time()
+
+    def summary(self) -> dict:
+        """
+        Returns the metrics as a JSON-serializable run summary, with the
+        totals of each stage and counter and their per-subreddit breakdown.
+        """
+        with self._lock:
+            timers = {key: list(value) for key, value in self._timers.items()}
+            counters = dict(self._counters)
+
+        stages: dict[str, dict] = {}
+        for (stage, subreddit), (count, total, longest) in sorted(timers.items()):
+            entry = stages.setdefault(
+                stage, {'count': 0, 'seconds': 0.0, 'max': 0.0, 'subreddits': {}}
+            )
+            entry['count'] += count
+            entry['seconds'] += total
+            entry['max'] = max(entry['max'], longest)
+            if subreddit:
+                entry['subreddits'][subreddit] = {
+                    'count': count,
+                    'seconds': total,
+                    'max': longest,
+                }
+
+        totals: dict[str, dict] = {}
+        for (name, subreddit), value in sorted(counters.items()):
+            entry = totals.setdefault(name, {'total': 0, 'subreddits': {}})
+            entry['total'] += value
+            if subreddit:
+                entry['subreddits'][subreddit] = value
+
+        return {
+            'started_at': self.started_at,
+            'duration': time.time() - self.started_at,
+            'stages': stages,
+            'counters': totals,
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            timers = sorted(self._timers.items())
+            counters = sorted(self._counters.items())
+
+        lines = [
+            '# HELP ingestion_stage_calls_total Calls of each ingestion stage.',
+            '# TYPE ingestion_stage_calls_total counter',
+        ]
+        labels = {
+            key: f'stage="{_escape(key[0])}",subreddit="{_escape(key[1])}"'
+            for key, _ in timers
+        }
+        lines += [
+            f'ingestion_stage_calls_total{{{labels[key]}}} {value[0]}'
+            for key, value in timers
+        ]
+        lines += [
+            '# HELP ingestion_stage_seconds_total Time spent in each ingestion stage.',
+            '# TYPE ingestion_stage_seconds_total counter',
+        ]
+        lines += [
+            f'ingestion_stage_seconds_total{{{labels[key]}}} {value[1]}'
+            for key, value in timers
+        ]
+        lines += [
+            '# HELP ingestion_stage_max_seconds Longest call of each ingestion stage.',
+            '# TYPE ingestion_stage_max_seconds gauge',
+        ]
+        lines += [
+            f'ingestion_stage_max_seconds{{{labels[key]}}} {value[2]}'
+            for key, value in timers
+        ]
+
+        names = sorted({name for (name, _), _ in counters})
+        for name in names:
+            metric = f'ingestion_{name}_total'
+            lines += [f'# TYPE {metric} counter']
+            lines += [
+                f'{metric}{{subreddit="{_escape(subreddit)}"}} {value}'
+                for (counter, subreddit), value in counters
+                if counter == name
+            ]
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory: str) -> None:
+        """
+        Writes `ingestion.prom` (for the node_exporter textfile collector)
+        and `run_summary.json` into `directory`. Each file is replaced
+        atomically so a scrape never sees a partial file.
+        """
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+
+        for name, content in (
+            ('ingestion.prom', self.to_prometheus()),
+            ('run_summary.json', json.dumps(self.summary(), indent=2)),
+        ):
+            tmp = path / f'.{name}.{threading.get_ident()}.tmp'
+            tmp.write_text(content, encoding='utf-8')
+            os.replace(tmp, path / name)
+
+
+# The registry every component records into.
+REGISTRY = Metrics()
+
+scope = REGISTRY.scope
+timer = REGISTRY.timer
+observe = REGISTRY.observe
+incr = REGISTRY.incr
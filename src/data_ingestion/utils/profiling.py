@@ -0,0 +1,165 @@
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+from data_ingestion.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class Profiler:
+    """
+    Profiles the ingestion of each subreddit with cProfile and tracemalloc.
+
+    Each profiled ingestion writes, under `directory`:
+
+    - `<name>.pstats`: the cProfile stats (`python -m pstats <file>`);
+    - `<name>.txt`: the slowest functions, the top allocation sites and the
+      peak memory, readable as is;
+    - `summary.json`: peak memory, duration and per-stage peaks of every
+      profiled ingestion so far, rewritten after each one.
+
+    Only one profile can be active at a time (cProfile and tracemalloc are
+    process-wide), so profiled ingestions are serialized by a lock.
+
+    Stages (page_fetch, decode, encode, upload...) are reported by the
+    metrics timers through stage(): the peak traced memory above the stage's
+    starting point is kept per stage. Only the stages run by the profiled
+    thread are tracked, not those of the comment or spool flusher threads.
+
+    Attributes:
+        directory (Path): Where the profiles are written.
+        top (int): Functions and allocation sites listed in the reports.
+    """
+
+    def __init__(self, directory: str, top: int = 25):
+        self.directory = Path(directory)
+        self.top = top
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._runs: dict[str, int] = {}
+        self._summary: dict[str, dict] = {}
+
+        # State of the active profile, only touched by its thread.
+        self._thread: int | None = None
+        self._stages: dict[str, dict] = {}
+        self._stack: list[list[int]] = []
+        # Highest traced memory before the last tracemalloc.reset_peak().
+        self._peak = 0
+
+    @contextmanager
+    def profile(self, subreddit: str):
+        """
+        Profiles the block as one ingestion of `subreddit`.
+        """
+        with self._lock:
+            run = self._runs.get(subreddit, 0) + 1
+            self._runs[subreddit] = run
+            name = subreddit if run == 1 else f'{subreddit}-{run}'
+
+            self._stages, self._stack, self._peak = {}, [], 0
+            self._thread = threading.get_ident()
+            profile = cProfile.Profile()
+            tracemalloc.start()
+            started = time.perf_counter()
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                seconds = time.perf_counter() - started
+                self._thread = None
+                peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+
+                try:
+                    self._write(name, profile, snapshot, peak, seconds)
+                except Exception as e:
+                    logger.error(f'Failed to write profile of {subreddit}: {e}')
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Tracks the peak memory of a stage of the profiled ingestion. Does
+        nothing outside profile().
+        """
+        if self._thread != threading.get_ident() or not tracemalloc.is_tracing():
+            yield
+            return
+
+        # Peaks are reset per stage: the peak reached so far is kept for the
+        # profile, and the enclosing stages keep the highest peak seen by the
+        # stages nested in them.
+        current, peak = tracemalloc.get_traced_memory()
+        self._peak = max(self._peak, peak)
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        self._stack.append([current, current])
+
+        try:
+            yield
+        finally:
+            start, nested_peak = self._stack.pop()
+            peak = max(tracemalloc.get_traced_memory()[1], nested_peak)
+            self._peak = max(self._peak, peak)
+            if self._stack:
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+
+            entry = self._stages.setdefault(name, {'calls': 0, 'peak_bytes': 0})
+            entry['calls'] += 1
+            entry['peak_bytes'] = max(entry['peak_bytes'], peak - start)
+
+    def _write(
+        self,
+        name: str,
+        profile: cProfile.Profile,
+        snapshot: tracemalloc.Snapshot,
+        peak: int,
+        seconds: float,
+    ) -> None:
+        profile.dump_stats(self.directory / f'{name}.pstats')
+
+        functions = io.StringIO()
+        stats = pstats.Stats(profile, stream=functions)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+
+        allocations = snapshot.statistics('lineno')[: self.top]
+        lines = [
+            f'Profile of {name}: {seconds:.3f}s, peak memory {peak / 1024:.1f} KiB',
+            '',
+            f'Top {len(allocations)} allocation sites:',
+            *(str(statistic) for statistic in allocations),
+            '',
+            functions.getvalue(),
+        ]
+        (self.directory / f'{name}.txt').write_text('\n'.join(lines), encoding='utf-8')
+
+        self._summary[name] = {
+            'seconds': seconds,
+            'peak_memory_bytes': peak,
+            'stages': self._stages,
+            'top_allocations': [
+                {
+                    'site': str(statistic.traceback[0]),
+                    'size_bytes': statistic.size,
+                    'count': statistic.count,
+                }
+                for statistic in allocations[:10]
+            ],
+        }
+        (self.directory / 'summary.json').write_text(
+            json.dumps(self._summary, indent=2), encoding='utf-8'
+        )
+        logger.info(
+            f'Profiled {name}: {seconds:.2f}s, peak memory {peak / 1024:.1f} KiB '
+            f'-> {self.directory}'
+        )
@@ -0,0 +1,161 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from data_ingestion.utils import metrics
+from data_ingestion.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar('T')
+
+
+class RetryPolicy:
+    """
+    Retries transient failures with exponential backoff and full jitter.
+
+    The delay before attempt n+1 is drawn uniformly from
+    [0, min(max_delay, base_delay * 2**n)], unless the error carries a
+    `retry_after` attribute (e.g. from a Retry-After header), which is then
+    honored up to `max_delay`: a longer wait raises the error right away
+    instead of stalling the worker. A single policy is shared by the extractor and the storage
+    layer, and every retry draws from its per-run `budget`: once the budget
+    is spent, errors are raised right away instead of piling up delays.
+
+    Attributes:
+        max_attempts (int): Attempts per call, including the first one.
+        base_delay (float): Backoff base in seconds.
+        max_delay (float): Upper bound of the backoff in seconds.
+        budget (int): Retries allowed across all calls until reset_budget().
+    """
+
+    max_attempts: int
+    base_delay: float
+    max_delay: float
+    budget: int
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        budget: int = 100,
+        sleep: Callable[[float], None] = time.sleep,
+        uniform: Callable[[float, float], float] = random.uniform,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self._sleep = sleep
+        self._uniform = uniform
+
+        self._lock = threading.Lock()
+        self._retries_left = budget
+
+    @property
+    def retries_left(self) -> int:
+        return self._retries_left
+
+    def reset_budget(self) -> None:
+        with self._lock:
+            self._retries_left = self.budget
+
+    def _take_retry(self) -> bool:
+        with self._lock:
+            if self._retries_left <= 0:
+                return False
+            self._retries_left -= 1
+            return True
+
+    def backoff(self, attempt: int, error: Exception | None = None) -> float:
+        """
+        Computes the delay before retrying after the given (0-based) attempt.
+        """
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is not None:
+            return max(float(retry_after), 0.0)
+        return self._uniform(0.0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def call(
+        self,
+        func: Callable[[], T],
+        is_retryable: Callable[[Exception], bool],
+        description: str = 'operation',
+    ) -> T:
+        """
+        Calls `func`, retrying it while it raises retryable errors.
+
+        Args:
+            func: The operation to run.
+            is_retryable: Tells transient errors apart from permanent ones.
+            description: Used in log messages.
+
+        Returns:
+            The result of the first successful call.
+        """
+        attempt = 0
+        while True:
+            try:
+                return func()
+            except Exception as e:
+                self._sleep(self._next_delay(attempt, e, is_retryable, description))
+                attempt += 1
+
+    async def acall(
+        self,
+        func: Callable[[], Awaitable[T]],
+        is_retryable: Callable[[Exception], bool],
+        description: str = 'operation',
+    ) -> T:
+        """
+        Async counterpart of call(): awaits `func` and sleeps on the loop.
+        """
+        attempt = 0
+        while True:
+            try:
+                return await func()
+            except Exception as e:
+                await asyncio.sleep(
+                    self._next_delay(attempt, e, is_retryable, description)
+                )
+                attempt += 1
+
+    def _next_delay(
+        self,
+        attempt: int,
+        error: Exception,
+        is_retryable: Callable[[Exception], bool],
+        description: str,
+    ) -> float:
+        """
+        Returns the delay before the next attempt, or re-raises `error` when
+        it must not be retried. Must be called from an except block.
+        """
+        if not is_retryable(error) or attempt + 1 >= self.max_attempts:
+            raise error
+
+        delay = self.backoff(attempt, error)
+        if delay > self.max_delay:
+            logger.warning(
+                f'Retry-After of {delay:.0f}s exceeds {self.max_delay:.0f}s, '
+                f'giving up on {description}'
+            )
+            raise error
+        if not self._take_retry():
+            logger.warning(f'Retry budget exhausted, giving up on {description}')
+            raise error
+
+        metrics.incr('retries')
+        metrics.incr('retry_wait_seconds', delay)
+        logger.warning(
+            'Retrying %s in %.2fs (attempt %d/%d): %s',
+            description,
+            delay,
+            attempt + 2,
+            self.max_attempts,
+            error,
+        )
+        return delay
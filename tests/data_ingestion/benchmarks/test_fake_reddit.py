@@ -0,0 +1,68 @@
+import pytest
+
+from data_ingestion.benchmarks.fake_reddit import FakeReddit
+from data_ingestion.extract.reddit import RedditAPIError, RedditExtractor
+from data_ingestion.utils.fullname import fullname_id
+from data_ingestion.utils.retry import RetryPolicy
+
+
+@pytest.fixture
+def fake():
+    with FakeReddit(['Bitcoin', 'btc'], backlog=250) as server:
+        yield server
+
+
+def extractor(fake, **kwargs):
+    return RedditExtractor(token='test', user_agent='test', base_url=fake.url, **kwargs)
+
+
+def names(page):
+    return [child['data']['name'] for child in page['data']['children']]
+
+
+# ==========================================
+# ---------- Tests for FakeReddit ----------
+# ==========================================
+
+
+def test_forward_sync_from_anchor_fetches_backlog(fake):
+    pages = extractor(fake).batch('Bitcoin', fullname=fake.anchor('Bitcoin'), limit=100)
+
+    posts = [name for page in pages for name in names(page)]
+    assert len(posts) == 250
+    # newest page first, newest post first, like Reddit
+    assert posts == sorted(posts, key=fullname_id, reverse=True)
+
+
+def test_after_walks_back_in_time(fake):
+    newest = extractor(fake).fetch_thread_after('btc', '', limit=100)
+    older = extractor(fake).fetch_thread_after(
+        'btc', newest['data']['after'], limit=100
+    )
+
+    assert fullname_id(names(older)[0]) < fullname_id(names(newest)[-1])
+    assert all(
+        child['data']['subreddit'] == 'btc' for child in older['data']['children']
+    )
+
+
+def test_ids_do_not_collide_across_subreddits(fake):
+    assert fake.fullname('Bitcoin', 1) != fake.fullname('btc', 1)
+
+
+def test_rate_limit_headers_are_sent(fake):
+    response = extractor(fake)._get(f'{fake.url}/r/Bitcoin/new', {'limit': 1})
+
+    assert response.headers['X-Ratelimit-Used'] == '1'
+    assert int(response.headers['X-Ratelimit-Remaining']) == fake.ratelimit - 1
+
+
+def test_injected_429s_are_retried():
+    with FakeReddit(['Bitcoin'], backlog=10, error_rate=1.0) as fake:
+        policy = RetryPolicy(max_attempts=3, sleep=lambda delay: None)
+
+        with pytest.raises(RedditAPIError) as exc_info:
+            extractor(fake, retry_policy=policy).fetch_thread_after('Bitcoin', '')
+
+    assert exc_info.value.status_code == 429
+    assert fake.throttled == fake.requests == 3
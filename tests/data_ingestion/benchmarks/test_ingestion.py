@@ -0,0 +1,17 @@
+from data_ingestion.benchmarks.ingestion import run_benchmark
+
+
+# =======================================================
+# ---------- Tests for the ingestion benchmark ----------
+# =======================================================
+
+
+def test_run_benchmark_ingests_every_post():
+    report = run_benchmark(subreddits=3, posts=600, workers=2, page_size=50)
+
+    assert report['posts'] == 600
+    # 4 pages per subreddit, plus the empty page ending each sync
+    assert report['requests'] == 3 * 5
+    assert report['requests_per_post'] == 15 / 600
+    assert report['page_latency_p50_ms'] <= report['page_latency_p99_ms']
+    assert report['peak_rss_mb'] > 0
@@ -0,0 +1,31 @@
+from data_ingestion.benchmarks.startup import (
+    LAZY_MODULES,
+    import_breakdown,
+    loaded_modules,
+    main,
+)
+
+
+# ===================================================
+# ---------- Tests for the startup benchmark ----------
+# ===================================================
+
+
+def test_runner_import_leaves_heavy_dependencies_unloaded():
+    modules = loaded_modules()
+
+    assert 'data_ingestion.runner' in modules
+    assert not set(LAZY_MODULES) & modules
+
+
+def test_import_breakdown_is_per_package():
+    breakdown = import_breakdown()
+
+    assert 'data_ingestion' in breakdown
+    assert 'boto3' not in breakdown
+    assert list(breakdown.values()) == sorted(breakdown.values(), reverse=True)
+
+
+def test_main_fails_over_budget(capsys):
+    assert main(['--runs', '1', '--import-budget-ms', '0']) == 1
+    assert 'Startup regression: import took' in capsys.readouterr().err
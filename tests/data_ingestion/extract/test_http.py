@@ -0,0 +1,22 @@
+from data_ingestion.extract.http import build_session
+
+
+# ===============================================
+# ---------- Tests for build_session ------------
+# ===============================================
+
+
+def test_build_session_mounts_pooled_adapter():
+    session = build_session(pool_size=7)
+
+    adapter = session.get_adapter('https://oauth.reddit.com')
+
+    assert adapter._pool_connections == 7
+    assert adapter._pool_maxsize == 7
+    assert adapter._pool_block is True
+
+
+def test_build_session_negotiates_gzip():
+    session = build_session()
+
+    assert 'gzip' in session.headers['Accept-Encoding']
@@ -0,0 +1,86 @@
+import pytest
+from data_ingestion.extract.rate_limit import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+# ===============================================
+# ---------- Tests for RateLimiter --------------
+# ===============================================
+
+
+def test_rate_limiter_does_not_wait_with_budget(clock):
+    limiter = RateLimiter(capacity=10, period=10.0, clock=clock, sleep=clock.sleep)
+
+    for _ in range(10):
+        assert limiter.acquire() == 0.0
+
+    assert clock.sleeps == []
+
+
+def test_rate_limiter_waits_for_refill_without_headers(clock):
+    limiter = RateLimiter(capacity=2, period=10.0, clock=clock, sleep=clock.sleep)
+
+    limiter.acquire()
+    limiter.acquire()
+    waited = limiter.acquire()
+
+    assert waited == pytest.approx(5.0)
+    assert clock.sleeps == [pytest.approx(5.0)]
+
+
+def test_rate_limiter_waits_until_reset_when_exhausted(clock):
+    limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+    limiter.update(
+        {
+            'X-Ratelimit-Remaining': '0.0',
+            'X-Ratelimit-Reset': '42',
+            'X-Ratelimit-Used': '600',
+        }
+    )
+
+    waited = limiter.acquire()
+
+    assert waited == pytest.approx(42.0)
+    assert limiter.acquire() == 0.0
+
+
+def test_rate_limiter_update_uses_remaining_and_used(clock):
+    limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+    limiter.update(
+        {
+            'X-Ratelimit-Remaining': '1',
+            'X-Ratelimit-Reset': '30',
+            'X-Ratelimit-Used': '99',
+        }
+    )
+
+    assert limiter.capacity == 100
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == pytest.approx(30.0)
+
+
+def test_rate_limiter_update_ignores_missing_headers(clock):
+    limiter = RateLimiter(capacity=5, clock=clock, sleep=clock.sleep)
+
+    limiter.update({})
+    limiter.update({'X-Ratelimit-Remaining': 'not-a-number'})
+
+    assert limiter.capacity == 5
+    assert limiter.acquire() == 0.0
@@ -1,8 +1,16 @@
+import json
+
 import pytest
-from data_ingestion.extract.reddit import RedditAuth, RedditExtractor
+import requests
+from data_ingestion.extract.reddit import RedditAPIError, RedditAuth, RedditExtractor
+from data_ingestion.utils.retry import RetryPolicy
 from requests.auth import HTTPBasicAuth
 
 
+def json_bytes(payload):
+    return json.dumps(payload).encode('utf-8')
+
+
 # ==========================================
 # ---------- Tests for RedditAuth ----------
 # ==========================================
@@ -22,8 +30,8 @@ def auth_service():
 @pytest.fixture
 def mock_requests_post(mocker):
     mock_response = mocker.Mock()
-    mock_post = mocker.patch(
-        'data_ingestion.extract.reddit.requests.post', return_value=mock_response
+    mock_post = mocker.patch.object(
+        requests.Session, 'post', return_value=mock_response
     )
 
     return mock_post, mock_response
@@ -49,6 +57,7 @@ def test_reddit_auth_success(auth_service, mock_requests_post):
             'password': 'mock_password',
         },
         headers={'User-Agent': 'mock_user_agent'},
+        timeout=10.0,
     )
 
 
@@ -70,6 +79,7 @@ def test_reddit_auth_failure(auth_service, mock_requests_post):
             'password': 'mock_password',
         },
         headers={'User-Agent': 'mock_user_agent'},
+        timeout=10.0,
     )
 
 
@@ -91,6 +101,7 @@ def test_reddit_auth_no_token(auth_service, mock_requests_post):
             'password': 'mock_password',
         },
         headers={'User-Agent': 'mock_user_agent'},
+        timeout=10.0,
     )
 
 
@@ -102,9 +113,7 @@ def test_reddit_auth_no_token(auth_service, mock_requests_post):
 @pytest.fixture
 def mock_requests_get(mocker):
     mock_response = mocker.Mock()
-    mock_get = mocker.patch(
-        'data_ingestion.extract.reddit.requests.get', return_value=mock_response
-    )
+    mock_get = mocker.patch.object(requests.Session, 'get', return_value=mock_response)
 
     return mock_get, mock_response
 
@@ -112,14 +121,16 @@ def mock_requests_get(mocker):
 def test_reddit_extractor_fetch_thread_before_success(mock_requests_get):
     mock_get, mock_response = mock_requests_get
     mock_response.status_code = 200
-    mock_response.json.return_value = {
-        'data': {
-            'children': [
-                {'data': {'name': 'thread1', 'created_utc': 1700000000}},
-                {'data': {'name': 'thread2', 'created_utc': 1700001000}},
-            ]
+    mock_response.content = json_bytes(
+        {
+            'data': {
+                'children': [
+                    {'data': {'name': 'thread1', 'created_utc': 1700000000}},
+                    {'data': {'name': 'thread2', 'created_utc': 1700001000}},
+                ]
+            }
         }
-    }
+    )
 
     extractor = RedditExtractor(token='mock_token_123', user_agent='mock_user_agent')
     threads = extractor.fetch_thread_before(
@@ -136,6 +147,7 @@ def test_reddit_extractor_fetch_thread_before_success(mock_requests_get):
             'User-Agent': 'mock_user_agent',
         },
         params={'before': 't3_12345', 'limit': 2},
+        timeout=10.0,
     )
 
 
@@ -161,6 +173,7 @@ def test_reddit_extractor_fetch_thread_before_failure(mock_requests_get):
             'User-Agent': 'mock_user_agent',
         },
         params={'before': 't3_12345', 'limit': 2},
+        timeout=10.0,
     )
 
 
@@ -170,30 +183,34 @@ def test_reddit_extractor_batch_success(mock_requests_get):
     # Setup responses for each call
     first_response = mock_response.__class__()
     first_response.status_code = 200
-    first_response.json.return_value = {
-        'data': {
-            'children': [
-                {'data': {'name': 'thread2', 'created_utc': 1700000000}},
-                {'data': {'name': 'thread1', 'created_utc': 1700001000}},
-            ]
+    first_response.content = json_bytes(
+        {
+            'data': {
+                'children': [
+                    {'data': {'name': 'thread2', 'created_utc': 1700000000}},
+                    {'data': {'name': 'thread1', 'created_utc': 1700001000}},
+                ]
+            }
         }
-    }
+    )
 
     second_response = mock_response.__class__()
     second_response.status_code = 200
-    second_response.json.return_value = {
-        'data': {
-            'children': [
-                {'data': {'name': 'thread4', 'created_utc': 1699999000}},
-                {'data': {'name': 'thread3', 'created_utc': 1699998000}},
-            ]
+    second_response.content = json_bytes(
+        {
+            'data': {
+                'children': [
+                    {'data': {'name': 'thread4', 'created_utc': 1699999000}},
+                    {'data': {'name': 'thread3', 'created_utc': 1699998000}},
+                ]
+            }
         }
-    }
+    )
 
     # Third response has no children - this stops the loop
     third_response = mock_response.__class__()
     third_response.status_code = 200
-    third_response.json.return_value = {'data': {'children': []}}
+    third_response.content = json_bytes({'data': {'children': []}})
 
     # Use side_effect to return different responses for each call
     mock_get.side_effect = [first_response, second_response, third_response]
@@ -231,7 +248,7 @@ def test_reddit_extractor_batch_no_threads_on_first_call(mock_requests_get):
     """
     mock_get, mock_response = mock_requests_get
     mock_response.status_code = 200
-    mock_response.json.return_value = {'data': {'children': []}}
+    mock_response.content = json_bytes({'data': {'children': []}})
 
     extractor = RedditExtractor(token='mock_token_123', user_agent='mock_user_agent')
     threads = extractor.batch(subreddit='mock_subreddit', fullname='t3_12345', limit=2)
@@ -250,14 +267,16 @@ def test_reddit_extractor_batch_http_error(mock_requests_get):
     # First call succeeds
     first_response = mock_response.__class__()
     first_response.status_code = 200
-    first_response.json.return_value = {
-        'data': {
-            'children': [
-                {'data': {'name': 'thread1', 'created_utc': 1700000000}},
-                {'data': {'name': 'thread2', 'created_utc': 1700001000}},
-            ]
+    first_response.content = json_bytes(
+        {
+            'data': {
+                'children': [
+                    {'data': {'name': 'thread1', 'created_utc': 1700000000}},
+                    {'data': {'name': 'thread2', 'created_utc': 1700001000}},
+                ]
+            }
         }
-    }
+    )
 
     # Second call fails with 429 (Too Many Requests)
     error_response = mock_response.__class__()
@@ -275,3 +294,247 @@ def test_reddit_extractor_batch_http_error(mock_requests_get):
     assert '[429] Failed to fetch thread from subreddit: mock_subreddit' in str(
         exc_info.value
     )
+
+
+def test_reddit_extractor_fetch_updates_rate_limiter(mock_requests_get, mocker):
+    """Every response should feed its rate-limit headers to the limiter."""
+    mock_get, mock_response = mock_requests_get
+    mock_response.status_code = 200
+    mock_response.headers = {'X-Ratelimit-Remaining': '10'}
+    mock_response.content = json_bytes({'data': {'children': []}})
+    limiter = mocker.Mock()
+
+    extractor = RedditExtractor(
+        token='mock_token_123', user_agent='mock_user_agent', rate_limiter=limiter
+    )
+    extractor.fetch_thread_before(subreddit='mock_subreddit', fullname='t3_12345')
+
+    limiter.acquire.assert_called_once()
+    limiter.update.assert_called_once_with({'X-Ratelimit-Remaining': '10'})
+
+
+def test_reddit_extractor_uses_injected_session(mocker):
+    """A shared session should be reused for every request."""
+    session = mocker.Mock()
+    session.get.return_value.status_code = 200
+    session.get.return_value.content = json_bytes({'data': {'children': []}})
+
+    extractor = RedditExtractor(
+        token='mock_token_123',
+        user_agent='mock_user_agent',
+        session=session,
+        timeout=3.0,
+    )
+    extractor.batch(subreddit='mock_subreddit', fullname='t3_12345')
+    extractor.batch(subreddit='other_subreddit', fullname='t3_12345')
+
+    assert extractor.session is session
+    assert session.get.call_count == 2
+    assert session.get.call_args[1]['timeout'] == 3.0
+
+
+def test_reddit_extractor_iter_pages_is_lazy(mock_requests_get):
+    """iter_pages should only fetch the next page when it is consumed."""
+    mock_get, mock_response = mock_requests_get
+
+    first_response = mock_response.__class__()
+    first_response.status_code = 200
+    first_response.content = json_bytes(
+        {
+            'data': {
+                'children': [
+                    {'data': {'name': 'thread2'}},
+                    {'data': {'name': 'thread1'}},
+                ]
+            }
+        }
+    )
+    second_response = mock_response.__class__()
+    second_response.status_code = 200
+    second_response.content = json_bytes({'data': {'children': []}})
+
+    mock_get.side_effect = [first_response, second_response]
+
+    extractor = RedditExtractor(token='mock_token_123', user_agent='mock_user_agent')
+    pages = extractor.iter_pages(subreddit='mock_subreddit', fullname='t3_12345')
+
+    assert mock_get.call_count == 0
+    first_page = next(pages)
+    assert first_page['data']['children'][0]['data']['name'] == 'thread2'
+    assert mock_get.call_count == 1
+    assert list(pages) == []
+    assert mock_get.call_args[1]['params']['before'] == 'thread2'
+
+
+def test_reddit_extractor_refreshes_token_on_401(mock_requests_get, mocker):
+    """A 401 should invalidate the provider token and retry once."""
+    mock_get, mock_response = mock_requests_get
+
+    unauthorized = mock_response.__class__()
+    unauthorized.status_code = 401
+    ok = mock_response.__class__()
+    ok.status_code = 200
+    ok.content = json_bytes({'data': {'children': []}})
+    mock_get.side_effect = [unauthorized, ok]
+
+    provider = mocker.Mock()
+    provider.token.side_effect = ['expired_token', 'fresh_token']
+
+    extractor = RedditExtractor(
+        token=None, user_agent='mock_user_agent', token_provider=provider
+    )
+    response = extractor.fetch_thread_before('mock_subreddit', 't3_12345')
+
+    assert response == {'data': {'children': []}}
+    provider.invalidate.assert_called_once_with('expired_token')
+    assert mock_get.call_args[1]['headers']['Authorization'] == 'bearer fresh_token'
+
+
+def test_reddit_extractor_retries_transient_errors(mock_requests_get):
+    """With a retry policy, a 503 followed by a 200 should succeed."""
+    mock_get, mock_response = mock_requests_get
+
+    unavailable = mock_response.__class__()
+    unavailable.status_code = 503
+    unavailable.headers = {'Retry-After': '0'}
+    ok = mock_response.__class__()
+    ok.status_code = 200
+    ok.content = json_bytes({'data': {'children': []}})
+    mock_get.side_effect = [unavailable, ok]
+
+    extractor = RedditExtractor(
+        token='mock_token_123',
+        user_agent='mock_user_agent',
+        retry_policy=RetryPolicy(sleep=lambda seconds: None),
+    )
+
+    assert extractor.fetch_thread_before('mock_subreddit', 't3_12345') == {
+        'data': {'children': []}
+    }
+    assert mock_get.call_count == 2
+
+
+def test_reddit_extractor_does_not_retry_client_errors(mock_requests_get):
+    mock_get, mock_response = mock_requests_get
+    mock_response.status_code = 403
+
+    extractor = RedditExtractor(
+        token='mock_token_123',
+        user_agent='mock_user_agent',
+        retry_policy=RetryPolicy(sleep=lambda seconds: None),
+    )
+
+    with pytest.raises(RedditAPIError) as exc_info:
+        extractor.fetch_thread_before('mock_subreddit', 't3_12345')
+
+    assert exc_info.value.status_code == 403
+    assert mock_get.call_count == 1
+
+
+def comment(name, replies=''):
+    return {'kind': 't1', 'data': {'name': name, 'replies': replies}}
+
+
+def more(*ids):
+    return {'kind': 'more', 'data': {'children': list(ids)}}
+
+
+def test_reddit_extractor_fetch_comments(mock_requests_get):
+    mock_get, mock_response = mock_requests_get
+    mock_response.status_code = 200
+    mock_response.content = json_bytes([{'data': {}}, {'data': {'children': []}}])
+
+    extractor = RedditExtractor(token='mock_token_123', user_agent='mock_user_agent')
+    extractor.fetch_comments('mock_subreddit', 't3_abc')
+
+    assert (
+        mock_get.call_args[0][0]
+        == 'https://oauth.reddit.com/r/mock_subreddit/comments/abc'
+    )
+
+
+def test_reddit_extractor_fetch_comment_tree_expands_more_in_batches(
+    mock_requests_get, mocker
+):
+    """'more' stubs, including nested ones, are expanded 100 ids per call."""
+    mock_get, _ = mock_requests_get
+    ids = [f'c{i}' for i in range(150)]
+    listing = [
+        {'data': {}},
+        {
+            'data': {
+                'children': [
+                    comment(
+                        't1_a',
+                        replies={'data': {'children': [more(*ids[100:])]}},
+                    ),
+                    more(*ids[:100]),
+                ]
+            }
+        },
+    ]
+
+    def response(payload):
+        return mocker.Mock(status_code=200, content=json_bytes(payload), headers={})
+
+    def things(*items):
+        return response({'json': {'data': {'things': list(items)}}})
+
+    mock_get.side_effect = [
+        response(listing),
+        things(comment('t1_x'), more('late')),
+        things(comment('t1_y')),
+    ]
+
+    extractor = RedditExtractor(token='mock_token_123', user_agent='mock_user_agent')
+    tree = extractor.fetch_comment_tree('mock_subreddit', 'abc')
+
+    assert tree['article'] == 't3_abc'
+    assert [thing['data']['name'] for thing in tree['more']] == ['t1_x', 't1_y']
+    more_calls = mock_get.call_args_list[1:]
+    assert [len(call[1]['params']['children'].split(',')) for call in more_calls] == [
+        100,
+        51,
+    ]
+    assert all(call[1]['params']['link_id'] == 't3_abc' for call in more_calls)
+
+
+def test_reddit_extractor_fetch_thread_after(mock_requests_get):
+    mock_get, mock_response = mock_requests_get
+    mock_response.status_code = 200
+    mock_response.content = json_bytes({'data': {'children': []}})
+
+    extractor = RedditExtractor(token='mock_token_123', user_agent='mock_user_agent')
+    extractor.fetch_thread_after('mock_subreddit', 't3_12345')
+
+    assert mock_get.call_args[1]['params'] == {'after': 't3_12345', 'limit': 100}
+
+
+def test_reddit_extractor_scan_newer_than_stops_at_anchor(mocker):
+    extractor = RedditExtractor(token='mock_token_123', user_agent='mock_user_agent')
+
+    def page(*names, after='next'):
+        children = [{'data': {'name': name, 'created_utc': 0}} for name in names]
+        return {'data': {'after': after, 'children': children}}
+
+    fetch = mocker.patch.object(
+        extractor,
+        'fetch_thread_after',
+        side_effect=[page('t3_a50', 't3_a40'), page('t3_a35', 't3_a30', 't3_a20')],
+    )
+
+    result = extractor.scan_newer_than('mock_subreddit', 't3_a30')
+
+    assert [
+        [child['data']['name'] for child in page['data']['children']] for page in result
+    ] == [['t3_a50', 't3_a40'], ['t3_a35']]
+    assert fetch.call_args_list[1].kwargs['fullname'] == 't3_a40'
+
+
+def test_reddit_extractor_anchor_exists(mocker):
+    extractor = RedditExtractor(token='mock_token_123', user_agent='mock_user_agent')
+    mocker.patch.object(
+        extractor, 'fetch_thread_after', return_value={'data': {'children': []}}
+    )
+
+    assert not extractor.anchor_exists('mock_subreddit', 't3_gone')
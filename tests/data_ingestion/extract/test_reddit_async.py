@@ -0,0 +1,120 @@
+import asyncio
+import json
+
+import pytest
+from data_ingestion.extract.reddit_async import AsyncRedditExtractor
+
+
+class FakeResponse:
+    def __init__(self, status, payload=None, headers=None):
+        self.status = status
+        self.payload = payload
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def read(self):
+        return json.dumps(self.payload).encode('utf-8')
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, headers=None, params=None):
+        self.calls.append({'url': url, 'headers': headers, 'params': params})
+        return self.responses.pop(0)
+
+
+def page(*names):
+    return {'data': {'children': [{'data': {'name': name}} for name in names]}}
+
+
+# ====================================================
+# ---------- Tests for AsyncRedditExtractor ----------
+# ====================================================
+
+
+def test_async_extractor_fetch_thread_before_success():
+    session = FakeSession([FakeResponse(200, page('thread1'))])
+    extractor = AsyncRedditExtractor(
+        token='mock_token_123', user_agent='mock_user_agent', session=session
+    )
+
+    response = asyncio.run(
+        extractor.fetch_thread_before('mock_subreddit', 't3_12345', limit=2)
+    )
+
+    assert response['data']['children'][0]['data']['name'] == 'thread1'
+    assert session.calls == [
+        {
+            'url': 'https://oauth.reddit.com/r/mock_subreddit/new',
+            'headers': {
+                'Authorization': 'bearer mock_token_123',
+                'User-Agent': 'mock_user_agent',
+            },
+            'params': {'limit': '2', 'before': 't3_12345'},
+        }
+    ]
+
+
+def test_async_extractor_fetch_thread_before_failure():
+    session = FakeSession([FakeResponse(500)])
+    extractor = AsyncRedditExtractor(
+        token='mock_token_123', user_agent='mock_user_agent', session=session
+    )
+
+    with pytest.raises(Exception) as exc_info:
+        asyncio.run(extractor.fetch_thread_before('mock_subreddit', 't3_12345'))
+
+    assert '[500] Failed to fetch thread from subreddit: mock_subreddit' in str(
+        exc_info.value
+    )
+
+
+def test_async_extractor_batch_returns_newest_page_first():
+    session = FakeSession(
+        [
+            FakeResponse(200, page('thread2', 'thread1')),
+            FakeResponse(200, page('thread4', 'thread3')),
+            FakeResponse(200, page()),
+        ]
+    )
+    extractor = AsyncRedditExtractor(
+        token='mock_token_123', user_agent='mock_user_agent', session=session
+    )
+
+    threads = asyncio.run(extractor.batch('mock_subreddit', 't3_12345', limit=2))
+
+    assert [t['data']['children'][0]['data']['name'] for t in threads] == [
+        'thread4',
+        'thread2',
+    ]
+    assert [call['params']['before'] for call in session.calls] == [
+        't3_12345',
+        'thread2',
+        'thread4',
+    ]
+
+
+def test_async_extractor_feeds_rate_limiter(mocker):
+    limiter = mocker.Mock()
+    limiter.reserve.return_value = 0.0
+    headers = {'X-Ratelimit-Remaining': '5'}
+    session = FakeSession([FakeResponse(200, page(), headers=headers)])
+    extractor = AsyncRedditExtractor(
+        token='mock_token_123',
+        user_agent='mock_user_agent',
+        session=session,
+        rate_limiter=limiter,
+    )
+
+    asyncio.run(extractor.fetch_thread_before('mock_subreddit', ''))
+
+    limiter.reserve.assert_called_once()
+    limiter.update.assert_called_once_with(headers)
@@ -0,0 +1,96 @@
+import json
+import os
+
+import pytest
+from data_ingestion.extract.token_provider import RedditTokenProvider
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def mock_auth(mocker):
+    auth = mocker.Mock()
+    auth.client_id = 'mock_client_id'
+    auth.username = 'mock_username'
+    auth.request_token.side_effect = [
+        {'access_token': f'token_{i}', 'expires_in': 3600} for i in range(1, 10)
+    ]
+    return auth
+
+
+# ====================================================
+# ---------- Tests for RedditTokenProvider -----------
+# ====================================================
+
+
+def test_token_provider_caches_token(mock_auth, clock):
+    provider = RedditTokenProvider(auth=mock_auth, clock=clock)
+
+    assert provider.token() == 'token_1'
+    clock.now += 3000
+    assert provider.token() == 'token_1'
+    assert mock_auth.request_token.call_count == 1
+
+
+def test_token_provider_refreshes_before_expiry(mock_auth, clock):
+    provider = RedditTokenProvider(auth=mock_auth, refresh_margin=300, clock=clock)
+
+    provider.token()
+    clock.now += 3301
+
+    assert provider.token() == 'token_2'
+
+
+def test_token_provider_invalidate_ignores_stale_token(mock_auth, clock):
+    provider = RedditTokenProvider(auth=mock_auth, clock=clock)
+    provider.token()
+
+    provider.invalidate('some_older_token')
+    assert provider.token() == 'token_1'
+
+    provider.invalidate('token_1')
+    assert provider.token() == 'token_2'
+
+
+def test_token_provider_disk_cache_roundtrip(mock_auth, clock, tmp_path):
+    cache_path = tmp_path / 'cache' / 'token.json'
+
+    RedditTokenProvider(auth=mock_auth, cache_path=str(cache_path), clock=clock).token()
+
+    assert os.stat(cache_path).st_mode & 0o777 == 0o600
+    second = RedditTokenProvider(
+        auth=mock_auth, cache_path=str(cache_path), clock=clock
+    )
+    assert second.token() == 'token_1'
+    assert mock_auth.request_token.call_count == 1
+
+
+def test_token_provider_ignores_world_readable_cache(mock_auth, clock, tmp_path):
+    cache_path = tmp_path / 'token.json'
+    cache_path.write_text(
+        json.dumps(
+            {
+                'owner': 'mock_client_id:mock_username',
+                'access_token': 'leaked',
+                'expires_at': clock.now + 3600,
+            }
+        )
+    )
+    os.chmod(cache_path, 0o644)
+
+    provider = RedditTokenProvider(
+        auth=mock_auth, cache_path=str(cache_path), clock=clock
+    )
+
+    assert provider.token() == 'token_1'
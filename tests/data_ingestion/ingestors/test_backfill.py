@@ -0,0 +1,134 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from data_ingestion.ingestors.backfill import RedditBackfiller, in_shard
+from data_ingestion.load.checkpoint import BackfillState
+from data_ingestion.load.compression import Codec
+
+
+def page(*posts, after='next'):
+    return {
+        'data': {
+            'after': after,
+            'children': [
+                {'data': {'name': name, 'created_utc': created}}
+                for name, created in posts
+            ],
+        }
+    }
+
+
+@pytest.fixture
+def mock_extractor():
+    return MagicMock()
+
+
+@pytest.fixture
+def mock_storage():
+    storage = MagicMock()
+    storage.codec = Codec()
+    return storage
+
+
+@pytest.fixture
+def states():
+    saved = {}
+    store = MagicMock()
+    store.get.side_effect = lambda subreddit: saved.get(subreddit)
+    store.put.side_effect = lambda subreddit, state: saved.__setitem__(
+        subreddit, BackfillState(**vars(state))
+    )
+    store.saved = saved
+    return store
+
+
+# ==================================================
+# ---------- Tests for RedditBackfiller ------------
+# ==================================================
+
+
+def test_backfill_walks_after_until_the_end(mock_extractor, mock_storage, states):
+    mock_extractor.fetch_thread_after.side_effect = [
+        page(('t3_c', 300), ('t3_b', 200)),
+        page(('t3_a', 100), after=None),
+    ]
+    backfiller = RedditBackfiller(mock_extractor, mock_storage, states)
+
+    state = backfiller.backfill_subreddit('Bitcoin')
+
+    assert state == states.saved['Bitcoin']
+    assert (state.after, state.pages, state.posts, state.done) == ('t3_a', 2, 3, True)
+    assert [
+        call.kwargs['fullname']
+        for call in mock_extractor.fetch_thread_after.call_args_list
+    ] == ['', 't3_b']
+    keys = [call.kwargs['s3_key'] for call in mock_storage.upload.call_args_list]
+    assert all(key.startswith('raw/reddit_backfill/Bitcoin/') for key in keys)
+    assert 'h-t3_c-t-t3_b' in keys[0]
+
+
+def test_backfill_stops_at_date_bound(mock_extractor, mock_storage, states):
+    mock_extractor.fetch_thread_after.return_value = page(('t3_b', 200), ('t3_a', 50))
+    backfiller = RedditBackfiller(mock_extractor, mock_storage, states, until=100)
+
+    state = backfiller.backfill_subreddit('Bitcoin')
+
+    assert state.done
+    assert state.posts == 1
+    uploaded = mock_storage.upload.call_args.kwargs['data']
+    assert len(uploaded[0]['data']['children']) == 1
+
+
+def test_backfill_resumes_from_saved_state(mock_extractor, mock_storage, states):
+    states.saved['Bitcoin'] = BackfillState(after='t3_b', pages=1, posts=2)
+    mock_extractor.fetch_thread_after.return_value = page(('t3_a', 100), after=None)
+    backfiller = RedditBackfiller(mock_extractor, mock_storage, states)
+
+    state = backfiller.backfill_subreddit('Bitcoin')
+
+    mock_extractor.fetch_thread_after.assert_called_once_with(
+        subreddit='Bitcoin', fullname='t3_b', limit=100
+    )
+    assert (state.pages, state.posts) == (2, 3)
+
+
+def test_backfill_persists_after_every_page(mock_extractor, mock_storage, states):
+    mock_extractor.fetch_thread_after.side_effect = [
+        page(('t3_c', 300)),
+        Exception('boom'),
+    ]
+    backfiller = RedditBackfiller(mock_extractor, mock_storage, states)
+
+    with pytest.raises(Exception, match='boom'):
+        backfiller.backfill_subreddit('Bitcoin')
+
+    assert states.saved['Bitcoin'].after == 't3_c'
+    assert not states.saved['Bitcoin'].done
+
+
+def test_backfill_respects_depth_cap(mock_extractor, mock_storage, states):
+    mock_extractor.fetch_thread_after.return_value = page(('t3_c', 300))
+    backfiller = RedditBackfiller(mock_extractor, mock_storage, states, max_pages=2)
+
+    state = backfiller.backfill_subreddit('Bitcoin')
+
+    assert mock_extractor.fetch_thread_after.call_count == 2
+    assert not state.done
+
+
+def test_backfill_skips_completed_subreddits(mock_extractor, mock_storage, states):
+    states.saved['Bitcoin'] = BackfillState(after='t3_a', done=True)
+    backfiller = RedditBackfiller(mock_extractor, mock_storage, states)
+
+    backfiller.backfill_subreddit('Bitcoin')
+
+    mock_extractor.fetch_thread_after.assert_not_called()
+
+
+def test_shards_partition_subreddits():
+    subreddits = ['Bitcoin', 'btc', 'Ethereum', 'dogecoin', 'ethtrader']
+
+    shards = [[s for s in subreddits if in_shard(s, i, 3)] for i in range(3)]
+
+    assert sorted(sum(shards, [])) == sorted(subreddits)
@@ -0,0 +1,131 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from data_ingestion.ingestors.comments import RedditCommentIngestor
+from data_ingestion.load.compression import Codec
+from data_ingestion.utils import metrics
+
+
+@pytest.fixture
+def mock_extractor():
+    extractor = MagicMock()
+    extractor.fetch_comment_tree.side_effect = lambda subreddit, article: {
+        'article': article
+    }
+    return extractor
+
+
+@pytest.fixture
+def mock_storage():
+    storage = MagicMock()
+    storage.codec = Codec()
+    return storage
+
+
+@pytest.fixture
+def ingestor(mock_extractor, mock_storage):
+    return RedditCommentIngestor(
+        extractor=mock_extractor, storage=mock_storage, max_workers=2
+    )
+
+
+# =======================================================
+# ---------- Tests for RedditCommentIngestor ------------
+# =======================================================
+
+
+def test_ingest_streams_trees_in_post_order(ingestor, mock_storage):
+    writer = mock_storage.open_writer.return_value.__enter__.return_value
+    writer.items = 3
+
+    s3_key = ingestor.ingest('Bitcoin', ['t3_c', 't3_b', 't3_a'])
+
+    assert s3_key.startswith('raw/reddit_comments/Bitcoin/')
+    assert 'h-t3_c-t-t3_a' in s3_key
+    mock_storage.open_writer.assert_called_once_with(s3_key)
+    assert [call[0][0]['article'] for call in writer.write.call_args_list] == [
+        't3_c',
+        't3_b',
+        't3_a',
+    ]
+
+
+def test_ingest_skips_failed_trees(ingestor, mock_extractor, mock_storage):
+    def fetch(subreddit, article):
+        if article == 't3_b':
+            raise Exception('boom')
+        return {'article': article}
+
+    mock_extractor.fetch_comment_tree.side_effect = fetch
+    writer = mock_storage.open_writer.return_value.__enter__.return_value
+    writer.items = 1
+
+    ingestor.ingest('Bitcoin', ['t3_b', 't3_a'])
+
+    writer.write.assert_called_once_with({'article': 't3_a'})
+
+
+def test_ingest_keeps_metrics_scope_in_workers(ingestor, mock_extractor):
+    metrics.REGISTRY.reset()
+
+    def fetch(subreddit, article):
+        metrics.incr('comment_trees')
+        return {'article': article}
+
+    mock_extractor.fetch_comment_tree.side_effect = fetch
+
+    with metrics.scope('Bitcoin'):
+        ingestor.ingest('Bitcoin', ['t3_b', 't3_a'])
+
+    counter = metrics.REGISTRY.summary()['counters']['comment_trees']
+    assert counter['subreddits'] == {'Bitcoin': 2}
+
+
+def test_ingest_without_articles_does_nothing(ingestor, mock_storage):
+    assert ingestor.ingest('Bitcoin', []) is None
+    mock_storage.open_writer.assert_not_called()
+
+
+def test_ingest_schedules_refetch(mock_extractor, mock_storage):
+    mock_storage.read.return_value = None
+    writer = mock_storage.open_writer.return_value.__enter__.return_value
+    writer.items = 1
+    ingestor = RedditCommentIngestor(
+        extractor=mock_extractor, storage=mock_storage, refetch_after=3600
+    )
+
+    with patch('time.time', return_value=1000.0):
+        ingestor.ingest('Bitcoin', ['t3_b', 't3_a'])
+
+    state = mock_storage.upload.call_args.kwargs
+    assert state['s3_key'] == 'state/reddit_comments/Bitcoin/_refetch.json'
+    assert state['data'] == [{'articles': ['t3_b', 't3_a'], 'due': 4600.0}]
+
+
+def test_refetch_due_fetches_due_batches_once(mock_extractor, mock_storage):
+    mock_storage.read.return_value = json.dumps(
+        [
+            {'articles': ['t3_b', 't3_a'], 'due': 4600.0},
+            {'articles': ['t3_c'], 'due': 9000.0},
+        ]
+    ).encode()
+    writer = mock_storage.open_writer.return_value.__enter__.return_value
+    writer.items = 2
+    ingestor = RedditCommentIngestor(
+        extractor=mock_extractor, storage=mock_storage, refetch_after=3600
+    )
+
+    assert ingestor.refetch_due('Bitcoin', now=5000.0) == 1
+    assert mock_storage.upload.call_args.kwargs['data'] == [
+        {'articles': ['t3_c'], 'due': 9000.0}
+    ]
+    assert [call[0][0]['article'] for call in writer.write.call_args_list] == [
+        't3_b',
+        't3_a',
+    ]
+
+    # Nothing else is due before 9000: the state is not read again.
+    assert ingestor.refetch_due('Bitcoin', now=6000.0) == 0
+    mock_storage.read.assert_called_once()
@@ -0,0 +1,91 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from data_ingestion.ingestors.pipeline import IngestionPipeline
+from data_ingestion.ingestors.reddit import RedditIngestor
+from data_ingestion.load.compression import Codec
+
+
+def listing(*names):
+    return [{'data': {'children': [{'data': {'name': name}} for name in names]}}]
+
+
+@pytest.fixture
+def mock_extractor():
+    extractor = MagicMock()
+    extractor.batch.side_effect = lambda subreddit, fullname, limit: listing(
+        f't3_{subreddit.lower()}2', f't3_{subreddit.lower()}1'
+    )
+    return extractor
+
+
+@pytest.fixture
+def mock_storage():
+    storage = MagicMock()
+    storage.codec = Codec()
+    storage.latest_key.return_value = None
+    storage.encode.side_effect = lambda data: repr(data).encode()
+    return storage
+
+
+@pytest.fixture
+def ingestor(mock_extractor, mock_storage):
+    return RedditIngestor(extractor=mock_extractor, storage=mock_storage)
+
+
+# =================================================
+# ---------- Tests for IngestionPipeline ----------
+# =================================================
+
+
+def test_pipeline_stores_every_subreddit(ingestor, mock_storage):
+    subreddits = ['Bitcoin', 'btc', 'Ethereum', 'dogecoin', 'ethtrader']
+
+    IngestionPipeline(ingestor, extract_workers=2, queue_size=1).run(subreddits)
+
+    assert mock_storage.encode.call_count == 5
+    keys = [call[0][0] for call in mock_storage.upload_encoded.call_args_list]
+    assert sorted(key.split('/')[2] for key in keys) == sorted(subreddits)
+    mock_storage.upload.assert_not_called()
+
+
+def test_pipeline_uploads_encoded_bodies(ingestor, mock_storage):
+    IngestionPipeline(ingestor).run(['Bitcoin'])
+
+    s3_key, body = mock_storage.upload_encoded.call_args[0]
+    assert 'h-t3_bitcoin2-t-t3_bitcoin1' in s3_key
+    assert body == repr(listing('t3_bitcoin2', 't3_bitcoin1')).encode()
+
+
+def test_pipeline_isolates_errors(ingestor, mock_extractor, mock_storage):
+    def batch(subreddit, fullname, limit):
+        if subreddit == 'Bitcoin':
+            raise Exception('boom')
+        return listing('t3_a2', 't3_a1')
+
+    mock_extractor.batch.side_effect = batch
+
+    IngestionPipeline(ingestor).run(['Bitcoin', 'btc'])
+
+    assert mock_storage.upload_encoded.call_count == 1
+
+
+def test_pipeline_overlaps_extraction_with_upload(
+    ingestor, mock_extractor, mock_storage
+):
+    """An upload can run while another subreddit is still being paginated."""
+    uploading = threading.Event()
+
+    def batch(subreddit, fullname, limit):
+        if subreddit == 'slow':
+            assert uploading.wait(timeout=5)
+        return listing(f't3_{subreddit}')
+
+    mock_extractor.batch.side_effect = batch
+    mock_storage.upload_encoded.side_effect = lambda key, body: uploading.set()
+
+    IngestionPipeline(ingestor, extract_workers=2).run(['slow', 'fast'])
+
+    assert mock_storage.upload_encoded.call_count == 2
@@ -0,0 +1,67 @@
+import pytest
+
+from data_ingestion.ingestors.planner import RequestPlanner
+from data_ingestion.load.checkpoint import Checkpoint
+
+
+@pytest.fixture
+def planner():
+    return RequestPlanner(min_limit=25, max_limit=100, headroom=1.5)
+
+
+# ==================================================
+# ---------- Tests for RequestPlanner --------------
+# ==================================================
+
+
+def test_plan_without_checkpoint_uses_largest_page(planner):
+    plan = planner.plan('Bitcoin', None)
+
+    assert plan.limit == 100
+    assert plan.expected_requests == 2
+
+
+def test_plan_quiet_subreddit_keeps_small_pages(planner):
+    checkpoint = Checkpoint(key='k', updated_at=1000.0, velocity=0.001)
+
+    plan = planner.plan('btc', checkpoint, now=1000.0 + 3600)
+
+    assert plan.expected_posts == 4
+    assert plan.limit == 25
+    assert plan.expected_requests == 2
+
+
+def test_plan_busy_subreddit_uses_full_pages(planner):
+    checkpoint = Checkpoint(key='k', updated_at=0.0, velocity=0.1)
+
+    plan = planner.plan('CryptoCurrency', checkpoint, now=3000.0)
+
+    assert plan.expected_posts == 300
+    assert plan.limit == 100
+    assert plan.expected_requests == 4
+
+
+def test_plan_sizes_page_to_the_backlog(planner):
+    checkpoint = Checkpoint(key='k', updated_at=0.0, velocity=0.01)
+
+    plan = planner.plan('Ethereum', checkpoint, now=4000.0)
+
+    assert plan.expected_posts == 40
+    assert plan.limit == 60
+    assert plan.expected_requests == 2
+
+
+def test_plan_caps_expected_posts_at_listing_depth(planner):
+    checkpoint = Checkpoint(key='k', updated_at=0.0, velocity=10.0)
+
+    plan = planner.plan('Bitcoin', checkpoint, now=86400.0)
+
+    assert plan.expected_posts == RequestPlanner.LISTING_CAP
+    assert plan.expected_requests == 11
+
+
+def test_plan_uses_default_velocity_when_unknown():
+    planner = RequestPlanner(default_velocity=0.05)
+    checkpoint = Checkpoint(key='k', updated_at=0.0)
+
+    assert planner.plan('Bitcoin', checkpoint, now=1000.0).expected_posts == 50
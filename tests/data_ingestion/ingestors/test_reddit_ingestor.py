@@ -1,6 +1,15 @@
 import pytest
+from datetime import datetime
 from unittest.mock import MagicMock, patch
+from data_ingestion.load.checkpoint import Checkpoint
+from data_ingestion.load.compression import Codec
+from data_ingestion.ingestors.planner import RequestPlanner
 from data_ingestion.ingestors.reddit import RedditIngestor
+from data_ingestion.load.dedup import SeenIndex
+from data_ingestion.load.spool import LocalSpool, SpoolRecord
+from data_ingestion.utils import json_codec
+from data_ingestion.utils.bloom import BloomFilter
+from data_ingestion.utils.profiling import Profiler
 
 
 @pytest.fixture
@@ -10,7 +19,9 @@ def mock_extractor():
 
 @pytest.fixture
 def mock_storage():
-    return MagicMock()
+    storage = MagicMock()
+    storage.codec = Codec()
+    return storage
 
 
 @pytest.fixture
@@ -104,3 +115,602 @@ def test_run_orchestration(ingestor):
         assert mock_ingest.call_count == 2
         mock_ingest.assert_any_call('Bitcoin')
         mock_ingest.assert_any_call('Ethereum')
+
+
+def test_run_concurrent_orchestration(ingestor):
+    """Should ingest every subreddit when running with a worker pool."""
+    with patch.object(ingestor, 'ingest_subreddit') as mock_ingest:
+        subreddits = ['Bitcoin', 'Ethereum', 'dogecoin', 'btc']
+        ingestor.run(subreddits, max_workers=3)
+
+        assert mock_ingest.call_count == 4
+        for subreddit in subreddits:
+            mock_ingest.assert_any_call(subreddit)
+
+
+def test_run_concurrent_isolates_errors(ingestor):
+    """A failing subreddit should not stop the others from being ingested."""
+
+    def ingest(subreddit):
+        if subreddit == 'Bitcoin':
+            raise Exception('boom')
+
+    with patch.object(ingestor, 'ingest_subreddit', side_effect=ingest) as mock_ingest:
+        ingestor.run(['Bitcoin', 'Ethereum', 'btc'], max_workers=2)
+
+        assert mock_ingest.call_count == 3
+
+
+def test_ingest_subreddit_streaming(mock_extractor, mock_storage):
+    """Streaming mode should write pages as they arrive and move to the final key."""
+    ingestor = RedditIngestor(
+        extractor=mock_extractor, storage=mock_storage, streaming=True
+    )
+    mock_storage.latest_key.return_value = None
+    pages = [
+        {
+            'data': {
+                'children': [{'data': {'name': 't3_b'}}, {'data': {'name': 't3_a'}}]
+            }
+        },
+        {
+            'data': {
+                'children': [{'data': {'name': 't3_d'}}, {'data': {'name': 't3_c'}}]
+            }
+        },
+    ]
+    mock_extractor.iter_pages.return_value = iter(pages)
+    writer = mock_storage.open_writer.return_value.__enter__.return_value
+
+    ingestor.ingest_subreddit('Bitcoin')
+
+    mock_extractor.batch.assert_not_called()
+    assert writer.write.call_count == 2
+    staging_key, s3_key = mock_storage.move.call_args[0]
+    assert staging_key.startswith('tmp/reddit/Bitcoin/')
+    assert 'h-t3_d-t-t3_a' in s3_key
+    assert mock_storage.open_writer.call_args.kwargs['metadata'] == {
+        'page-order': 'oldest-first'
+    }
+
+
+def test_ingest_subreddit_streaming_drops_stored_threads(mock_extractor, mock_storage):
+    """Without a checkpoint, threads already stored (e.g. backfilled) are dropped."""
+    index = SeenIndex(BloomFilter.for_capacity(1000))
+    for name in ('t3_a10', 't3_a20', 't3_a30'):
+        index.add(name)
+    seen = MagicMock()
+    seen.get.return_value = index
+    ingestor = RedditIngestor(
+        extractor=mock_extractor, storage=mock_storage, streaming=True, seen=seen
+    )
+    mock_storage.latest_key.return_value = None
+    mock_extractor.iter_pages.return_value = iter(
+        [
+            {
+                'data': {
+                    'children': [child('Bitcoin', 't3_a20'), child('Bitcoin', 't3_a10')]
+                }
+            },
+            {
+                'data': {
+                    'children': [child('Bitcoin', 't3_a40'), child('Bitcoin', 't3_a30')]
+                }
+            },
+        ]
+    )
+    writer = mock_storage.open_writer.return_value.__enter__.return_value
+
+    assert ingestor.ingest_subreddit('Bitcoin') == 1
+
+    writer.write.assert_called_once_with(
+        {'data': {'children': [child('Bitcoin', 't3_a40')]}}
+    )
+    assert 'h-t3_a40-t-t3_a40' in mock_storage.move.call_args[0][1]
+
+
+def test_ingest_subreddit_streaming_no_data(mock_extractor, mock_storage):
+    ingestor = RedditIngestor(
+        extractor=mock_extractor, storage=mock_storage, streaming=True
+    )
+    mock_storage.latest_key.return_value = None
+    mock_extractor.iter_pages.return_value = iter([])
+    writer = mock_storage.open_writer.return_value.__enter__.return_value
+
+    ingestor.ingest_subreddit('Bitcoin')
+
+    writer.abort.assert_called_once()
+    mock_storage.move.assert_not_called()
+
+
+def test_get_last_checkpoint_uses_pointer(mock_extractor, mock_storage):
+    """With a checkpoint store, the prefix listing should not be used."""
+    checkpoints = MagicMock()
+    checkpoints.get.return_value.key = (
+        'raw/reddit/Bitcoin/2026-04-15/h-t3_abc123-t-t3_xyz789-tm-123456789.json'
+    )
+    ingestor = RedditIngestor(
+        extractor=mock_extractor, storage=mock_storage, checkpoints=checkpoints
+    )
+
+    assert ingestor._get_last_checkpoint('Bitcoin') == 't3_abc123'
+    mock_storage.latest_key.assert_not_called()
+
+
+def test_get_last_checkpoint_rebuilds_missing_pointer(mock_extractor, mock_storage):
+    """Without a pointer, the listing is used and the pointer written back."""
+    checkpoints = MagicMock()
+    checkpoints.get.return_value = None
+    latest = 'raw/reddit/Bitcoin/2026-04-15/h-t3_abc123-t-t3_xyz789-tm-123456789.json'
+    mock_storage.latest_key.return_value = latest
+    ingestor = RedditIngestor(
+        extractor=mock_extractor, storage=mock_storage, checkpoints=checkpoints
+    )
+
+    assert ingestor._get_last_checkpoint('Bitcoin') == 't3_abc123'
+    assert checkpoints.put.call_args[0][1].key == latest
+
+
+def test_ingest_subreddit_updates_pointer(mock_extractor, mock_storage):
+    checkpoints = MagicMock()
+    checkpoints.get.return_value = None
+    mock_storage.latest_key.return_value = None
+    mock_extractor.batch.return_value = [
+        {'data': {'children': [{'data': {'name': 't3_new_head'}}]}},
+    ]
+    ingestor = RedditIngestor(
+        extractor=mock_extractor, storage=mock_storage, checkpoints=checkpoints
+    )
+
+    ingestor.ingest_subreddit('Bitcoin')
+
+    uploaded_key = mock_storage.upload.call_args[1]['s3_key']
+    checkpoints.put.assert_called_once()
+    assert checkpoints.put.call_args[0][1].key == uploaded_key
+
+
+def child(subreddit, name):
+    return {'data': {'subreddit': subreddit, 'name': name}}
+
+
+def test_ingest_group_demultiplexes_children(ingestor, mock_extractor, mock_storage):
+    """A combined listing should be split into per-subreddit uploads."""
+    heads = {
+        'raw/reddit/btc/': 'raw/reddit/btc/2026-04-15/h-t3_a10-t-t3_a01-tm-1.json',
+        'raw/reddit/dogecoin/': 'raw/reddit/dogecoin/2026-04-15/h-t3_a20-t-t3_a02-tm-1.json',
+    }
+    mock_storage.latest_key.side_effect = lambda prefix: heads[prefix]
+    mock_extractor.batch.return_value = [
+        {'data': {'children': [child('btc', 't3_a30'), child('Dogecoin', 't3_a25')]}},
+        {'data': {'children': [child('dogecoin', 't3_a15'), child('btc', 't3_a12')]}},
+    ]
+
+    ingestor.ingest_group(['btc', 'dogecoin'])
+
+    mock_extractor.batch.assert_called_once_with(
+        subreddit='btc+dogecoin', fullname='t3_a10', limit=25
+    )
+    uploads = {
+        call.kwargs['s3_key'].split('/')[2]: call.kwargs
+        for call in mock_storage.upload.call_args_list
+    }
+    assert 'h-t3_a30-t-t3_a12' in uploads['btc']['s3_key']
+    # t3_a15 is older than dogecoin's own checkpoint and must be dropped
+    assert 'h-t3_a25-t-t3_a25' in uploads['dogecoin']['s3_key']
+    assert len(uploads['dogecoin']['data']) == 1
+
+
+def test_ingest_group_without_checkpoint_falls_back(
+    ingestor, mock_extractor, mock_storage
+):
+    mock_storage.latest_key.return_value = None
+    mock_extractor.batch.return_value = []
+
+    ingestor.ingest_group(['btc', 'dogecoin'])
+
+    assert mock_extractor.batch.call_count == 2
+    mock_extractor.batch.assert_any_call(subreddit='btc', fullname='', limit=25)
+
+
+def test_ingest_group_isolates_member_errors(ingestor, mock_extractor, mock_storage):
+    """A member failing to store must not keep the others from uploading."""
+    mock_storage.latest_key.side_effect = lambda prefix: (
+        f'{prefix}2026-04-15/h-t3_a10-t-t3_a01-tm-1.json'
+    )
+    mock_extractor.batch.return_value = [
+        {
+            'data': {
+                'children': [
+                    child('a', 't3_a40'),
+                    child('b', 't3_a30'),
+                    child('c', 't3_a20'),
+                ]
+            }
+        }
+    ]
+
+    def upload(s3_key, data):
+        if s3_key.startswith('raw/reddit/a/'):
+            raise Exception('S3 down')
+        return True
+
+    mock_storage.upload.side_effect = upload
+
+    ingestor.ingest_group(['a', 'b', 'c'])
+
+    uploaded = {
+        call.kwargs['s3_key'].split('/')[2]
+        for call in mock_storage.upload.call_args_list
+    }
+    assert uploaded == {'a', 'b', 'c'}
+
+
+def test_ingest_group_recovers_lost_anchor(mock_extractor, mock_storage):
+    """An empty group listing with a lost anchor falls back per member."""
+    heads = {
+        'raw/reddit/btc/': 'raw/reddit/btc/2026-04-15/h-t3_a10-t-t3_a01-tm-1.json',
+        'raw/reddit/dogecoin/': 'raw/reddit/dogecoin/2026-04-15/h-t3_a20-t-t3_a02-tm-1.json',
+    }
+    mock_storage.latest_key.side_effect = lambda prefix: heads[prefix]
+    mock_extractor.anchor_exists.side_effect = lambda subreddit, name: name != 't3_a10'
+    mock_extractor.batch.side_effect = lambda subreddit, fullname, limit: (
+        [{'data': {'children': [child('dogecoin', 't3_a25')]}}]
+        if subreddit == 'dogecoin'
+        else []
+    )
+    mock_extractor.scan_newer_than.return_value = [
+        {'data': {'children': [child('btc', 't3_a30')]}}
+    ]
+    ingestor = RedditIngestor(
+        extractor=mock_extractor, storage=mock_storage, anchor_recovery=True
+    )
+
+    ingestor.ingest_group(['btc', 'dogecoin'])
+
+    mock_extractor.anchor_exists.assert_any_call('btc+dogecoin', 't3_a10')
+    keys = sorted(call.kwargs['s3_key'] for call in mock_storage.upload.call_args_list)
+    assert 'h-t3_a30-t-t3_a30' in keys[0]
+    assert 'h-t3_a25-t-t3_a25' in keys[1]
+
+
+def test_ingest_group_keeps_empty_listing_with_valid_anchor(
+    ingestor, mock_extractor, mock_storage
+):
+    mock_storage.latest_key.return_value = (
+        'raw/reddit/btc/2026-04-15/h-t3_a10-t-t3_a01-tm-1.json'
+    )
+    mock_extractor.batch.return_value = []
+    mock_extractor.anchor_exists.return_value = True
+    ingestor.anchor_recovery = True
+
+    ingestor.ingest_group(['btc', 'dogecoin'])
+
+    mock_extractor.batch.assert_called_once()
+    mock_storage.upload.assert_not_called()
+
+
+def test_ingest_group_paginates_from_cursor(mock_extractor, mock_storage):
+    """A quiet member must not anchor the whole group far back in the feed."""
+    checkpoints = MagicMock()
+    checkpoints.get.side_effect = lambda subreddit: {
+        'btc': Checkpoint(
+            key='raw/reddit/btc/2026-04-15/h-t3_a90-t-t3_a80-tm-1.json',
+            updated_at=100_000.0,
+        ),
+        'dogecoin': Checkpoint(
+            key='raw/reddit/dogecoin/2026-04-15/h-t3_a91-t-t3_a81-tm-1.json',
+            updated_at=99_000.0,
+        ),
+        'CryptoTechnology': Checkpoint(
+            key='raw/reddit/CryptoTechnology/2026-01-01/h-t3_a01-t-t3_a00-tm-1.json',
+            updated_at=0.0,
+            cursor='t3_a91',
+        ),
+    }[subreddit]
+    mock_extractor.batch.return_value = [
+        {
+            'data': {
+                'children': [
+                    child('btc', 't3_a95'),
+                    child('CryptoTechnology', 't3_a93'),
+                ]
+            }
+        }
+    ]
+    ingestor = RedditIngestor(
+        extractor=mock_extractor, storage=mock_storage, checkpoints=checkpoints
+    )
+
+    ingestor.ingest_group(['btc', 'dogecoin', 'CryptoTechnology'])
+
+    mock_extractor.batch.assert_called_once_with(
+        subreddit='btc+dogecoin+CryptoTechnology', fullname='t3_a90', limit=25
+    )
+    keys = sorted(call.kwargs['s3_key'] for call in mock_storage.upload.call_args_list)
+    assert 'h-t3_a93-t-t3_a93' in keys[0]
+    assert 'h-t3_a95-t-t3_a95' in keys[1]
+    # Every member moves to the newest fullname of the listing, even
+    # dogecoin which had nothing new.
+    puts = {call.args[0]: call.args[1] for call in checkpoints.put.call_args_list}
+    assert {subreddit: put.cursor for subreddit, put in puts.items()} == {
+        'btc': 't3_a95',
+        'dogecoin': 't3_a95',
+        'CryptoTechnology': 't3_a95',
+    }
+    assert puts['dogecoin'].key.endswith('h-t3_a91-t-t3_a81-tm-1.json')
+
+
+def test_run_groups_combined_subreddits(ingestor):
+    with (
+        patch.object(ingestor, 'ingest_subreddit') as mock_ingest,
+        patch.object(ingestor, 'ingest_group') as mock_group,
+    ):
+        ingestor.run(
+            ['Bitcoin', 'btc', 'dogecoin', 'CryptoTechnology'],
+            combined=['btc', 'dogecoin', 'CryptoTechnology'],
+            group_size=2,
+        )
+
+        mock_ingest.assert_called_once_with('Bitcoin')
+        mock_group.assert_any_call(['btc', 'dogecoin'])
+        mock_group.assert_any_call(['CryptoTechnology'])
+
+
+def test_ingest_subreddit_uses_planned_page_size(mock_extractor, mock_storage):
+    """With a planner, the page size follows the subreddit's velocity."""
+    checkpoints = MagicMock()
+    checkpoints.get.return_value = Checkpoint(
+        key='raw/reddit/Bitcoin/2026-04-15/h-t3_old-t-t3_tail-tm-1.json',
+        updated_at=0.0,
+        velocity=1.0,
+    )
+    mock_extractor.batch.return_value = [
+        {'data': {'children': [child('Bitcoin', 't3_b'), child('Bitcoin', 't3_a')]}},
+    ]
+    ingestor = RedditIngestor(
+        extractor=mock_extractor,
+        storage=mock_storage,
+        checkpoints=checkpoints,
+        planner=RequestPlanner(),
+    )
+
+    ingestor.ingest_subreddit('Bitcoin')
+
+    mock_extractor.batch.assert_called_once_with(
+        subreddit='Bitcoin', fullname='t3_old', limit=100
+    )
+    committed = checkpoints.put.call_args[0][1]
+    assert committed.posts == 2
+    assert committed.velocity is not None
+
+
+def test_run_plans_before_ingesting(mock_extractor, mock_storage):
+    """The checkpoints read while planning are reused by the ingestion."""
+    checkpoints = MagicMock()
+    checkpoints.get.return_value = None
+    mock_storage.latest_key.return_value = None
+    mock_extractor.batch.return_value = []
+    ingestor = RedditIngestor(
+        extractor=mock_extractor,
+        storage=mock_storage,
+        checkpoints=checkpoints,
+        planner=RequestPlanner(),
+    )
+
+    with patch.object(ingestor, 'plan', wraps=ingestor.plan) as mock_plan:
+        ingestor.run(['Bitcoin', 'btc'])
+
+    mock_plan.assert_called_once_with(['Bitcoin', 'btc'])
+    assert checkpoints.get.call_count == 2
+    mock_extractor.batch.assert_any_call(subreddit='btc', fullname='', limit=100)
+
+
+def test_ingest_subreddit_ingests_comments(mock_extractor, mock_storage):
+    comments = MagicMock()
+    mock_storage.latest_key.return_value = None
+    mock_extractor.batch.return_value = [
+        {'data': {'children': [child('Bitcoin', 't3_a2')]}},
+        {'data': {'children': [child('Bitcoin', 't3_a1')]}},
+    ]
+    ingestor = RedditIngestor(
+        extractor=mock_extractor, storage=mock_storage, comments=comments
+    )
+
+    assert ingestor.ingest_subreddit('Bitcoin') == 2
+    comments.ingest.assert_called_once_with('Bitcoin', ['t3_a2', 't3_a1'])
+
+
+LOST_HEAD_KEY = 'raw/reddit/Bitcoin/2026-04-15/h-t3_a30-t-t3_a10-tm-1.json'
+
+
+@pytest.fixture
+def recovering_ingestor(mock_extractor, mock_storage):
+    mock_storage.latest_key.return_value = LOST_HEAD_KEY
+    return RedditIngestor(
+        extractor=mock_extractor, storage=mock_storage, anchor_recovery=True
+    )
+
+
+def test_empty_sync_with_valid_anchor_stores_nothing(
+    recovering_ingestor, mock_extractor, mock_storage
+):
+    mock_extractor.batch.return_value = []
+    mock_extractor.anchor_exists.return_value = True
+
+    assert recovering_ingestor.ingest_subreddit('Bitcoin') == 0
+    mock_extractor.anchor_exists.assert_called_once_with('Bitcoin', 't3_a30')
+    mock_storage.upload.assert_not_called()
+
+
+def test_empty_sync_of_quiet_subreddit_skips_probe(mock_extractor, mock_storage):
+    """No probe when the velocity did not expect a single new thread."""
+    checkpoints = MagicMock()
+    checkpoints.get.return_value = Checkpoint(
+        key=LOST_HEAD_KEY, updated_at=datetime.now().timestamp() - 60, velocity=0.001
+    )
+    mock_extractor.batch.return_value = []
+    ingestor = RedditIngestor(
+        extractor=mock_extractor,
+        storage=mock_storage,
+        checkpoints=checkpoints,
+        anchor_recovery=True,
+    )
+
+    assert ingestor.ingest_subreddit('Bitcoin') == 0
+    mock_extractor.anchor_exists.assert_not_called()
+
+
+def test_lost_anchor_falls_back_to_earlier_post(
+    recovering_ingestor, mock_extractor, mock_storage
+):
+    """An earlier post of the last object is used, without refetching it."""
+    mock_storage.read.return_value = json_codec.dumps(
+        [
+            {
+                'data': {
+                    'children': [child('Bitcoin', 't3_a30'), child('Bitcoin', 't3_a20')]
+                }
+            }
+        ]
+    )
+    mock_extractor.anchor_exists.side_effect = lambda sub, name: name == 't3_a20'
+    mock_extractor.batch.side_effect = [
+        [],
+        [
+            {
+                'data': {
+                    'children': [child('Bitcoin', 't3_a40'), child('Bitcoin', 't3_a25')]
+                }
+            }
+        ],
+    ]
+
+    assert recovering_ingestor.ingest_subreddit('Bitcoin') == 1
+    mock_extractor.batch.assert_called_with(
+        subreddit='Bitcoin', fullname='t3_a20', limit=25
+    )
+    assert 'h-t3_a40-t-t3_a40' in mock_storage.upload.call_args.kwargs['s3_key']
+
+
+def test_lost_anchor_falls_back_to_bounded_scan(
+    recovering_ingestor, mock_extractor, mock_storage
+):
+    mock_storage.read.return_value = None
+    mock_extractor.batch.return_value = []
+    mock_extractor.anchor_exists.return_value = False
+    mock_extractor.scan_newer_than.return_value = [
+        {'data': {'children': [child('Bitcoin', 't3_a40')]}}
+    ]
+
+    assert recovering_ingestor.ingest_subreddit('Bitcoin') == 1
+    mock_extractor.scan_newer_than.assert_called_once_with(
+        subreddit='Bitcoin', fullname='t3_a30', since=None, limit=100
+    )
+
+
+def test_ingest_subreddit_drops_already_stored_threads(
+    recovering_ingestor, mock_extractor, mock_storage
+):
+    index = SeenIndex(BloomFilter.for_capacity(1000))
+    index.add('t3_a25')
+    seen = MagicMock()
+    seen.get.return_value = index
+    recovering_ingestor.seen = seen
+    mock_extractor.batch.return_value = [
+        {'data': {'children': [child('Bitcoin', 't3_a40'), child('Bitcoin', 't3_a25')]}}
+    ]
+
+    assert recovering_ingestor.ingest_subreddit('Bitcoin') == 1
+    assert 'h-t3_a40-t-t3_a40' in mock_storage.upload.call_args.kwargs['s3_key']
+    assert index.seen('t3_a40')
+    # written in bulk, not after every batch
+    seen.put.assert_not_called()
+    recovering_ingestor.flush_seen()
+    seen.put.assert_called_once_with('Bitcoin', index)
+
+
+def test_seen_index_written_every_few_batches(
+    recovering_ingestor, mock_extractor, mock_storage
+):
+    seen = MagicMock()
+    seen.get.return_value = SeenIndex(BloomFilter.for_capacity(1000))
+    recovering_ingestor.seen = seen
+    recovering_ingestor.SEEN_FLUSH_BATCHES = 2
+
+    for name in ('t3_a40', 't3_a50', 't3_a60'):
+        mock_extractor.batch.return_value = [
+            {'data': {'children': [child('Bitcoin', name)]}}
+        ]
+        recovering_ingestor.ingest_subreddit('Bitcoin')
+
+    assert seen.put.call_count == 1
+    recovering_ingestor.flush_seen()
+    recovering_ingestor.flush_seen()
+    assert seen.put.call_count == 2
+
+
+def test_load_with_spool_defers_upload(mock_extractor, mock_storage, tmp_path):
+    spool = LocalSpool(str(tmp_path), fsync=False)
+    mock_storage.encode.return_value = b'[]'
+    ingestor = RedditIngestor(
+        extractor=mock_extractor,
+        storage=mock_storage,
+        checkpoints=MagicMock(),
+        spool=spool,
+    )
+    ingestor.checkpoints.get.return_value = Checkpoint(
+        key=LOST_HEAD_KEY, updated_at=1.0
+    )
+    mock_extractor.batch.return_value = [
+        {'data': {'children': [child('Bitcoin', 't3_a40')]}}
+    ]
+
+    assert ingestor.ingest_subreddit('Bitcoin') == 1
+    mock_storage.upload.assert_not_called()
+    mock_storage.upload_encoded.assert_not_called()
+    ingestor.checkpoints.put.assert_not_called()
+
+    # the next sync starts after the spooled batch
+    ingestor.ingest_subreddit('Bitcoin')
+    assert mock_extractor.batch.call_args.kwargs['fullname'] == 't3_a40'
+
+
+def test_upload_spooled_coalesces_batches(mock_extractor, mock_storage):
+    mock_storage.encode.side_effect = lambda pages: json_codec.dumps(pages)
+    ingestor = RedditIngestor(
+        extractor=mock_extractor, storage=mock_storage, checkpoints=MagicMock()
+    )
+    pages = {
+        name: [{'data': {'children': [child('Bitcoin', name)]}}]
+        for name in ('t3_a10', 't3_a20')
+    }
+    records = [
+        SpoolRecord(
+            subreddit='Bitcoin',
+            s3_key=f'raw/reddit/Bitcoin/2026-04-15/h-{name}-t-{name}-tm-1.json',
+            articles=[name],
+            body=json_codec.dumps(pages[name]),
+        )
+        for name in ('t3_a10', 't3_a20')
+    ]
+
+    assert ingestor.upload_spooled(records) == 2
+
+    s3_key, body, _ = mock_storage.upload_encoded.call_args.args
+    assert 'h-t3_a20-t-t3_a10' in s3_key
+    assert json_codec.loads(body) == pages['t3_a20'] + pages['t3_a10']
+    assert ingestor.checkpoints.put.call_args.args[1].key == s3_key
+
+
+def test_ingest_subreddit_is_profiled(mock_extractor, mock_storage, tmp_path):
+    mock_storage.latest_key.return_value = None
+    mock_extractor.batch.return_value = []
+    ingestor = RedditIngestor(
+        extractor=mock_extractor,
+        storage=mock_storage,
+        profiler=Profiler(str(tmp_path)),
+    )
+
+    ingestor.ingest_subreddit('Bitcoin')
+
+    assert (tmp_path / 'Bitcoin.pstats').exists()
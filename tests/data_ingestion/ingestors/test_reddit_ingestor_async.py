@@ -0,0 +1,97 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from data_ingestion.load.compression import Codec
+from data_ingestion.ingestors.reddit_async import AsyncRedditIngestor
+from data_ingestion.load.dedup import SeenIndex
+from data_ingestion.utils.bloom import BloomFilter
+
+
+@pytest.fixture
+def mock_extractor():
+    extractor = MagicMock()
+    extractor.batch = AsyncMock()
+    return extractor
+
+
+@pytest.fixture
+def mock_storage():
+    storage = MagicMock()
+    storage.codec = Codec()
+    return storage
+
+
+@pytest.fixture
+def ingestor(mock_extractor, mock_storage):
+    ingestor = AsyncRedditIngestor(extractor=mock_extractor, storage=mock_storage)
+    yield ingestor
+    ingestor.close()
+
+
+# =================================================
+# ---------- Tests for AsyncRedditIngestor ----------
+# =================================================
+
+
+def test_async_ingest_subreddit_success(ingestor, mock_extractor, mock_storage):
+    mock_storage.latest_key.return_value = (
+        'raw/reddit/Bitcoin/2026-04-15/h-t3_old-t-t3_tail-tm-123.json'
+    )
+    mock_data = [
+        {'data': {'children': [{'data': {'name': 't3_new_head'}}]}},
+        {'data': {'children': [{'data': {'name': 't3_new_tail'}}]}},
+    ]
+    mock_extractor.batch.return_value = mock_data
+
+    asyncio.run(ingestor.ingest_subreddit('Bitcoin'))
+
+    mock_extractor.batch.assert_awaited_once_with(
+        subreddit='Bitcoin', fullname='t3_old', limit=25
+    )
+    s3_key = mock_storage.upload.call_args[1]['s3_key']
+    assert 'h-t3_new_head-t-t3_new_tail' in s3_key
+    assert mock_storage.upload.call_args[1]['data'] == mock_data
+
+
+def test_async_run_isolates_errors(ingestor, mock_extractor, mock_storage):
+    mock_storage.latest_key.return_value = None
+
+    async def batch(subreddit, fullname, limit):
+        if subreddit == 'Bitcoin':
+            raise Exception('boom')
+        return [{'data': {'children': [{'data': {'name': f't3_{subreddit}'}}]}}]
+
+    mock_extractor.batch.side_effect = batch
+
+    asyncio.run(ingestor.run(['Bitcoin', 'Ethereum', 'btc']))
+
+    assert mock_extractor.batch.await_count == 3
+    assert mock_storage.upload.call_count == 2
+
+
+def test_async_run_drops_stored_threads(mock_extractor, mock_storage):
+    index = SeenIndex(BloomFilter.for_capacity(1000))
+    index.add('t3_a10')
+    seen = MagicMock()
+    seen.get.return_value = index
+    ingestor = AsyncRedditIngestor(
+        extractor=mock_extractor, storage=mock_storage, seen=seen
+    )
+    mock_storage.latest_key.return_value = None
+    mock_extractor.batch.return_value = [
+        {
+            'data': {
+                'children': [{'data': {'name': 't3_a20'}}, {'data': {'name': 't3_a10'}}]
+            }
+        }
+    ]
+
+    try:
+        asyncio.run(ingestor.run(['Bitcoin']))
+    finally:
+        ingestor.close()
+
+    assert 'h-t3_a20-t-t3_a20' in mock_storage.upload.call_args[1]['s3_key']
+    # the index is written back once the run is over
+    seen.put.assert_called_once()
@@ -0,0 +1,142 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from data_ingestion.ingestors.scheduler import PollingScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def scheduler(clock):
+    return PollingScheduler(
+        ingestor=MagicMock(),
+        subreddits=['CryptoCurrency', 'CryptoTechnology'],
+        min_interval=5.0,
+        max_interval=300.0,
+        target_posts=25,
+        clock=clock,
+    )
+
+
+# ==================================================
+# ---------- Tests for PollingScheduler ------------
+# ==================================================
+
+
+def test_first_poll_uses_min_interval(scheduler):
+    scheduler._reschedule('CryptoCurrency', 1000.0, 80)
+
+    assert scheduler.interval('CryptoCurrency') == 5.0
+
+
+def test_busy_subreddit_is_polled_often(scheduler, clock):
+    scheduler._reschedule('CryptoCurrency', 1000.0, 80)
+    clock.now = 1010.0
+    # 50 posts in 10s -> 5 posts/s -> 25 posts every 5s
+    scheduler._reschedule('CryptoCurrency', 1010.0, 50)
+
+    assert scheduler.interval('CryptoCurrency') == pytest.approx(5.0)
+
+
+def test_quiet_subreddit_backs_off_to_max_interval(scheduler, clock):
+    scheduler._reschedule('CryptoTechnology', 1000.0, 3)
+    clock.now = 1005.0
+    scheduler._reschedule('CryptoTechnology', 1005.0, 0)
+
+    assert scheduler.interval('CryptoTechnology') == 300.0
+
+
+def test_interval_follows_velocity(scheduler, clock):
+    scheduler._reschedule('Bitcoin', 1000.0, 0)
+    clock.now = 1100.0
+    # 10 posts in 100s -> 0.1 posts/s -> 25 posts every 250s
+    scheduler._reschedule('Bitcoin', 1100.0, 10)
+
+    assert scheduler.interval('Bitcoin') == pytest.approx(250.0)
+    assert (1350.0, 'Bitcoin') in scheduler._queue
+
+
+def test_failed_poll_doubles_interval(scheduler):
+    scheduler._reschedule('Bitcoin', 1000.0, None)
+
+    assert scheduler.interval('Bitcoin') == 10.0
+
+
+def test_run_polls_until_stopped():
+    polls = []
+    ingestor = MagicMock()
+
+    def ingest(subreddit):
+        polls.append(subreddit)
+        if len(polls) == 4:
+            scheduler.stop()
+        return 0
+
+    ingestor.ingest_subreddit.side_effect = ingest
+    scheduler = PollingScheduler(
+        ingestor=ingestor,
+        subreddits=['Bitcoin', 'btc'],
+        min_interval=0.0,
+        max_interval=0.0,
+    )
+
+    scheduler.run()
+
+    assert scheduler.stopped
+    assert len(polls) == 4
+    assert set(polls) == {'Bitcoin', 'btc'}
+
+
+def test_run_isolates_errors():
+    ingestor = MagicMock()
+    calls = []
+
+    def ingest(subreddit):
+        calls.append(subreddit)
+        if len(calls) >= 3:
+            scheduler.stop()
+        if subreddit == 'Bitcoin':
+            raise Exception('boom')
+        return 1
+
+    ingestor.ingest_subreddit.side_effect = ingest
+    scheduler = PollingScheduler(
+        ingestor=ingestor,
+        subreddits=['Bitcoin', 'btc'],
+        min_interval=0.0,
+        max_interval=0.0,
+        max_workers=2,
+    )
+
+    scheduler.run()
+
+    assert 'btc' in calls
+
+
+def test_retry_budget_is_refilled(clock):
+    retry_policy = MagicMock()
+    scheduler = PollingScheduler(
+        ingestor=MagicMock(),
+        subreddits=[],
+        max_interval=60.0,
+        retry_policy=retry_policy,
+        clock=clock,
+    )
+
+    scheduler._refill_budget(1030.0)
+    retry_policy.reset_budget.assert_not_called()
+
+    scheduler._refill_budget(1060.0)
+    retry_policy.reset_budget.assert_called_once()
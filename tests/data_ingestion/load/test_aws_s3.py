@@ -2,7 +2,7 @@ import json
 import pytest
 from moto import mock_aws
 
-from data_ingestion.load.aws_s3 import AWSClientS3, AWSServiceS3
+from data_ingestion.load.aws_s3 import AWSClientS3, AWSServiceS3, S3JsonArrayWriter
 
 
 # =========================
@@ -36,19 +36,34 @@ def test_aws_client_s3_success(aws_s3_client):
 
 def test_aws_client_s3_failure(mocker):
     mocker.patch('boto3.client', side_effect=Exception('Failed to create S3 client'))
+    aws_client = AWSClientS3(
+        aws_access_key_id='test1',
+        aws_secret_access_key='test2',
+        region_name='us-east-1',
+    )
 
     with pytest.raises(Exception) as exc_info:
-        AWSClientS3(
-            aws_access_key_id='test1',
-            aws_secret_access_key='test2',
-            region_name='us-east-1',
-        )
+        aws_client.client
 
     assert 'Failed to create S3 client: Failed to create S3 client' in str(
         exc_info.value
     )
 
 
+def test_aws_client_s3_is_created_on_first_access(mocker):
+    boto3_client = mocker.patch('boto3.client')
+    aws_client = AWSClientS3(
+        aws_access_key_id='test1',
+        aws_secret_access_key='test2',
+        region_name='us-east-1',
+    )
+    service = AWSServiceS3(client=aws_client, bucket_name='bucket')
+
+    boto3_client.assert_not_called()
+    assert service.client is aws_client.client
+    boto3_client.assert_called_once()
+
+
 # ==========================
 # === AWSServiceS3 Tests ===
 # ==========================
@@ -157,3 +172,196 @@ def test_aws_service_s3_latest_key_failure(aws_s3_service, mocker):
         service.latest_key('go_to_mars/')
 
     assert 'Failed to list objects in S3: Failed to list objects' in str(exc_info.value)
+
+
+# writer tests
+def test_aws_service_s3_open_writer_small_object(aws_s3_service):
+    service = aws_s3_service
+    s3_key = 'go_to_mars/2037-01-01/stream.json'
+
+    with service.open_writer(s3_key) as writer:
+        writer.write({'page': 1})
+        writer.write({'page': 2})
+
+    response = service.client.get_object(Bucket=service.bucket_name, Key=s3_key)
+    assert json.loads(response['Body'].read()) == [{'page': 1}, {'page': 2}]
+
+
+def test_s3_json_array_writer_multipart(aws_s3_service):
+    service = aws_s3_service
+    s3_key = 'go_to_mars/2037-01-01/big.json'
+    page = {'blob': 'x' * (1024 * 1024)}
+
+    with S3JsonArrayWriter(service.client, service.bucket_name, s3_key) as writer:
+        for _ in range(12):
+            writer.write(page)
+        assert writer._upload_id is not None
+
+    response = service.client.get_object(Bucket=service.bucket_name, Key=s3_key)
+    assert json.loads(response['Body'].read()) == [page] * 12
+
+
+def test_s3_json_array_writer_metadata_survives_move(aws_s3_service):
+    service = aws_s3_service
+    staging_key = 'tmp/go_to_mars/staging.json'
+    s3_key = 'go_to_mars/2037-01-01/mars.json'
+
+    with service.open_writer(
+        staging_key, metadata={'page-order': 'oldest-first'}
+    ) as writer:
+        writer.write({'page': 1})
+    service.move(staging_key, s3_key)
+
+    response = service.client.head_object(Bucket=service.bucket_name, Key=s3_key)
+    assert response['Metadata'] == {'page-order': 'oldest-first'}
+
+
+def test_s3_json_array_writer_aborts_on_error(aws_s3_service):
+    service = aws_s3_service
+    s3_key = 'go_to_mars/2037-01-01/aborted.json'
+
+    with pytest.raises(RuntimeError):
+        with service.open_writer(s3_key) as writer:
+            writer.write({'page': 1})
+            raise RuntimeError('extraction failed')
+
+    listing = service.client.list_objects_v2(Bucket=service.bucket_name)
+    assert 'Contents' not in listing
+
+
+def test_aws_service_s3_move(aws_s3_service):
+    service = aws_s3_service
+    service.client.put_object(Bucket=service.bucket_name, Key='tmp/a.json', Body='x')
+
+    service.move('tmp/a.json', 'final/b.json')
+
+    keys = [
+        obj['Key']
+        for obj in service.client.list_objects_v2(Bucket=service.bucket_name)[
+            'Contents'
+        ]
+    ]
+    assert keys == ['final/b.json']
+
+
+def test_aws_service_s3_latest_key_scans_newest_partition_only(aws_s3_service, mocker):
+    service = aws_s3_service
+    keys = [
+        'raw/reddit/Bitcoin/2026-05-01/h-t3_a-t-t3_b-tm-1000.0.json',
+        'raw/reddit/Bitcoin/2026-05-02/h-t3_c-t-t3_d-tm-2000.0.json',
+        'raw/reddit/Bitcoin/2026-05-03/h-t3_e-t-t3_f-tm-3000.0.json',
+        'raw/reddit/Bitcoin/2026-05-03/h-t3_g-t-t3_h-tm-4000.0.json',
+    ]
+    for key in keys:
+        service.client.put_object(Bucket=service.bucket_name, Key=key, Body='x')
+    spy = mocker.spy(service, '_latest_object')
+
+    latest_key = service.latest_key('raw/reddit/Bitcoin/')
+
+    assert latest_key == keys[-1]
+    scanned = [call.args[0] for call in spy.call_args_list]
+    assert scanned == ['raw/reddit/Bitcoin/', 'raw/reddit/Bitcoin/2026-05-03/']
+
+
+def test_aws_service_s3_latest_key_flat_prefix(aws_s3_service):
+    """Objects stored directly under the prefix should still be found."""
+    service = aws_s3_service
+    service.client.put_object(
+        Bucket=service.bucket_name, Key='flat/a-tm-1000.0.json', Body='x'
+    )
+    service.client.put_object(
+        Bucket=service.bucket_name, Key='flat/b-tm-2000.0.json', Body='x'
+    )
+
+    assert service.latest_key('flat/') == 'flat/b-tm-2000.0.json'
+
+
+def test_aws_service_s3_upload_retries_throttling(aws_s3_service, mocker):
+    from botocore.exceptions import ClientError
+    from data_ingestion.utils.retry import RetryPolicy
+
+    service = aws_s3_service
+    service.retry_policy = RetryPolicy(sleep=lambda seconds: None)
+    slow_down = ClientError(
+        {'Error': {'Code': 'SlowDown'}, 'ResponseMetadata': {'HTTPStatusCode': 503}},
+        'PutObject',
+    )
+    mock_put = mocker.patch.object(
+        service.client, 'put_object', side_effect=[slow_down, None]
+    )
+
+    assert service.upload('go_to_mars/2037-01-01/mars.json', {'a': 1}) is True
+    assert mock_put.call_count == 2
+
+
+def test_s3_json_array_writer_retries_multipart_creation(aws_s3_service, mocker):
+    from botocore.exceptions import ClientError
+    from data_ingestion.utils.retry import RetryPolicy
+
+    service = aws_s3_service
+    s3_key = 'go_to_mars/2037-01-01/big.json'
+    page = {'blob': 'x' * (1024 * 1024)}
+    slow_down = ClientError(
+        {'Error': {'Code': 'SlowDown'}, 'ResponseMetadata': {'HTTPStatusCode': 503}},
+        'CreateMultipartUpload',
+    )
+    create = service.client.create_multipart_upload
+    mock_create = mocker.patch.object(
+        service.client,
+        'create_multipart_upload',
+        side_effect=[slow_down, create(Bucket=service.bucket_name, Key=s3_key)],
+    )
+
+    with S3JsonArrayWriter(
+        service.client,
+        service.bucket_name,
+        s3_key,
+        retry_policy=RetryPolicy(sleep=lambda seconds: None),
+    ) as writer:
+        for _ in range(12):
+            writer.write(page)
+
+    assert mock_create.call_count == 2
+    response = service.client.get_object(Bucket=service.bucket_name, Key=s3_key)
+    assert json.loads(response['Body'].read()) == [page] * 12
+
+
+# compression tests
+def test_aws_service_s3_upload_gzip(aws_s3_service):
+    from data_ingestion.load.compression import GzipCodec
+
+    service = aws_s3_service
+    service.codec = GzipCodec()
+    mock_data = [{'cripto': 'bitcoin', 'price': 676767.67}] * 50
+    s3_key = 'go_to_mars/2037-01-01/mars.json.gz'
+
+    service.upload(s3_key, mock_data)
+
+    response = service.client.get_object(Bucket=service.bucket_name, Key=s3_key)
+    assert response['ContentEncoding'] == 'gzip'
+    assert json.loads(service.read(s3_key)) == mock_data
+
+
+def test_s3_json_array_writer_gzip(aws_s3_service):
+    from data_ingestion.load.compression import GzipCodec
+
+    service = aws_s3_service
+    service.codec = GzipCodec()
+    s3_key = 'go_to_mars/2037-01-01/stream.json.gz'
+
+    with service.open_writer(s3_key) as writer:
+        writer.write({'page': 1})
+        writer.write({'page': 2})
+
+    assert json.loads(service.read(s3_key)) == [{'page': 1}, {'page': 2}]
+
+
+def test_aws_service_s3_latest_key_compressed(aws_s3_service):
+    service = aws_s3_service
+    key_older = 'raw/reddit/Bitcoin/2026-05-01/h-t3_a-t-t3_b-tm-2000.0.json'
+    key_newer = 'raw/reddit/Bitcoin/2026-05-01/h-t3_c-t-t3_d-tm-3000.0.json.gz'
+
+    service.client.put_object(Bucket=service.bucket_name, Key=key_newer, Body='x')
+    service.client.put_object(Bucket=service.bucket_name, Key=key_older, Body='x')
+
+    assert service.latest_key('raw/reddit/Bitcoin/') == key_newer
@@ -0,0 +1,105 @@
+import pytest
+from moto import mock_aws
+
+from data_ingestion.load.aws_s3 import AWSClientS3, AWSServiceS3
+from data_ingestion.load.checkpoint import (
+    BackfillState,
+    Checkpoint,
+    S3BackfillStore,
+    S3CheckpointStore,
+)
+
+
+@pytest.fixture
+def aws_s3_service():
+    with mock_aws():
+        client = AWSClientS3(
+            aws_access_key_id='test1',
+            aws_secret_access_key='test2',
+            region_name='us-east-1',
+        ).client
+        bucket_name = 'test-bucket-go-to-mars'
+        client.create_bucket(Bucket=bucket_name)
+        yield AWSServiceS3(client=client, bucket_name=bucket_name)
+
+
+@pytest.fixture
+def store(aws_s3_service):
+    return S3CheckpointStore(aws_s3_service)
+
+
+# ==================================================
+# ---------- Tests for S3CheckpointStore -----------
+# ==================================================
+
+
+def test_checkpoint_store_get_missing_returns_none(store):
+    assert store.get('Bitcoin') is None
+
+
+def test_checkpoint_store_roundtrip(store, aws_s3_service):
+    key = 'raw/reddit/Bitcoin/2026-05-03/h-t3_a-t-t3_b-tm-1746230400.0.json'
+
+    store.put('Bitcoin', Checkpoint(key=key, updated_at=1746230400.0))
+
+    assert store.get('Bitcoin') == Checkpoint(key=key, updated_at=1746230400.0)
+    # the pointer must not be visible to the raw/ listings
+    assert aws_s3_service.latest_key('raw/reddit/Bitcoin/') is None
+
+
+def test_checkpoint_store_ignores_malformed_pointer(store, aws_s3_service):
+    aws_s3_service.client.put_object(
+        Bucket=aws_s3_service.bucket_name,
+        Key='state/reddit/Bitcoin/_checkpoint.json',
+        Body=b'{"unexpected": 1}',
+    )
+
+    assert store.get('Bitcoin') is None
+
+
+def test_aws_service_s3_read_missing_key_returns_none(aws_s3_service):
+    assert aws_s3_service.read('nothing/here.json') is None
+
+
+# ==================================================
+# ------------- Tests for Checkpoint ---------------
+# ==================================================
+
+
+def test_checkpoint_build_measures_velocity(mocker):
+    mocker.patch(
+        'data_ingestion.load.checkpoint.datetime'
+    ).now.return_value.timestamp.return_value = 1100.0
+    previous = Checkpoint(key='old', updated_at=1000.0)
+
+    checkpoint = Checkpoint.build('new', posts=50, previous=previous)
+
+    assert checkpoint.posts == 50
+    assert checkpoint.velocity == pytest.approx(0.5)
+
+
+def test_checkpoint_build_smooths_velocity(mocker):
+    mocker.patch(
+        'data_ingestion.load.checkpoint.datetime'
+    ).now.return_value.timestamp.return_value = 1100.0
+    previous = Checkpoint(key='old', updated_at=1000.0, velocity=0.1)
+
+    checkpoint = Checkpoint.build('new', posts=50, previous=previous)
+
+    assert checkpoint.velocity == pytest.approx(0.3)
+
+
+def test_checkpoint_from_key_uses_key_timestamp():
+    key = 'raw/reddit/Bitcoin/2026-05-03/h-t3_a-t-t3_b-tm-1746230400.0.json'
+
+    assert Checkpoint.from_key(key) == Checkpoint(key=key, updated_at=1746230400.0)
+
+
+def test_backfill_store_roundtrip(aws_s3_service):
+    store = S3BackfillStore(aws_s3_service)
+    state = BackfillState(after='t3_a', pages=3, posts=250, updated_at=1.0)
+
+    store.put('Bitcoin', state)
+
+    assert store.get('Bitcoin') == state
+    assert aws_s3_service.read('state/reddit/Bitcoin/_backfill.json') is not None
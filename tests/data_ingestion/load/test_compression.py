@@ -0,0 +1,55 @@
+import pytest
+from data_ingestion.load.compression import (
+    Codec,
+    GzipCodec,
+    detect_codec,
+    get_codec,
+)
+
+
+PAYLOAD = b'{"data": {"children": []}}' * 100
+
+
+# ===========================================
+# ---------- Tests for compression ----------
+# ===========================================
+
+
+@pytest.mark.parametrize('name', ['none', 'gzip', 'zstd'])
+def test_codec_roundtrip(name):
+    if name == 'zstd':
+        pytest.importorskip('zstandard')
+    codec = get_codec(name)
+
+    assert codec.decompress(codec.compress(PAYLOAD)) == PAYLOAD
+
+
+@pytest.mark.parametrize('name', ['none', 'gzip', 'zstd'])
+def test_codec_incremental_compressor(name):
+    if name == 'zstd':
+        pytest.importorskip('zstandard')
+    codec = get_codec(name)
+    compressor = codec.compressor()
+
+    chunks = [
+        compressor.compress(PAYLOAD[i : i + 100]) for i in range(0, len(PAYLOAD), 100)
+    ]
+    chunks.append(compressor.flush())
+
+    assert codec.decompress(b''.join(chunks)) == PAYLOAD
+
+
+def test_gzip_codec_level():
+    assert get_codec('gzip', level=9).level == 9
+    assert len(get_codec('gzip').compress(PAYLOAD)) < len(PAYLOAD) / 8
+
+
+def test_get_codec_unknown_name():
+    with pytest.raises(ValueError, match='Unknown compression codec'):
+        get_codec('brotli')
+
+
+def test_detect_codec():
+    assert isinstance(detect_codec('a.json', content_encoding='gzip'), GzipCodec)
+    assert isinstance(detect_codec('a.json.gz'), GzipCodec)
+    assert type(detect_codec('a.json')) is Codec
@@ -0,0 +1,113 @@
+import pytest
+from moto import mock_aws
+
+from data_ingestion.load.aws_s3 import AWSClientS3, AWSServiceS3
+from data_ingestion.load.dedup import S3SeenIndexStore, SeenIndex
+from data_ingestion.utils.bloom import BloomFilter
+
+
+def child(name):
+    return {'data': {'name': name}}
+
+
+@pytest.fixture
+def index():
+    return SeenIndex(BloomFilter.for_capacity(1000))
+
+
+@pytest.fixture
+def aws_s3_service():
+    with mock_aws():
+        client = AWSClientS3(
+            aws_access_key_id='test1',
+            aws_secret_access_key='test2',
+            region_name='us-east-1',
+        ).client
+        bucket_name = 'test-bucket-go-to-mars'
+        client.create_bucket(Bucket=bucket_name)
+        yield AWSServiceS3(client=client, bucket_name=bucket_name)
+
+
+# =========================================
+# ---------- Tests for SeenIndex ----------
+# =========================================
+
+
+def test_seen_index_tracks_watermark(index):
+    index.add('t3_a20')
+    index.add('t3_a10')
+
+    assert index.seen('t3_a10')
+    assert not index.seen('t3_a30')
+    assert index.watermark == int('a20', 36)
+
+
+def test_seen_index_never_drops_posts_above_watermark(index):
+    index.add('t3_a20')
+    # even if the filter answered yes, newer posts are never looked up
+    index.bloom.add('t3_a30')
+
+    assert not index.seen('t3_a30')
+
+
+def test_seen_index_drop_seen(index):
+    index.add('t3_a20')
+    index.add('t3_a10')
+    pages = [
+        {'data': {'children': [child('t3_a30'), child('t3_a20')]}},
+        {'data': {'children': [child('t3_a10')]}},
+    ]
+
+    result = index.drop_seen(pages)
+
+    assert result == [{'data': {'children': [child('t3_a30')]}}]
+
+
+def test_full_seen_index_fails_open():
+    index = SeenIndex(BloomFilter.for_capacity(2), capacity=2)
+    for name in ('t3_a10', 't3_a20', 't3_a30'):
+        index.add(name)
+
+    assert index.full
+    assert not index.seen('t3_a10')
+    assert index.drop_seen([{'data': {'children': [child('t3_a10')]}}])
+
+
+# ==================================================
+# ---------- Tests for S3SeenIndexStore ------------
+# ==================================================
+
+
+def test_seen_index_store_roundtrip(aws_s3_service):
+    store = S3SeenIndexStore(aws_s3_service, capacity=1000)
+    index = store.get('Bitcoin')
+    assert index.watermark == -1
+
+    index.add('t3_a20')
+    store.put('Bitcoin', index)
+    restored = store.get('Bitcoin')
+
+    assert restored.seen('t3_a20')
+    assert (restored.watermark, restored.count) == (index.watermark, 1)
+    assert aws_s3_service.latest_key('raw/reddit/Bitcoin/') is None
+
+
+def test_seen_index_store_merges_concurrent_writers(aws_s3_service):
+    store = S3SeenIndexStore(aws_s3_service, capacity=1000)
+    forward = store.get('Bitcoin')
+    backfill = store.get('Bitcoin')
+
+    forward.add('t3_a90')
+    store.put('Bitcoin', forward)
+    backfill.add('t3_a10')
+    store.put('Bitcoin', backfill)
+
+    restored = store.get('Bitcoin')
+    assert restored.seen('t3_a90') and restored.seen('t3_a10')
+    assert restored.watermark == forward.watermark
+
+
+def test_seen_index_store_ignores_malformed_index(aws_s3_service):
+    aws_s3_service.upload_bytes('state/reddit/Bitcoin/_seen.bloom', b'garbage')
+
+    assert S3SeenIndexStore(aws_s3_service).get('Bitcoin').count == 0
@@ -52,3 +52,27 @@ def test_build_sets_current_date(freezegun_or_mock=None):
 
     assert key_obj.date == '2026-05-03'
     assert key_obj.timestamp == fixed_dt.timestamp()
+
+
+def test_key_with_compression_extension_roundtrip():
+    key = VALID_KEY + '.gz'
+
+    key_obj = RedditS3Key.from_s3_key(key)
+
+    assert key_obj.extension == '.gz'
+    assert key_obj.head == 't3_abc123'
+    assert key_obj.to_s3_key() == key
+
+
+def test_build_with_extension():
+    key_obj = RedditS3Key.build('Bitcoin', 't3_h', 't3_t', extension='.zst')
+
+    assert key_obj.to_s3_key().endswith('.json.zst')
+
+
+def test_build_with_dataset_uses_its_own_prefix():
+    key_obj = RedditS3Key.build('Bitcoin', 't3_h', 't3_t', dataset='reddit_comments')
+    s3_key = key_obj.to_s3_key()
+
+    assert s3_key.startswith('raw/reddit_comments/Bitcoin/')
+    assert RedditS3Key.from_s3_key(s3_key) == key_obj
@@ -0,0 +1,177 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from data_ingestion.load.spool import LocalSpool, SpoolFlusher, SpoolRecord
+
+
+def record(subreddit='Bitcoin', head='t3_a20', body=b'[]'):
+    return SpoolRecord(
+        subreddit=subreddit,
+        s3_key=f'raw/reddit/{subreddit}/2026-04-15/h-{head}-t-{head}-tm-1.json',
+        articles=[head],
+        body=body,
+    )
+
+
+@pytest.fixture
+def spool(tmp_path):
+    return LocalSpool(str(tmp_path), fsync=False)
+
+
+# ==========================================
+# ---------- Tests for LocalSpool ----------
+# ==========================================
+
+
+def test_spool_replays_pending_records_after_restart(spool, tmp_path):
+    spool.append(record(head='t3_a10', body=b'first'))
+    spool.append(record(head='t3_a20', body=b'second'))
+
+    restarted = LocalSpool(str(tmp_path))
+    pending = restarted.pending()
+
+    assert [restarted.load(item).body for item in pending] == [b'first', b'second']
+    assert pending[1].articles == ['t3_a20']
+
+
+def test_spool_skips_acked_records(spool):
+    first = spool.append(record(head='t3_a10'))
+    spool.append(record(head='t3_a20'))
+
+    spool.ack(first)
+
+    assert [item.articles for item in spool.pending()] == [['t3_a20']]
+
+
+def test_spool_latest_is_per_subreddit(spool):
+    spool.append(record(head='t3_a10'))
+    spool.append(record(subreddit='btc', head='t3_a30'))
+
+    assert spool.latest('Bitcoin').articles == ['t3_a10']
+    assert spool.latest('dogecoin') is None
+
+
+def test_spool_indexes_pending_records_without_bodies(spool):
+    first = spool.append(record(head='t3_a10', body=b'first'))
+    second = spool.append(record(head='t3_a20', body=b'second'))
+
+    # served from memory: the segments are not read again
+    with patch.object(spool, '_read_frame', side_effect=AssertionError):
+        assert [item.body for item in spool.pending()] == [b'', b'']
+        assert spool.latest('Bitcoin').articles == ['t3_a20']
+        spool.ack(second)
+        assert spool.latest('Bitcoin').articles == ['t3_a10']
+
+    assert spool.load(spool.latest('Bitcoin')).body == b'first'
+    spool.ack(first)
+    assert spool.latest('Bitcoin') is None
+
+
+def test_spool_ignores_torn_tail(spool, tmp_path):
+    spool.append(record(body=b'complete'))
+    segment = next(tmp_path.glob('*.seg'))
+    with open(segment, 'ab') as file:
+        file.write(b'\x00\x00\x00\x10partial')
+
+    restarted = LocalSpool(str(tmp_path), fsync=False)
+    assert [restarted.load(item).body for item in restarted.pending()] == [b'complete']
+
+
+def test_spool_deletes_fully_acked_segments(tmp_path):
+    spool = LocalSpool(str(tmp_path), segment_size=1, fsync=False)
+    first = spool.append(record(head='t3_a10'))
+    spool.append(record(head='t3_a20'))
+
+    spool.ack(first)
+
+    assert [path.name for path in tmp_path.glob('*.seg')] == ['00000001.seg']
+
+
+def test_spool_deletes_acked_segments_of_previous_runs(tmp_path):
+    for head in ('t3_a10', 't3_a20', 't3_a30'):
+        spool = LocalSpool(str(tmp_path), fsync=False)
+        spool.ack(spool.append(record(head=head)))
+
+    # the last run's segment is still current, the earlier ones are gone
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        '00000002.ack',
+        '00000002.seg',
+    ]
+
+    LocalSpool(str(tmp_path), fsync=False)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spool_keeps_segments_with_pending_records(tmp_path):
+    spool = LocalSpool(str(tmp_path), fsync=False)
+    spool.ack(spool.append(record(head='t3_a10')))
+    spool.append(record(head='t3_a20'))
+
+    pending = LocalSpool(str(tmp_path), fsync=False).pending()
+
+    assert [item.articles for item in pending] == [['t3_a20']]
+
+
+# ============================================
+# ---------- Tests for SpoolFlusher ----------
+# ============================================
+
+
+def test_flusher_uploads_and_acks(spool):
+    spool.append(record(head='t3_a10'))
+    spool.append(record(head='t3_a20'))
+    upload = MagicMock()
+
+    assert SpoolFlusher(spool, upload).flush() == 0
+    assert upload.call_count == 2
+    assert spool.pending() == []
+
+
+def test_flusher_keeps_order_after_failure(spool):
+    spool.append(record(head='t3_a10'))
+    spool.append(record(head='t3_a20'))
+    spool.append(record(subreddit='btc', head='t3_a30'))
+    upload = MagicMock(side_effect=[Exception('S3 down'), None])
+
+    assert SpoolFlusher(spool, upload).flush() == 2
+    # the second Bitcoin batch waits for the first one
+    assert upload.call_args.args[0][0].subreddit == 'btc'
+    assert [item.articles for item in spool.pending()] == [['t3_a10'], ['t3_a20']]
+
+
+def test_flusher_coalesces_per_subreddit(spool):
+    spool.append(record(head='t3_a10'))
+    spool.append(record(head='t3_a20'))
+    upload = MagicMock()
+
+    SpoolFlusher(spool, upload, coalesce=True).flush()
+
+    upload.assert_called_once()
+    assert [item.articles for item in upload.call_args.args[0]] == [
+        ['t3_a10'],
+        ['t3_a20'],
+    ]
+
+
+def test_flusher_caps_coalesced_objects(spool):
+    for head in ('t3_a10', 't3_a20', 't3_a30'):
+        spool.append(record(head=head))
+    upload = MagicMock()
+
+    SpoolFlusher(spool, upload, coalesce=True, max_coalesced=2).flush()
+
+    assert [
+        [item.articles for item in call.args[0]] for call in upload.call_args_list
+    ] == [[['t3_a10'], ['t3_a20']], [['t3_a30']]]
+    assert spool.pending() == []
+
+
+def test_flusher_stop_drains_spool(spool):
+    spool.append(record())
+    flusher = SpoolFlusher(spool, MagicMock(), interval=0.01)
+
+    flusher.start()
+    flusher.stop()
+
+    assert spool.pending() == []
@@ -0,0 +1,63 @@
+import pytest
+
+from data_ingestion.utils.bloom import BloomFilter
+
+
+# ===========================================
+# ---------- Tests for BloomFilter ----------
+# ===========================================
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter.for_capacity(10_000, error_rate=0.01)
+    keys = [f't3_{i:x}' for i in range(10_000)]
+
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+
+
+def test_bloom_filter_false_positive_rate_is_bounded():
+    bloom = BloomFilter.for_capacity(10_000, error_rate=0.01)
+    for i in range(10_000):
+        bloom.add(f't3_{i:x}')
+
+    false_positives = sum(f't1_{i:x}' in bloom for i in range(10_000))
+
+    assert false_positives < 200
+
+
+def test_bloom_filter_sizing():
+    bloom = BloomFilter.for_capacity(1_000_000, error_rate=0.001)
+
+    assert len(bloom.to_bytes()) < 2 * 1024 * 1024
+    assert bloom.hashes == 10
+
+
+def test_bloom_filter_roundtrip():
+    bloom = BloomFilter.for_capacity(100)
+    bloom.add('t3_abc')
+
+    restored = BloomFilter.from_bytes(bloom.to_bytes())
+
+    assert 't3_abc' in restored
+    assert (restored.size, restored.hashes) == (bloom.size, bloom.hashes)
+
+
+def test_bloom_filter_rejects_garbage():
+    with pytest.raises(ValueError):
+        BloomFilter.from_bytes(b'not a filter')
+
+
+def test_bloom_filter_update_merges_filters():
+    first = BloomFilter.for_capacity(1000)
+    second = BloomFilter.for_capacity(1000)
+    first.add('t3_a10')
+    second.add('t3_a20')
+
+    first.update(second)
+
+    assert 't3_a10' in first and 't3_a20' in first
+    with pytest.raises(ValueError):
+        first.update(BloomFilter.for_capacity(10))
@@ -0,0 +1,23 @@
+import pytest
+from data_ingestion.utils.fullname import fullname_id
+
+
+# ========================================
+# ---------- Tests for fullname ----------
+# ========================================
+
+
+def test_fullname_id_parses_base36():
+    assert fullname_id('t3_z') == 35
+    assert fullname_id('t3_10') == 36
+
+
+def test_fullname_id_orders_by_creation():
+    assert (
+        fullname_id('t3_1abcd2') < fullname_id('t3_1abcd3') < fullname_id('t3_1abce0')
+    )
+
+
+def test_fullname_id_malformed():
+    with pytest.raises(ValueError):
+        fullname_id('t3_')
@@ -0,0 +1,37 @@
+import json
+
+import pytest
+from data_ingestion.utils import json_codec
+
+
+DOCUMENT = {'data': {'children': [{'data': {'name': 't3_abc', 'title': 'Bitcoin ₿'}}]}}
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def backend(request, monkeypatch):
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(json_codec, 'orjson', None)
+    return request.param
+
+
+# ==========================================
+# ---------- Tests for json_codec ----------
+# ==========================================
+
+
+def test_dumps_returns_utf8_bytes(backend):
+    encoded = json_codec.dumps(DOCUMENT)
+
+    assert isinstance(encoded, bytes)
+    assert '₿'.encode('utf-8') in encoded
+    assert json.loads(encoded) == DOCUMENT
+
+
+def test_loads_accepts_bytes(backend):
+    assert json_codec.loads(json.dumps(DOCUMENT).encode('utf-8')) == DOCUMENT
+
+
+def test_roundtrip(backend):
+    assert json_codec.loads(json_codec.dumps(DOCUMENT)) == DOCUMENT
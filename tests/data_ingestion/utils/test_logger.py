@@ -0,0 +1,80 @@
+import json
+import logging
+import threading
+from logging.handlers import QueueHandler
+
+import pytest
+
+from data_ingestion.utils import logger as logger_module
+from data_ingestion.utils.logger import (
+    JsonFormatter,
+    SamplingFilter,
+    get_logger,
+    stop_listener,
+)
+
+
+def record(level=logging.INFO, msg='fetched %s', args=('Bitcoin',)):
+    return logging.LogRecord('test', level, __file__, 1, msg, args, None)
+
+
+@pytest.fixture(autouse=True)
+def listener():
+    yield
+    stop_listener()
+
+
+# ==========================================
+# ---------- Tests for get_logger ----------
+# ==========================================
+
+
+def test_json_formatter_emits_one_object_per_line():
+    line = JsonFormatter().format(record())
+
+    entry = json.loads(line)
+    assert entry['message'] == 'fetched Bitcoin'
+    assert entry['level'] == 'INFO'
+    assert entry['logger'] == 'test'
+
+
+def test_sampling_filter_keeps_one_in_every():
+    sampler = SamplingFilter(every=3)
+
+    kept = [sampler.filter(record()) for _ in range(7)]
+
+    assert kept == [True, False, False, True, False, False, True]
+
+
+def test_sampling_filter_never_drops_warnings():
+    sampler = SamplingFilter(every=100)
+
+    assert all(sampler.filter(record(level=logging.WARNING)) for _ in range(5))
+
+
+def test_queue_mode_writes_from_listener_thread(tmp_path):
+    log_file = tmp_path / 'app.log'
+    log = get_logger(
+        'test_queue_mode',
+        log_file=str(log_file),
+        force=True,
+        use_queue=True,
+        json_lines=True,
+    )
+
+    log.info('uploaded %d objects', 3)
+    stop_listener()
+
+    entry = json.loads(log_file.read_text().splitlines()[-1])
+    assert entry['message'] == 'uploaded 3 objects'
+    assert entry['thread'] == threading.current_thread().name
+
+
+def test_queue_mode_is_read_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv(logger_module.QUEUE_ENV, '1')
+    monkeypatch.setenv(logger_module.SAMPLING_ENV, 'test_env_mode=10')
+
+    log = get_logger('test_env_mode', log_file=str(tmp_path / 'app.log'), force=True)
+
+    assert isinstance(log.handlers[0], QueueHandler)
+    assert log.filters[0].every == 10
@@ -0,0 +1,96 @@
+import json
+import threading
+
+import pytest
+
+from data_ingestion.utils import metrics
+from data_ingestion.utils.metrics import Metrics
+from data_ingestion.utils.retry import RetryPolicy
+
+
+@pytest.fixture
+def registry():
+    ticks = iter([0.0, 0.5, 1.0, 3.0])
+    return Metrics(clock=lambda: next(ticks))
+
+
+# =======================================
+# ---------- Tests for Metrics ----------
+# =======================================
+
+
+def test_timer_labels_with_enclosing_scope(registry):
+    with registry.scope('Bitcoin'):
+        with registry.timer('upload'):
+            pass
+        with registry.timer('upload'):
+            pass
+
+    stage = registry.summary()['stages']['upload']
+    assert stage['count'] == 2
+    assert stage['seconds'] == 2.5
+    assert stage['max'] == 2.0
+    assert stage['subreddits']['Bitcoin']['count'] == 2
+
+
+def test_counters_total_across_subreddits(registry):
+    registry.incr('posts', 3, subreddit='Bitcoin')
+    registry.incr('posts', 2, subreddit='btc')
+
+    counter = registry.summary()['counters']['posts']
+    assert counter['total'] == 5
+    assert counter['subreddits'] == {'Bitcoin': 3, 'btc': 2}
+
+
+def test_scope_is_per_thread(registry):
+    def work():
+        registry.incr('requests')
+
+    with registry.scope('Bitcoin'):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+
+    assert registry.summary()['counters']['requests']['subreddits'] == {}
+
+
+def test_to_prometheus(registry):
+    with registry.timer('page_fetch', subreddit='Bitcoin'):
+        pass
+    registry.incr('upload_bytes', 1024, subreddit='Bitcoin')
+
+    text = registry.to_prometheus()
+
+    assert (
+        'ingestion_stage_seconds_total{stage="page_fetch",subreddit="Bitcoin"} 0.5'
+        in text
+    )
+    assert 'ingestion_upload_bytes_total{subreddit="Bitcoin"} 1024' in text
+
+
+def test_write_exports_both_files(registry, tmp_path):
+    registry.incr('posts', 7)
+
+    registry.write(str(tmp_path))
+
+    assert 'ingestion_posts_total' in (tmp_path / 'ingestion.prom').read_text()
+    summary = json.loads((tmp_path / 'run_summary.json').read_text())
+    assert summary['counters']['posts']['total'] == 7
+
+
+def test_retry_policy_counts_retries():
+    metrics.REGISTRY.reset()
+    calls = {'count': 0}
+
+    def func():
+        calls['count'] += 1
+        if calls['count'] < 3:
+            raise ValueError('transient')
+        return 'ok'
+
+    policy = RetryPolicy(max_attempts=4, sleep=lambda delay: None)
+    with metrics.scope('Bitcoin'):
+        policy.call(func, lambda error: True)
+
+    counter = metrics.REGISTRY.summary()['counters']['retries']
+    assert counter['subreddits'] == {'Bitcoin': 2}
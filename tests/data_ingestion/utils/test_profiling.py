@@ -0,0 +1,112 @@
+import json
+import pstats
+import threading
+import tracemalloc
+
+from data_ingestion.utils.metrics import Metrics
+from data_ingestion.utils.profiling import Profiler
+
+
+def _allocate(size: int) -> bytes:
+    return b'x' * size
+
+
+# ========================================
+# ---------- Tests for Profiler ----------
+# ========================================
+
+
+def test_profile_writes_stats_allocations_and_summary(tmp_path):
+    profiler = Profiler(str(tmp_path))
+
+    with profiler.profile('Bitcoin'):
+        data = _allocate(1_000_000)
+    del data
+
+    stats = pstats.Stats(str(tmp_path / 'Bitcoin.pstats'))
+    assert any(name == '_allocate' for _, _, name in stats.stats)
+
+    report = (tmp_path / 'Bitcoin.txt').read_text()
+    assert 'allocation sites' in report
+    assert 'test_profiling.py' in report
+
+    summary = json.loads((tmp_path / 'summary.json').read_text())
+    assert summary['Bitcoin']['peak_memory_bytes'] >= 1_000_000
+    assert not tracemalloc.is_tracing()
+
+
+def test_repeated_profiles_get_their_own_files(tmp_path):
+    profiler = Profiler(str(tmp_path))
+
+    for _ in range(2):
+        with profiler.profile('btc'):
+            pass
+
+    assert (tmp_path / 'btc.pstats').exists()
+    assert (tmp_path / 'btc-2.pstats').exists()
+    assert set(json.loads((tmp_path / 'summary.json').read_text())) == {
+        'btc',
+        'btc-2',
+    }
+
+
+def test_stages_reported_by_metrics_timers(tmp_path):
+    profiler = Profiler(str(tmp_path))
+    registry = Metrics()
+    registry.stage_hook = profiler.stage
+
+    with profiler.profile('Ethereum'):
+        with registry.timer('upload'):
+            with registry.timer('encode'):
+                data = _allocate(500_000)
+            del data
+        with registry.timer('upload'):
+            pass
+
+    stages = json.loads((tmp_path / 'summary.json').read_text())['Ethereum']['stages']
+    assert stages['upload']['calls'] == 2
+    assert stages['encode']['peak_bytes'] >= 500_000
+    # The nested peak counts towards the enclosing stage.
+    assert stages['upload']['peak_bytes'] >= 500_000
+
+
+def test_peak_memory_covers_earlier_stages(tmp_path):
+    profiler = Profiler(str(tmp_path))
+
+    with profiler.profile('Bitcoin'):
+        with profiler.stage('page_fetch'):
+            data = _allocate(5_000_000)
+        del data
+        with profiler.stage('upload'):
+            _allocate(10)
+
+    summary = json.loads((tmp_path / 'summary.json').read_text())['Bitcoin']
+    assert summary['peak_memory_bytes'] >= 5_000_000
+    assert summary['stages']['upload']['peak_bytes'] < 5_000_000
+
+
+def test_stages_of_other_threads_are_ignored(tmp_path):
+    profiler = Profiler(str(tmp_path))
+
+    def flush():
+        with profiler.stage('upload'):
+            pass
+
+    with profiler.profile('Bitcoin'):
+        thread = threading.Thread(target=flush)
+        thread.start()
+        thread.join()
+
+    assert (
+        json.loads((tmp_path / 'summary.json').read_text())['Bitcoin']['stages'] == {}
+    )
+
+
+def test_stage_outside_profile_does_nothing(tmp_path):
+    profiler = Profiler(str(tmp_path))
+
+    with profiler.stage('upload'):
+        pass
+
+    assert not tracemalloc.is_tracing()
+    assert not (tmp_path / 'summary.json').exists()
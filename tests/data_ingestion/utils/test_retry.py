@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+from data_ingestion.utils.retry import RetryPolicy
+
+
+class TransientError(Exception):
+    def __init__(self, retry_after=None):
+        super().__init__('transient')
+        self.retry_after = retry_after
+
+
+def flaky(failures, error=TransientError):
+    calls = {'count': 0}
+
+    def func():
+        calls['count'] += 1
+        if calls['count'] <= failures:
+            raise error()
+        return 'ok'
+
+    return func, calls
+
+
+def is_transient(error):
+    return isinstance(error, TransientError)
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+@pytest.fixture
+def policy(sleeps):
+    return RetryPolicy(
+        max_attempts=4,
+        base_delay=1.0,
+        max_delay=10.0,
+        budget=100,
+        sleep=sleeps.append,
+        uniform=lambda low, high: high,
+    )
+
+
+# ==========================================
+# ---------- Tests for RetryPolicy ---------
+# ==========================================
+
+
+def test_retry_policy_retries_transient_errors(policy, sleeps):
+    func, calls = flaky(2)
+
+    assert policy.call(func, is_transient) == 'ok'
+    assert calls['count'] == 3
+    assert sleeps == [1.0, 2.0]
+
+
+def test_retry_policy_gives_up_after_max_attempts(policy, sleeps):
+    func, calls = flaky(10)
+
+    with pytest.raises(TransientError):
+        policy.call(func, is_transient)
+
+    assert calls['count'] == 4
+    assert sleeps == [1.0, 2.0, 4.0]
+
+
+def test_retry_policy_does_not_retry_permanent_errors(policy, sleeps):
+    func, calls = flaky(1, error=ValueError)
+
+    with pytest.raises(ValueError):
+        policy.call(func, is_transient)
+
+    assert calls['count'] == 1
+    assert sleeps == []
+
+
+def test_retry_policy_honors_retry_after(policy, sleeps):
+    calls = {'count': 0}
+
+    def func():
+        calls['count'] += 1
+        if calls['count'] == 1:
+            raise TransientError(retry_after=7)
+        return 'ok'
+
+    policy.call(func, is_transient)
+
+    assert sleeps == [7.0]
+
+
+def test_retry_policy_gives_up_on_long_retry_after(policy, sleeps):
+    def func():
+        raise TransientError(retry_after=3600)
+
+    with pytest.raises(TransientError):
+        policy.call(func, is_transient)
+
+    assert sleeps == []
+    assert policy.retries_left == 100
+
+
+def test_retry_policy_caps_backoff(policy):
+    assert policy.backoff(10) == 10.0
+
+
+def test_retry_policy_budget_is_shared(sleeps):
+    policy = RetryPolicy(max_attempts=5, budget=2, sleep=sleeps.append)
+    func, _ = flaky(10)
+
+    with pytest.raises(TransientError):
+        policy.call(func, is_transient)
+    assert policy.retries_left == 0
+
+    other, other_calls = flaky(1)
+    with pytest.raises(TransientError):
+        policy.call(other, is_transient)
+    assert other_calls['count'] == 1
+
+    policy.reset_budget()
+    assert policy.call(other, is_transient) == 'ok'
+
+
+def test_retry_policy_acall(policy, sleeps, mocker):
+    mocker.patch('data_ingestion.utils.retry.asyncio.sleep', mocker.AsyncMock())
+    calls = {'count': 0}
+
+    async def func():
+        calls['count'] += 1
+        if calls['count'] == 1:
+            raise TransientError()
+        return 'ok'
+
+    assert asyncio.run(policy.acall(func, is_transient)) == 'ok'
+    assert calls['count'] == 2